@@ -0,0 +1,134 @@
+"""
+Warm Agent Cache for AgentCore Runtime
+Keeps live session agents between HTTP invocations so follow-up turns skip
+agent construction and the memory history reload
+"""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import time
+
+from telemetry import elapsed_ms, record
+
+
+class CachedAgent:
+    """A live agent plus the lock that serializes invocations on it."""
+
+    def __init__(self):
+        self.agent = None
+        self.memory_hook = None
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class WarmAgentCache:
+    """
+    Per-container cache of live agents keyed by (actor_id, session_id).
+    Entries expire after `ttl_seconds` idle and the least recently used entry
+    is evicted beyond `max_entries`. A per-session lock serializes concurrent
+    invocations, since an Agent rejects overlapping calls. Only touch it from
+    the event loop thread.
+    """
+
+    def __init__(self, ttl_seconds: float = 600, max_entries: int = 32):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @asynccontextmanager
+    async def session(self, key, factory):
+        """
+        Yield (agent, memory_hook, warm) for `key`, building it with the
+        `factory` coroutine function on a miss. If the invocation raises, the
+        agent is discarded so a half-finished turn is never reused. A `key`
+        of None builds a one-off agent that is neither cached nor locked.
+        """
+        if key is None:
+            agent, memory_hook = await factory()
+            try:
+                yield agent, memory_hook, False
+            finally:
+                if memory_hook:
+                    memory_hook.flush(wait=False)
+            return
+
+        self._expire_idle()
+
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = CachedAgent()
+            self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        # Concurrent invocations of one session queue on its lock
+        waited_at = time.perf_counter()
+        async with entry.lock:
+            record("agentcore.queue.wait", elapsed_ms(waited_at), queue="agent_session")
+            warm = entry.agent is not None
+            if warm:
+                self.hits += 1
+            else:
+                self.misses += 1
+                try:
+                    entry.agent, entry.memory_hook = await factory()
+                except Exception:
+                    self._discard(key, entry)
+                    raise
+            self._evict_overflow()
+
+            try:
+                yield entry.agent, entry.memory_hook, warm
+            except BaseException:
+                self._discard(key, entry)
+                raise
+            finally:
+                entry.last_used = time.monotonic()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _expire_idle(self):
+        # Entries are kept in last-used order, so expired ones sit at the front
+        now = time.monotonic()
+        for key, entry in list(self._entries.items()):
+            if now - entry.last_used <= self.ttl_seconds:
+                break
+            if entry.lock.locked():
+                continue
+            self._remove(key, entry)
+            self.expirations += 1
+
+    def _evict_overflow(self):
+        for key, entry in list(self._entries.items()):
+            if len(self._entries) <= self.max_entries:
+                break
+            if entry.lock.locked():
+                continue
+            self._remove(key, entry)
+            self.evictions += 1
+
+    def _discard(self, key, entry):
+        # Keep the entry (and its lock) so queued invocations rebuild in place
+        if entry.memory_hook:
+            entry.memory_hook.flush(wait=False)
+        entry.agent = None
+        entry.memory_hook = None
+
+    def _remove(self, key, entry):
+        del self._entries[key]
+        if entry.memory_hook:
+            # Hand buffered messages to the write-behind queue before dropping
+            entry.memory_hook.flush(wait=False)
@@ -0,0 +1,149 @@
+"""
+Cold-start benchmark for the runtime container entrypoint.
+
+Launches `main.py` in a fresh interpreter, polls `/invocations` until the
+first request succeeds, and reports time-to-first-response plus the
+per-phase startup profile the runtime logs. A stub model stands in for
+Bedrock, so the numbers cover interpreter boot, imports, app construction
+and the first agent build, without network round trips.
+
+Usage:
+    python benchmarks/cold_start.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+RUNTIME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_PREFIX = "[startup] profile "
+
+
+def run_child(port):
+    """Child process: start the runtime with a stub model on `port`."""
+    sys.path.insert(0, RUNTIME_DIR)
+    import main
+    from strands.models import Model
+
+    class StubModel(Model):
+        def update_config(self, **model_config):
+            pass
+
+        def get_config(self):
+            return {"model_id": "stub"}
+
+        async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+            # Required by Model; unused by the benchmark, so fields stay unset
+            yield {"output": output_model.model_construct()}
+
+        async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+            yield {"messageStart": {"role": "assistant"}}
+            yield {"contentBlockDelta": {"delta": {"text": "Hello from the stub model."}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "end_turn"}}
+
+    main.model = StubModel()
+    main.app.run(port=port)
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def measure_once(timeout):
+    port = free_port()
+    env = dict(os.environ, MEMORY_ID="", PYTHONUNBUFFERED="1")
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/invocations",
+        data=json.dumps({"prompt": "Hello!"}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+
+    started = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--child", "--port", str(port)],
+        cwd=RUNTIME_DIR,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    listening_ms = None
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"runtime did not answer within {timeout}s")
+            if child.poll() is not None:
+                raise RuntimeError(f"runtime exited early:\n{child.stdout.read()}")
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+                break
+            except urllib.error.URLError as connect_error:
+                if not isinstance(connect_error.reason, ConnectionRefusedError):
+                    raise
+                time.sleep(0.01)
+                continue
+        first_response_ms = (time.perf_counter() - started) * 1000
+    finally:
+        child.terminate()
+        output, _ = child.communicate(timeout=10)
+
+    profile = None
+    for line in output.splitlines():
+        if line.startswith(PROFILE_PREFIX):
+            profile = json.loads(line[len(PROFILE_PREFIX) :])
+    return first_response_ms, profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8080, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.port)
+        return
+
+    samples = []
+    profiles = []
+    for run in range(args.runs):
+        first_response_ms, profile = measure_once(args.timeout)
+        samples.append(first_response_ms)
+        if profile:
+            profiles.append(profile)
+        print(f"run {run + 1}: first response {first_response_ms:.0f} ms")
+
+    print(
+        f"\ntime to first response: min {min(samples):.0f} ms, "
+        f"median {statistics.median(samples):.0f} ms"
+    )
+    if not profiles:
+        print("no startup profile found in runtime output")
+        return
+
+    print(f"\n{'phase':<18}{'median_ms':>12}{'rss_mb':>10}")
+    print(f"{'interpreter':<18}{statistics.median(p['interpreterMs'] or 0 for p in profiles):>12.0f}")
+    for index, phase in enumerate(profiles[0]["phases"]):
+        durations = [p["phases"][index]["ms"] for p in profiles]
+        print(
+            f"{phase['phase']:<18}{statistics.median(durations):>12.1f}"
+            f"{phase['rssMb']:>10.1f}"
+        )
+    print(f"{'module total':<18}{statistics.median(p['totalMs'] for p in profiles):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Concurrency benchmark for the `invoke` entrypoint.
+
+Runs N concurrent HTTP-style invocations next to a simulated websocket stream
+and reports total wall time plus the worst gap between streamed deltas.
+Each invocation builds a real strands `Agent` with a memory hook. A stub
+model stands in for Bedrock and streams its reply in timed deltas, and a
+stub memory client stands in for the Memory API, where each history load
+blocks for a set time. The two modes compare:
+
+- blocking: the old path. The agent is built, with its memory history
+  load, on the event loop, and then called with the synchronous
+  `agent(user_input)`, so the loop is frozen for each invocation.
+- async: the current `main.invoke`. The agent is built in a worker thread
+  and the reply comes from `invoke_async`.
+
+Usage:
+    python benchmarks/invoke_concurrency.py --invocations 8 --generation-ms 300
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    import main
+    from strands.models import Model
+
+STUB_DELTAS = 10
+
+
+class StubModel(Model):
+    """Streams a fixed reply as STUB_DELTAS deltas over `generation_seconds`."""
+
+    def __init__(self, generation_seconds):
+        self.generation_seconds = generation_seconds
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {"model_id": "stub"}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        # Required by Model; unused by the benchmark, so fields stay unset
+        yield {"output": output_model.model_construct()}
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        yield {"messageStart": {"role": "assistant"}}
+        for index in range(STUB_DELTAS):
+            await asyncio.sleep(self.generation_seconds / STUB_DELTAS)
+            yield {"contentBlockDelta": {"delta": {"text": f"delta {index} "}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {
+            "metadata": {
+                "usage": {
+                    "inputTokens": 10,
+                    "outputTokens": STUB_DELTAS,
+                    "totalTokens": 10 + STUB_DELTAS,
+                },
+                "metrics": {"latencyMs": int(self.generation_seconds * 1000)},
+            }
+        }
+
+
+class StubMemoryClient:
+    """Memory API stand-in: loads block like the real client, writes are no-ops."""
+
+    def __init__(self, load_seconds):
+        self.load_seconds = load_seconds
+
+    def get_last_k_turns(self, **kwargs):
+        time.sleep(self.load_seconds)
+        return []
+
+    def list_events(self, **kwargs):
+        return []
+
+    def save_conversation(self, **kwargs):
+        pass
+
+    def create_blob_event(self, **kwargs):
+        pass
+
+
+async def blocking_invoke(payload):
+    """The invoke body before the change: agent build and call on the loop."""
+    try:
+        agent, _ = main.create_agent(payload["sessionId"], "anonymous")
+        result = agent(payload["input"])
+        return {"status": "success", "response": main.answer_text(result.message)}
+    except Exception as invoke_error:
+        return {"status": "error", "response": str(invoke_error)}
+
+
+async def simulated_socket_stream(stop, interval):
+    """Emit a delta every `interval` seconds and return the worst observed gap."""
+    worst_gap = 0.0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        worst_gap = max(worst_gap, now - last)
+        last = now
+    return worst_gap
+
+
+async def run_mode(label, invoke, invocations):
+    stop = asyncio.Event()
+    stream_task = asyncio.create_task(simulated_socket_stream(stop, 0.01))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = await asyncio.gather(
+            *(
+                # Prompts differ per mode so the response cache never answers
+                invoke(
+                    {"input": f"{label} question {i}", "sessionId": f"bench-{label}-{i}"}
+                )
+                for i in range(invocations)
+            )
+        )
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    worst_gap = await stream_task
+    failures = sum(1 for result in results if result.get("status") != "success")
+    return elapsed, worst_gap, failures
+
+
+async def run_benchmark(invocations, generation_seconds, memory_load_seconds):
+    main.model = StubModel(generation_seconds)
+    main.MEMORY_ID = "bench-memory"
+    main._memory_client = StubMemoryClient(memory_load_seconds)
+
+    ideal_seconds = generation_seconds + memory_load_seconds
+    print(
+        f"invocations={invocations} generation={generation_seconds * 1000:.0f}ms "
+        f"memory_load={memory_load_seconds * 1000:.0f}ms "
+        f"ideal_wall={ideal_seconds * 1000:.0f}ms"
+    )
+    print(f"{'mode':<10}{'wall_ms':>10}{'worst_stream_gap_ms':>22}{'failures':>10}")
+    total_failures = 0
+    for label, invoke in (("blocking", blocking_invoke), ("async", main.invoke)):
+        elapsed, worst_gap, failures = await run_mode(label, invoke, invocations)
+        print(
+            f"{label:<10}{elapsed * 1000:>10.1f}{worst_gap * 1000:>22.1f}{failures:>10}"
+        )
+        total_failures += failures
+    return total_failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invocations", type=int, default=8)
+    parser.add_argument("--generation-ms", type=int, default=300)
+    parser.add_argument("--memory-load-ms", type=int, default=100)
+    args = parser.parse_args()
+    failures = asyncio.run(
+        run_benchmark(
+            args.invocations, args.generation_ms / 1000, args.memory_load_ms / 1000
+        )
+    )
+    if failures:
+        # Failed invocations return at once, so their timings are meaningless
+        sys.exit(f"{failures} invocation(s) failed")
@@ -0,0 +1,86 @@
+"""
+Recall and latency benchmark for IVF approximate search.
+
+Builds a clustered synthetic corpus (uniform random vectors have no
+neighbourhood structure, unlike real embeddings), writes it with an IVF
+index, and compares IVF search at several nprobe values against exact
+search: recall@k (overlap with the exact top-k) and p50/p99 latency.
+
+Usage:
+    python benchmarks/rag_ann.py --size 100000 --nprobe 1 4 8 16 32
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag_retrieval import EmbeddingIndex, write_index
+
+
+def clustered_corpus(size, dimension, clusters, spread, rng):
+    centers = rng.standard_normal((clusters, dimension), dtype=np.float32)
+    labels = rng.integers(clusters, size=size)
+    return centers[labels] + spread * rng.standard_normal((size, dimension), dtype=np.float32)
+
+
+def timed_search(index, queries, top_k, **kwargs):
+    samples = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        results.append({hit["id"] for hit in index.search(query, top_k, **kwargs)[0]})
+        samples.append((time.perf_counter() - started) * 1000)
+    return results, np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--lists", type=int, default=0, help="default: sqrt(size)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument(
+        "--spread", type=float, default=1.5, help="within-cluster noise (higher is harder)"
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    n_lists = args.lists or round(args.size**0.5)
+    clusters = max(1, args.size // 100)
+    matrix = clustered_corpus(args.size, args.dimension, clusters, args.spread, rng)
+    items = [{"id": row} for row in range(args.size)]
+    # Queries are perturbed corpus rows, like a question close to a stored passage
+    queries = matrix[rng.integers(args.size, size=args.queries)]
+    queries = queries + args.spread * rng.standard_normal(queries.shape, dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, name) for name in ("index.bin", "index.meta")]
+        ivf_path = os.path.join(directory, "index.ivf")
+        started = time.perf_counter()
+        write_index(*paths, matrix, items, ivf_path=ivf_path, n_lists=n_lists)
+        build_s = time.perf_counter() - started
+
+        exact_index = EmbeddingIndex.from_files(*paths)
+        ivf_index = EmbeddingIndex.from_files(*paths, ivf_path=ivf_path)
+        print(
+            f"chunks={args.size} dimension={args.dimension} lists={n_lists} "
+            f"top_k={args.top_k} build={build_s:.1f}s"
+        )
+        print(f"{'search':<14}{'recall@k':>10}{'p50_ms':>10}{'p99_ms':>10}")
+
+        exact, p50, p99 = timed_search(exact_index, queries, args.top_k)
+        print(f"{'exact':<14}{1.0:>10.3f}{p50:>10.3f}{p99:>10.3f}")
+        for nprobe in args.nprobe:
+            approximate, p50, p99 = timed_search(ivf_index, queries, args.top_k, nprobe=nprobe)
+            recall = np.mean(
+                [len(found & truth) / len(truth) for found, truth in zip(approximate, exact)]
+            )
+            print(f"{f'ivf nprobe={nprobe}':<14}{recall:>10.3f}{p50:>10.3f}{p99:>10.3f}")
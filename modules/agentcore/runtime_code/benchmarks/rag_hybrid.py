@@ -0,0 +1,92 @@
+"""
+Build time and latency benchmark for BM25 keyword and hybrid RAG search.
+
+Generates a synthetic corpus with a Zipf-distributed vocabulary and a few
+rare "project name" terms, builds the BM25 index, and times keyword-only
+lookups (including how often the fast path is confident), vector search,
+and reciprocal-rank fusion of the two.
+
+Usage:
+    python benchmarks/rag_hybrid.py --size 10000 --words 300
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag_lexical import reciprocal_rank_fusion
+from rag_retrieval import EmbeddingIndex
+
+
+def percentiles(samples):
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=300, help="words per chunk")
+    parser.add_argument("--vocabulary", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=4)
+    parser.add_argument("--candidates", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    vocabulary = np.array([f"w{rank}" for rank in range(args.vocabulary)])
+    words = rng.zipf(1.3, size=(args.size, args.words)) % args.vocabulary
+    # Each chunk mentions one of size / 5 rare names, like a project write-up
+    names = [f"project{row % max(1, args.size // 5)}" for row in range(args.size)]
+    items = [
+        {"id": row, "text": " ".join(vocabulary[words[row]]) + f" {names[row]}"}
+        for row in range(args.size)
+    ]
+    matrix = rng.standard_normal((args.size, args.dimension), dtype=np.float32)
+    index = EmbeddingIndex(matrix, items)
+
+    started = time.perf_counter()
+    terms = index.build_lexical_index()
+    build_s = time.perf_counter() - started
+    print(
+        f"chunks={args.size} words={args.words} terms={terms} "
+        f"bm25_mb={index.lexical.nbytes / 1048576:.1f} build={build_s:.1f}s"
+    )
+
+    name_queries = [names[row] for row in rng.integers(args.size, size=args.queries)]
+    phrase_queries = [
+        " ".join(vocabulary[words[row, :6]]) for row in rng.integers(args.size, size=args.queries)
+    ]
+    vectors = rng.standard_normal((args.queries, args.dimension), dtype=np.float32)
+
+    print(f"{'search':<16}{'p50_ms':>10}{'p99_ms':>10}{'confident':>11}")
+    for label, queries in (("keyword name", name_queries), ("keyword phrase", phrase_queries)):
+        samples = []
+        confident = 0
+        for query in queries:
+            started = time.perf_counter()
+            confident += index.keyword_search(query, args.candidates)[1]
+            samples.append((time.perf_counter() - started) * 1000)
+        p50, p99 = percentiles(samples)
+        print(f"{label:<16}{p50:>10.3f}{p99:>10.3f}{confident / len(queries):>11.2f}")
+
+    vector_samples = []
+    hybrid_samples = []
+    for query, vector in zip(phrase_queries, vectors):
+        started = time.perf_counter()
+        vector_hits = index.search(vector, args.candidates)[0]
+        searched = time.perf_counter()
+        keyword_hits = index.keyword_search(query, args.candidates)[0]
+        reciprocal_rank_fusion(
+            {"vector": vector_hits, "bm25": keyword_hits}, args.top_k
+        )
+        vector_samples.append((searched - started) * 1000)
+        hybrid_samples.append((time.perf_counter() - started) * 1000)
+    for label, samples in (("vector", vector_samples), ("hybrid", hybrid_samples)):
+        p50, p99 = percentiles(samples)
+        print(f"{label:<16}{p50:>10.3f}{p99:>10.3f}{'':>11}")
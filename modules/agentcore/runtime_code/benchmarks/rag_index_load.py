@@ -0,0 +1,128 @@
+"""
+Load-time and memory benchmark for the RAG index formats.
+
+Writes a synthetic corpus as embeddings.json and as the binary index
+(float32 and float16), then loads each one in a fresh interpreter and
+reports load time and RSS growth, before and after the first query.
+The first query touches every matrix page, so the mmap formats' post-query
+RSS is mostly shared, reclaimable page cache rather than private heap.
+
+Usage:
+    python benchmarks/rag_index_load.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RUNTIME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RUNTIME_DIR)
+
+
+def run_child(kind, paths):
+    import numpy as np
+
+    from rag_retrieval import EmbeddingIndex
+    from startup_profiler import current_rss_mb
+
+    baseline_rss = current_rss_mb()
+    started = time.perf_counter()
+    if kind == "json":
+        with open(paths[0]) as json_file:
+            index = EmbeddingIndex.from_document(json.load(json_file))
+    else:
+        index = EmbeddingIndex.from_files(*paths)
+    load_ms = (time.perf_counter() - started) * 1000
+    loaded_rss = current_rss_mb()
+
+    started = time.perf_counter()
+    index.search(np.ones(index.dimension, dtype=np.float32), top_k=4)
+    first_query_ms = (time.perf_counter() - started) * 1000
+    print(
+        json.dumps(
+            {
+                "loadMs": load_ms,
+                "loadRssMb": loaded_rss - baseline_rss,
+                "firstQueryMs": first_query_ms,
+                "queryRssMb": current_rss_mb() - baseline_rss,
+            }
+        )
+    )
+
+
+def write_corpus(directory, size, dimension, write_json):
+    import numpy as np
+
+    from rag_retrieval import write_index
+
+    rng = np.random.default_rng(size)
+    matrix = rng.standard_normal((size, dimension), dtype=np.float32)
+    items = [
+        {"id": f"doc.md#{row}", "file": "doc.md", "chunk_index": row, "text": "x" * 400}
+        for row in range(size)
+    ]
+    corpus = {}
+    if write_json:
+        corpus["json"] = [os.path.join(directory, "embeddings.json")]
+        with open(corpus["json"][0], "w") as json_file:
+            json.dump(
+                {
+                    "model": "amazon.titan-embed-text-v2:0",
+                    "items": [
+                        {**item, "embedding": vector}
+                        for item, vector in zip(items, matrix.tolist())
+                    ],
+                },
+                json_file,
+            )
+    for dtype in ("float32", "float16"):
+        paths = [os.path.join(directory, f"{dtype}.bin"), os.path.join(directory, f"{dtype}.meta")]
+        write_index(*paths, matrix, items, {"model": "amazon.titan-embed-text-v2:0"}, dtype)
+        corpus[f"mmap-{dtype}"] = paths
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument(
+        "--json-max", type=int, default=50000, help="skip the JSON format above this size"
+    )
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1:])
+        return
+
+    print(f"dimension={args.dimension}")
+    print(
+        f"{'chunks':>9}  {'format':<14}{'file_mb':>9}{'load_ms':>10}"
+        f"{'load_rss_mb':>13}{'query_ms':>10}{'query_rss_mb':>14}"
+    )
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = write_corpus(directory, size, args.dimension, size <= args.json_max)
+            for kind, paths in corpus.items():
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", kind.split("-")[0], *paths],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                result = json.loads(output.splitlines()[-1])
+                file_mb = sum(os.path.getsize(path) for path in paths) / 1048576
+                print(
+                    f"{size:>9}  {kind:<14}{file_mb:>9.1f}{result['loadMs']:>10.1f}"
+                    f"{result['loadRssMb']:>13.1f}{result['firstQueryMs']:>10.1f}"
+                    f"{result['queryRssMb']:>14.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
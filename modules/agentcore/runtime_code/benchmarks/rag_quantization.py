@@ -0,0 +1,100 @@
+"""
+Footprint, recall and latency benchmark for quantized RAG indexes.
+
+Compares float32 exact search with int8 and product-quantized (PQ) codes,
+with and without float re-ranking of the top candidates, on a clustered
+synthetic corpus. Pass --ivf-lists to combine quantization with IVF.
+
+Usage:
+    python benchmarks/rag_quantization.py --size 100000 --rerank-factor 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag_ivf import IVFIndex, train_ivf
+from rag_retrieval import EmbeddingIndex, normalize_rows
+
+
+def run_searches(index, queries, top_k):
+    samples = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        results.append({hit["id"] for hit in index.search(query, top_k)[0]})
+        samples.append((time.perf_counter() - started) * 1000)
+    return results, np.percentile(samples, 50), np.percentile(samples, 99)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    parser.add_argument("--pq-subspaces", type=int, default=0, help="default: dimension / 4")
+    parser.add_argument("--ivf-lists", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    centers = rng.standard_normal((max(1, args.size // 100), args.dimension), dtype=np.float32)
+    matrix = centers[rng.integers(len(centers), size=args.size)]
+    matrix += 1.5 * rng.standard_normal(matrix.shape, dtype=np.float32)
+    normalize_rows(matrix)
+    queries = matrix[rng.integers(args.size, size=args.queries)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape, dtype=np.float32)
+    items = [{"id": row} for row in range(args.size)]
+
+    ivf = None
+    if args.ivf_lists:
+        centroids, assignments = train_ivf(matrix, args.ivf_lists)
+        order = np.argsort(assignments, kind="stable")
+        matrix = matrix[order]
+        items = [items[row] for row in order]
+        ivf = IVFIndex.from_assignments(centroids, assignments)
+
+    exact_index = EmbeddingIndex(matrix, items, normalized=True)
+    exact, _, _ = run_searches(exact_index, queries, args.top_k)
+
+    print(
+        f"chunks={args.size} dimension={args.dimension} top_k={args.top_k} "
+        f"ivf_lists={args.ivf_lists}"
+    )
+    print(
+        f"{'index':<18}{'mb':>9}{'ratio':>8}{'build_s':>9}"
+        f"{'recall@k':>10}{'p50_ms':>10}{'p99_ms':>10}"
+    )
+    configurations = [("float32", None, 1)]
+    for kind in ("int8", "pq"):
+        configurations.append((kind, kind, 1))
+        if args.rerank_factor > 1:
+            configurations.append((f"{kind}+rerank{args.rerank_factor}", kind, args.rerank_factor))
+
+    built = {}
+    for label, kind, rerank_factor in configurations:
+        index = EmbeddingIndex(
+            matrix, items, normalized=True, ivf=ivf, rerank_factor=rerank_factor
+        )
+        build_s = 0.0
+        size_bytes = matrix.nbytes
+        if kind:
+            if kind not in built:
+                started = time.perf_counter()
+                options = {"subspaces": args.pq_subspaces} if kind == "pq" else {}
+                index.quantize(kind, **options)
+                built[kind] = (index.quantizer, time.perf_counter() - started)
+            index.quantizer, build_s = built[kind]
+            size_bytes = index.quantizer.nbytes
+        found, p50, p99 = run_searches(index, queries, args.top_k)
+        recall = np.mean([len(a & b) / len(b) for a, b in zip(found, exact)])
+        print(
+            f"{label:<18}{size_bytes / 1048576:>9.1f}{matrix.nbytes / size_bytes:>8.1f}"
+            f"{build_s:>9.1f}{recall:>10.3f}{p50:>10.2f}{p99:>10.2f}"
+        )
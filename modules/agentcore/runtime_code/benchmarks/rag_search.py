@@ -0,0 +1,98 @@
+"""
+Query-latency benchmark for the RAG embedding index.
+
+Builds synthetic corpora of random unit vectors (Titan V2 is 1024-d) and
+measures top-k search latency for single queries and query batches, next to
+the per-item Python loop a naive implementation would use.
+
+Usage:
+    python benchmarks/rag_search.py --sizes 1000 10000 100000 --queries 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag_retrieval import EmbeddingIndex
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def naive_search(vectors, query, top_k):
+    """Per-item cosine loop over Python lists, for comparison at small sizes."""
+    query_norm = sum(value * value for value in query) ** 0.5
+    scored = []
+    for row, vector in enumerate(vectors):
+        dot = sum(a * b for a, b in zip(vector, query))
+        norm = sum(value * value for value in vector) ** 0.5
+        scored.append((dot / (norm * query_norm), row))
+    return sorted(scored, reverse=True)[:top_k]
+
+
+def time_calls(call, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def run_size(size, dimension, queries, batch_size, top_k, rng):
+    matrix = rng.standard_normal((size, dimension), dtype=np.float32)
+    items = [{"id": f"doc.md#{row}", "text": ""} for row in range(size)]
+
+    started = time.perf_counter()
+    index = EmbeddingIndex(matrix, items)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    query_vectors = rng.standard_normal((queries, dimension), dtype=np.float32)
+    single = time_calls(
+        lambda: index.search(query_vectors[rng.integers(queries)], top_k), queries
+    )
+    batched = time_calls(
+        lambda: index.search(query_vectors[:batch_size], top_k),
+        max(1, queries // batch_size),
+    )
+    per_query_batched = statistics.median(batched) / batch_size
+
+    naive = ""
+    if size <= 1000:
+        vectors = matrix[:size].tolist()
+        query = query_vectors[0].tolist()
+        naive_ms = statistics.median(time_calls(lambda: naive_search(vectors, query, top_k), 3))
+        naive = f"{naive_ms:>10.1f}"
+
+    print(
+        f"{size:>9}{build_ms:>10.1f}{statistics.median(single):>10.3f}"
+        f"{percentile(single, 0.99):>10.3f}{per_query_batched:>12.3f}"
+        f"{index.matrix.nbytes / 1048576:>10.1f}{naive}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--top-k", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    print(f"dimension={args.dimension} top_k={args.top_k} batch={args.batch_size}")
+    print(
+        f"{'chunks':>9}{'build_ms':>10}{'p50_ms':>10}{'p99_ms':>10}"
+        f"{'batch_q_ms':>12}{'matrix_mb':>10}{'naive_ms':>10}"
+    )
+    for size in args.sizes:
+        run_size(size, args.dimension, args.queries, args.batch_size, args.top_k, rng)
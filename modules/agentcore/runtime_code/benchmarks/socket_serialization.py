@@ -0,0 +1,69 @@
+"""
+Micro-benchmark for websocket event serialization.
+
+Compares the original per-frame path (build the envelope dict, stdlib
+json.dumps) with the pre-encoded EnvelopeEncoder for the two hottest events:
+`chat.delta` text and `voice.audio` chunks.
+
+Usage:
+    python benchmarks/socket_serialization.py --iterations 200000
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from socket_codec import ORJSON_AVAILABLE, EnvelopeEncoder
+
+VERSION = 1
+
+
+def baseline_encode(event_type, payload):
+    return json.dumps(
+        {"version": VERSION, "type": event_type, **payload},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def run_case(label, event_type, payload, iterations):
+    encoder = EnvelopeEncoder(VERSION)
+    assert encoder.encode(event_type, payload) == baseline_encode(event_type, payload)
+
+    baseline = timeit.timeit(
+        lambda: baseline_encode(event_type, payload), number=iterations
+    )
+    encoded = timeit.timeit(
+        lambda: encoder.encode(event_type, payload), number=iterations
+    )
+    print(
+        f"{label:<22}{baseline / iterations * 1e9:>14.0f}"
+        f"{encoded / iterations * 1e9:>14.0f}{baseline / encoded:>10.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    audio = base64.b64encode(os.urandom(3200)).decode("ascii")
+    print(f"encoder={'orjson' if ORJSON_AVAILABLE else 'json'} iterations={args.iterations}")
+    print(f"{'event':<22}{'baseline_ns':>14}{'encoder_ns':>14}{'speedup':>11}")
+    run_case(
+        "chat.delta",
+        "chat.delta",
+        {"requestId": "req-7f3a9c", "delta": "Charles built JamCam with "},
+        args.iterations,
+    )
+    run_case(
+        "voice.audio (3.2 KB)",
+        "voice.audio",
+        {"audio": audio, "format": "pcm", "sampleRate": 16000, "channels": 1},
+        args.iterations // 10,
+    )
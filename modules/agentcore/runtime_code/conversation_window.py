@@ -0,0 +1,287 @@
+"""
+Conversation Window for AgentCore Runtime
+Keeps the conversation sent with each turn under a token budget: recent
+turns stay verbatim and older ones are folded into a running summary on a
+background thread, so long sessions cost about as much per turn as short ones.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import threading
+
+from strands.agent.conversation_manager import ConversationManager
+from strands.hooks.events import BeforeInvocationEvent
+from strands.types.exceptions import ContextWindowOverflowException
+
+CONVERSATION_TOKEN_BUDGET = 4000
+# Trimming goes down to this fraction of the budget, so it (and the prompt
+# cache miss it causes) happens every few turns rather than on every turn
+CONVERSATION_TRIM_RATIO = 0.6
+CONVERSATION_RECENT_TURNS = 2
+# Rough token estimate; good enough to decide when to trim
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+# Per-message cap in the transcript handed to the summarizer
+SUMMARY_TRANSCRIPT_MESSAGE_CHARS = 2000
+# Folds waiting on a failing summarizer keep only the newest messages
+SUMMARY_MAX_PENDING_MESSAGES = 40
+SUMMARY_PREFIX = "Summary of our earlier conversation:\n"
+
+# Shared by every window; a fold is one short model call
+_summary_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="conversation-summary")
+
+
+def estimate_tokens(message) -> int:
+    """Approximate token count of one agent message."""
+    chars = 0
+    for block in message.get("content", ()):
+        if "text" in block:
+            chars += len(block["text"])
+        elif "toolUse" in block:
+            chars += len(json.dumps(block["toolUse"].get("input", {}), default=str))
+        elif "toolResult" in block:
+            for item in block["toolResult"].get("content", ()):
+                chars += len(item.get("text", "")) or len(json.dumps(item, default=str))
+    return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def is_turn_start(message) -> bool:
+    """A user prompt, as opposed to a user message carrying tool results."""
+    return message.get("role") == "user" and not any(
+        "toolResult" in block for block in message.get("content", ())
+    )
+
+
+def memory_text(message):
+    """Text of a user/assistant message as MemoryHook saves it, or None if it is not saved."""
+    content = message.get("content")
+    if message.get("role") not in ("user", "assistant") or not content:
+        return None
+    first = content[0]
+    return first.get("text") if isinstance(first, dict) else None
+
+
+def _turn_digest(entries) -> str:
+    digest = hashlib.sha256()
+    for role, text in entries:
+        digest.update(f"{role}\0{text}\0".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def _memory_turns(messages):
+    """(end index, digest) of each turn, as memory stores it, in `messages`."""
+    entries = [
+        (i, message["role"], text)
+        for i, message in enumerate(messages)
+        if (text := memory_text(message)) is not None
+    ]
+    starts = [n for n, (_, role, _) in enumerate(entries) if role == "user"]
+    turns = []
+    for start, end in zip(starts, [*starts[1:], len(entries)]):
+        turn = entries[start:end]
+        turns.append((turn[-1][0] + 1, _turn_digest((role, text) for _, role, text in turn)))
+    return turns
+
+
+def fold_watermark(messages) -> str:
+    """Identifies the last turn of folded `messages`; "" if it has none."""
+    turns = _memory_turns(messages)
+    return turns[-1][1] if turns else ""
+
+
+def drop_folded(messages, watermark: str):
+    """
+    Drop loaded history up to and including the turn `watermark` names, as
+    the summary already covers it. Without a match, every loaded turn is
+    newer than the summary and all are kept.
+    """
+    if not watermark:
+        return messages
+    for end, digest in reversed(_memory_turns(messages)):
+        if digest == watermark:
+            return messages[end:]
+    return messages
+
+
+def render_transcript(messages) -> str:
+    """Plain-text transcript of folded messages for the summarizer."""
+    lines = []
+    for message in messages:
+        speaker = "User" if message.get("role") == "user" else "Assistant"
+        for block in message.get("content", ()):
+            if "text" in block:
+                text = block["text"]
+            elif "toolUse" in block:
+                tool_use = block["toolUse"]
+                tool_input = json.dumps(tool_use.get("input", {}), default=str)
+                text = f"[called {tool_use.get('name')} {tool_input}]"
+            elif "toolResult" in block:
+                results = block["toolResult"].get("content", ())
+                text = "[tool result] " + " ".join(item.get("text", "") for item in results)
+            else:
+                continue
+            lines.append(f"{speaker}: {text[:SUMMARY_TRANSCRIPT_MESSAGE_CHARS]}")
+    return "\n".join(lines)
+
+
+class TokenBudgetConversationManager(ConversationManager):
+    """
+    Token-budgeted window over agent.messages with a rolling summary.
+
+    Before and after every invocation, the oldest whole turns beyond the
+    budget are cut from the conversation (always keeping the last
+    `recent_turns`) and queued for folding. A worker thread merges them into
+    the summary with `summarize(summary, transcript)` and hands the result
+    to `persist(summary, watermark)`, where the watermark identifies the
+    last folded turn (see `drop_folded`); the new summary is sent from the
+    next turn on, as a leading text block of the first message. The request
+    path never waits on it.
+    """
+
+    def __init__(
+        self,
+        summarize,
+        persist=None,
+        token_budget: int = CONVERSATION_TOKEN_BUDGET,
+        recent_turns: int = CONVERSATION_RECENT_TURNS,
+    ):
+        super().__init__()
+        self.summarize = summarize
+        self.persist = persist
+        self.token_budget = token_budget
+        self.recent_turns = max(1, recent_turns)
+        self.summary = ""
+        self.folds = 0
+        self.fold_failures = 0
+        self._summary_block = None
+        self._pending = []
+        self._folding = False
+        self._lock = threading.Lock()
+
+    def register_hooks(self, registry, **kwargs):
+        super().register_hooks(registry, **kwargs)
+        # History loaded from memory is fitted before its first model call
+        registry.add_callback(BeforeInvocationEvent, self._on_before_invocation)
+
+    def restore_summary(self, summary: str):
+        """Adopt a summary loaded with the session's memory record."""
+        with self._lock:
+            self.summary = summary or ""
+
+    def _on_before_invocation(self, event: BeforeInvocationEvent):
+        self.apply_management(event.agent)
+
+    def apply_management(self, agent, **kwargs):
+        self._fit(agent.messages, int(self.token_budget * CONVERSATION_TRIM_RATIO))
+
+    def reduce_context(self, agent, e=None, **kwargs):
+        # Overflow: everything but the recent turns goes
+        removed = self._fit(agent.messages, 0, force=True)
+        if e is not None and not removed:
+            raise ContextWindowOverflowException("Unable to trim conversation context") from e
+
+    def _fit(self, messages, trim_target, force=False):
+        """
+        Trim `messages` in place when over budget (or when forced), down to
+        `trim_target` tokens or the recent turns, whichever keeps more.
+        Returns the number of messages removed.
+        """
+        with self._lock:
+            self._strip_summary(messages)
+            summary_tokens = len(self.summary) // CHARS_PER_TOKEN
+            sizes = [estimate_tokens(message) for message in messages]
+            removed = 0
+            if force or summary_tokens + sum(sizes) > self.token_budget:
+                starts = [i for i, message in enumerate(messages) if is_turn_start(message)]
+                keep_from = starts[-self.recent_turns] if len(starts) >= self.recent_turns else 0
+                # Earliest turn start from which the rest fits the target
+                cut = keep_from
+                for start in starts:
+                    if start >= keep_from or summary_tokens + sum(sizes[start:]) <= trim_target:
+                        cut = min(start, keep_from)
+                        break
+                if cut > 0:
+                    self._pending.extend(messages[:cut])
+                    del self._pending[:-SUMMARY_MAX_PENDING_MESSAGES]
+                    del messages[:cut]
+                    self.removed_message_count += cut
+                    removed = cut
+                    print(
+                        f"[context] Folded {cut} message(s) out of the window; "
+                        f"{len(messages)} kept, ~{summary_tokens + sum(sizes[cut:])} tokens"
+                    )
+            self._schedule_fold()
+            self._inject_summary(messages)
+            return removed
+
+    # Message dicts can be shared with the history cache, so both replace the
+    # list entry with a copy rather than editing the dict in place
+    def _strip_summary(self, messages):
+        if self._summary_block is None:
+            return
+        for i, message in enumerate(messages):
+            content = message.get("content", [])
+            if any(block is self._summary_block for block in content):
+                messages[i] = {
+                    **message,
+                    "content": [block for block in content if block is not self._summary_block],
+                }
+        self._summary_block = None
+
+    def _inject_summary(self, messages):
+        if self.summary and messages and is_turn_start(messages[0]):
+            self._summary_block = {"text": SUMMARY_PREFIX + self.summary}
+            messages[0] = {**messages[0], "content": [self._summary_block, *messages[0]["content"]]}
+
+    def _schedule_fold(self):
+        # Caller holds the lock
+        if self._folding or not self._pending:
+            return
+        self._folding = True
+        _summary_executor.submit(self._fold)
+
+    def _fold(self):
+        while True:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                if not pending:
+                    self._folding = False
+                    return
+                summary = self.summary
+            watermark = fold_watermark(pending)
+            try:
+                summary = self.summarize(summary, render_transcript(pending)).strip()
+            except Exception as summary_error:
+                print(f"[context] Summary failed; retrying next turn: {summary_error}")
+                with self._lock:
+                    self._pending[:0] = pending
+                    del self._pending[:-SUMMARY_MAX_PENDING_MESSAGES]
+                    self.fold_failures += 1
+                    self._folding = False
+                return
+            with self._lock:
+                self.summary = summary
+                self.folds += 1
+            if self.persist is not None:
+                self.persist(summary, watermark)
+
+    def get_state(self):
+        state = super().get_state()
+        state["summary"] = self.summary
+        return state
+
+    def restore_from_session(self, state):
+        result = super().restore_from_session(state)
+        self.restore_summary(state.get("summary", ""))
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "summaryTokens": len(self.summary) // CHARS_PER_TOKEN,
+                "pendingMessages": len(self._pending),
+                "folds": self.folds,
+                "foldFailures": self.fold_failures,
+                "removedMessages": self.removed_message_count,
+            }
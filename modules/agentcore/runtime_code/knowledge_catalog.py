@@ -0,0 +1,145 @@
+"""
+Knowledge Catalog for AgentCore Runtime
+Project and expertise data loaded once from portfolio_catalog.json, with
+each tool response rendered at load time and an alias/trigram index for
+forgiving name lookups ("Guitar Normal Guy", "agent core", "AWS cloud").
+"""
+
+import json
+import re
+from collections import Counter
+from types import MappingProxyType
+
+CATALOG_VERSION = 1
+# Minimum Dice similarity of trigram sets for a fuzzy match. Short names
+# share most of their few trigrams with unrelated ones ("java" and
+# "javascript" score 0.5), so they need a closer match.
+FUZZY_MIN_SIMILARITY = 0.5
+FUZZY_SHORT_NAME_LENGTH = 6
+FUZZY_MIN_SIMILARITY_SHORT = 0.75
+NAME_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_name(text: str) -> str:
+    """Lower-case alphanumerics only: "Guitar-Normal Guy" -> "guitarnormalguy"."""
+    return "".join(NAME_WORD_PATTERN.findall(text.lower()))
+
+
+def trigrams(name: str):
+    padded = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def render_project(entry):
+    tech_list = "\n  - ".join(entry["tech_stack"])
+    features_list = "\n  - ".join(entry["features"])
+    return f"""**{entry['title'].upper()} Project**
+
+{entry['description']}
+
+**Architecture:** {entry['architecture']}
+
+**Technology Stack:**
+  - {tech_list}
+
+**Key Features:**
+  - {features_list}
+
+**Highlights:** {entry['highlights']}
+"""
+
+
+def render_expertise(entry):
+    details_list = "\n  - ".join(entry["details"])
+    return f"""**{entry['title'].upper()} Expertise**
+
+**Level:** {entry['level']}
+
+**{entry['details_label']}:**
+  - {details_list}
+
+**Experience:** {entry['experience']}
+"""
+
+
+class CatalogSection:
+    """
+    One immutable lookup table (projects or expertise areas).
+
+    Every key, title and alias is indexed by its normalized form, so exact
+    matches are a dict lookup. A query that merely contains a name ("the
+    JamCam project") matches on a run of its words; anything else falls
+    back to trigram similarity over the indexed names.
+    """
+
+    def __init__(self, entries, render):
+        self.responses = MappingProxyType(
+            {key: render(entry) for key, entry in entries.items()}
+        )
+        self.available = ", ".join(entries)
+        names = {}
+        for key, entry in entries.items():
+            for name in (key, entry.get("title", key), *entry.get("aliases", ())):
+                names.setdefault(normalize_name(name), key)
+        names.pop("", None)
+        self._names = MappingProxyType(names)
+        self._gram_counts = MappingProxyType({name: len(trigrams(name)) for name in names})
+        grams = {}
+        for name in names:
+            for gram in trigrams(name):
+                grams.setdefault(gram, []).append(name)
+        self._trigrams = MappingProxyType({gram: tuple(found) for gram, found in grams.items()})
+
+    def lookup(self, query: str):
+        """
+        Resolve a name to a catalog key.
+
+        Returns:
+            Tuple of (key, match) where match is "exact", "partial" or
+            "fuzzy"; (None, None) when nothing is close enough
+        """
+        name = normalize_name(query)
+        if not name:
+            return None, None
+        if name in self._names:
+            return self._names[name], "exact"
+
+        # Longest run of query words that is a known name
+        words = NAME_WORD_PATTERN.findall(query.lower())
+        best = None
+        for start in range(len(words)):
+            for end in range(start + 1, len(words) + 1):
+                window = "".join(words[start:end])
+                if window in self._names and (best is None or len(window) > len(best)):
+                    best = window
+        if best is not None:
+            return self._names[best], "partial"
+
+        query_grams = trigrams(name)
+        shared = Counter(
+            candidate for gram in query_grams for candidate in self._trigrams.get(gram, ())
+        )
+        best_similarity = 0.0
+        for candidate, overlap in shared.items():
+            similarity = 2 * overlap / (len(query_grams) + self._gram_counts[candidate])
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+        short = len(name) <= FUZZY_SHORT_NAME_LENGTH
+        if best_similarity < (FUZZY_MIN_SIMILARITY_SHORT if short else FUZZY_MIN_SIMILARITY):
+            return None, None
+        return self._names[best], "fuzzy"
+
+
+class KnowledgeCatalog:
+    """Projects and expertise areas for the portfolio tools."""
+
+    def __init__(self, document):
+        if document.get("version") != CATALOG_VERSION:
+            raise ValueError(f"Unsupported catalog version: {document.get('version')}")
+        self.projects = CatalogSection(document["projects"], render_project)
+        self.expertise = CatalogSection(document["expertise"], render_expertise)
+
+    @classmethod
+    def from_file(cls, path: str):
+        with open(path, encoding="utf-8") as catalog_file:
+            return cls(json.load(catalog_file))
@@ -5,13 +5,26 @@ We manually extend sys.path so the runtime zip can stay clean.
 """
 
 import asyncio
+import atexit
 import base64
 import json
 import os
+import random
 import sys
 import time
+import threading
 import traceback
+from contextlib import asynccontextmanager
+from startup_profiler import StartupProfiler
+
+# Times each startup phase below; emitted as one record once the app is built
+startup = StartupProfiler()
+
 import boto3
+import botocore.session
+from botocore.config import Config
+
+startup.mark("boto3_imports")
 
 # Inject vendored directory (if present) into sys.path early
 _BASE_DIR = os.path.dirname(__file__)
@@ -20,22 +33,61 @@ if os.path.isdir(_VENDORED) and _VENDORED not in sys.path:
     sys.path.insert(0, _VENDORED)
     print(f"[startup] Added vendored path: {_VENDORED}")
 
+startup.mark("vendored_path")
+
+# Local stdlib-only modules; safe to import even if the SDK imports below fail
+from agent_cache import WarmAgentCache
+from socket_codec import (
+    ORJSON_AVAILABLE,
+    VOICE_FRAME_HEADER,
+    EnvelopeEncoder,
+    pack_audio_frame,
+    unpack_audio_frame,
+    write_audio_header,
+)
+from voice_output import VoiceOutputBuffer
+from voice_pool import VoiceAgentPool
+from query_embedding_cache import QueryEmbeddingCache
+from knowledge_catalog import KnowledgeCatalog
+from response_cache import ResponseCache, answer_text, replay_deltas, response_fingerprint
+from telemetry import (
+    TurnTimer,
+    elapsed_ms,
+    mark_error,
+    record,
+    set_attributes,
+    span,
+    timed_tool,
+)
+
+startup.mark("local_imports")
+
 print("[startup] Beginning runtime import sequence")
 try:
+    # MemoryClient and the voice stack are imported on first use
     from bedrock_agentcore.runtime import BedrockAgentCoreApp
-    from bedrock_agentcore.memory import MemoryClient
     from strands import Agent
-    from strands.models import BedrockModel
+    from strands.hooks.events import MessageAddedEvent
     from strands.tools import tool
     from starlette.websockets import WebSocketDisconnect
     from memory_hook_provider import MemoryHook
+    from conversation_window import TokenBudgetConversationManager
+    from prompt_cache import (
+        PromptCachingBedrockModel,
+        prompt_cache_config,
+        turn_usage,
+        usage_snapshot,
+    )
 
-    print("[startup] Imported bedrock_agentcore + strands + memory successfully")
+    print("[startup] Imported bedrock_agentcore + strands successfully")
 except Exception as import_err:
     print(f"[startup-error] Import failure: {import_err}\n{traceback.format_exc()}")
 
     # Fallback minimal shim so container still responds; tools disabled
     class BedrockAgentCoreApp:
+        def __init__(self, **kwargs):
+            pass
+
         def entrypoint(self, fn):
             self._fn = fn
             return fn
@@ -64,18 +116,45 @@ except Exception as import_err:
         pass
 
 
-BIDI_AVAILABLE = False
-try:
-    from strands.experimental.bidi import BidiAgent
-    from strands.experimental.bidi.models import BidiNovaSonicModel
+startup.mark("sdk_imports")
 
-    BIDI_AVAILABLE = True
-    print("[startup] Imported Strands bidirectional streaming successfully")
-except Exception as bidi_import_error:
-    print(
-        "[startup-warning] Voice dependencies unavailable: "
-        f"{bidi_import_error}\n{traceback.format_exc()}"
-    )
+# Voice stack (strands bidi + Nova Sonic) is imported on first use; most
+# sessions never start voice. None means "not resolved yet".
+BIDI_AVAILABLE = None
+_voice_stack_lock = threading.Lock()
+
+
+def load_voice_stack():
+    """Import the bidirectional voice stack once; returns BIDI_AVAILABLE."""
+    global BIDI_AVAILABLE, BidiAgent, BidiNovaSonicModel
+    if BIDI_AVAILABLE is not None:
+        return BIDI_AVAILABLE
+    with _voice_stack_lock:
+        if BIDI_AVAILABLE is None:
+            started = time.perf_counter()
+            try:
+                from strands.experimental.bidi import BidiAgent
+                from strands.experimental.bidi.models import BidiNovaSonicModel
+
+                BIDI_AVAILABLE = True
+                print(
+                    "[startup] Imported Strands bidirectional streaming successfully "
+                    f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+                )
+            except Exception as bidi_import_error:
+                BIDI_AVAILABLE = False
+                print(
+                    "[startup-warning] Voice dependencies unavailable: "
+                    f"{bidi_import_error}\n{traceback.format_exc()}"
+                )
+    return BIDI_AVAILABLE
+
+
+async def load_voice_stack_async():
+    """Resolve the voice stack on a worker thread; imports never block the loop."""
+    if BIDI_AVAILABLE is not None:
+        return BIDI_AVAILABLE
+    return await asyncio.to_thread(load_voice_stack)
 
 
 # Pin region deterministically via env provided by Terraform
@@ -87,14 +166,69 @@ MODEL_ID = os.environ.get(
     "FOUNDATION_MODEL", "us.anthropic.claude-haiku-4-5-20251001-v1:0"
 )
 AGENT_INSTRUCTION = os.environ.get("AGENT_INSTRUCTION", "You are a helpful assistant.")
+# Bedrock prompt caching: "auto" (models known to support it), "on" or "off"
+PROMPT_CACHE = os.environ.get("PROMPT_CACHE", "auto").lower()
 RAG_BUCKET = os.environ.get("RAG_BUCKET", "")
+RAG_EMBEDDINGS_KEY = os.environ.get("RAG_OUTPUT_KEY", "embeddings/embeddings.json")
+RAG_INDEX_PREFIX = os.environ.get("RAG_INDEX_PREFIX", "embeddings/index")
+RAG_CACHE_DIR = os.environ.get("RAG_CACHE_DIR", "/tmp/rag")
+RAG_EMBED_MODEL = os.environ.get("RAG_EMBED_MODEL", "amazon.titan-embed-text-v2:0")
+RAG_TOP_K = int(os.environ.get("RAG_TOP_K", "4"))
+RAG_IVF_NPROBE = int(os.environ.get("RAG_IVF_NPROBE", "8"))
+RAG_QUANTIZATION = os.environ.get("RAG_QUANTIZATION", "")  # "", "int8" or "pq"
+RAG_PQ_SUBSPACES = int(os.environ.get("RAG_PQ_SUBSPACES", "0"))  # 0: dimension / 4
+RAG_RERANK_FACTOR = int(os.environ.get("RAG_RERANK_FACTOR", "4"))
+RAG_REFRESH_SECONDS = int(os.environ.get("RAG_REFRESH_SECONDS", "300"))  # 0 disables
+RAG_QUERY_CACHE_TTL_SECONDS = int(os.environ.get("RAG_QUERY_CACHE_TTL_SECONDS", "86400"))
+RAG_QUERY_CACHE_MAX_ENTRIES = int(os.environ.get("RAG_QUERY_CACHE_MAX_ENTRIES", "512"))
+# Empty disables persistence; the file survives process restarts on a warm container
+RAG_QUERY_CACHE_PATH = os.environ.get(
+    "RAG_QUERY_CACHE_PATH", os.path.join(RAG_CACHE_DIR, "query_embeddings.npz")
+)
+# BM25 keyword search fused with vector search; confident keyword lookups skip
+# the query embedding when the fast path is on
+RAG_HYBRID = os.environ.get("RAG_HYBRID", "true").lower() == "true"
+RAG_KEYWORD_FAST_PATH = os.environ.get("RAG_KEYWORD_FAST_PATH", "true").lower() == "true"
+RAG_HYBRID_CANDIDATES = int(os.environ.get("RAG_HYBRID_CANDIDATES", "20"))
+MAX_RAG_TOP_K = 10
+KNOWLEDGE_CATALOG_PATH = os.environ.get(
+    "KNOWLEDGE_CATALOG_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "portfolio_catalog.json"),
+)
 MEMORY_ID = os.environ.get("MEMORY_ID", "")  # From Terraform memory resource
 SOCKET_PROTOCOL_VERSION = 1
 MAX_SOCKET_PROMPT_LENGTH = 2000
 MAX_SOCKET_TURNS = 20
+SOCKET_DELTA_WINDOW_MS = int(os.environ.get("SOCKET_DELTA_WINDOW_MS", "30"))
+MAX_SOCKET_DELTA_WINDOW_MS = 250
+SOCKET_DELTA_MAX_BYTES = 1024
 VOICE_MODEL_ID = os.environ.get("VOICE_MODEL", "amazon.nova-2-sonic-v1:0")
 MAX_VOICE_SESSION_SECONDS = 120
 MAX_VOICE_AUDIO_BYTES = 12 * 1024
+VOICE_AUDIO_TRANSPORTS = ("json", "binary")
+VOICE_OUTPUT_MAX_BUFFER_BYTES = int(
+    os.environ.get("VOICE_OUTPUT_MAX_BUFFER_BYTES", str(192 * 1024))
+)
+VOICE_OUTPUT_COALESCE_BYTES = 8 * 1024
+VOICE_POOL_SIZE = int(os.environ.get("VOICE_POOL_SIZE", "1"))
+# Pre-warming stops after this long without a voice session
+VOICE_POOL_IDLE_SECONDS = int(os.environ.get("VOICE_POOL_IDLE_SECONDS", "600"))
+VOICE_PREWARM_IMPORTS = os.environ.get("VOICE_PREWARM_IMPORTS", "true").lower() == "true"
+VOICE_OUTPUT_OVERFLOW_POLICY = os.environ.get(
+    "VOICE_OUTPUT_OVERFLOW_POLICY", "drop_oldest"
+)
+MEMORY_MAX_POOL_CONNECTIONS = int(os.environ.get("MEMORY_MAX_POOL_CONNECTIONS", "50"))
+AGENT_CACHE_TTL_SECONDS = int(os.environ.get("AGENT_CACHE_TTL_SECONDS", "600"))
+AGENT_CACHE_MAX_ENTRIES = int(os.environ.get("AGENT_CACHE_MAX_ENTRIES", "32"))
+# Session id of invocations that carry none; these never use the warm cache
+DEFAULT_SESSION_ID = "default-session"
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "3600"))  # 0 disables
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+# Conversation tokens sent per turn; older turns fold into a rolling summary
+CONVERSATION_TOKEN_BUDGET = int(os.environ.get("CONVERSATION_TOKEN_BUDGET", "4000"))  # 0 disables
+CONVERSATION_RECENT_TURNS = int(os.environ.get("CONVERSATION_RECENT_TURNS", "2"))
+CONVERSATION_SUMMARY_MODEL = os.environ.get("CONVERSATION_SUMMARY_MODEL", "") or MODEL_ID
+CONVERSATION_SUMMARY_MAX_TOKENS = 400
 
 # System prompt - Portfolio-focused conversational agent
 SYSTEM_PROMPT = f"""You are Charles Brady's AI portfolio assistant. Your role is to have natural, engaging conversations about Charles's professional work, technical expertise, and projects.
@@ -161,16 +295,49 @@ Remember: You're having a professional conversation, not just answering queries.
 
 # Initialize Bedrock model (guard if strands import failed)
 try:
-    model = BedrockModel(model_id=MODEL_ID, region_name=REGION)
-    print(f"[startup] Initialized BedrockModel {MODEL_ID} region {REGION}")
+    # Checkpoints after the static system prompt and tool specs; dropped
+    # automatically if Bedrock rejects them for this model
+    prompt_cache = prompt_cache_config(MODEL_ID, PROMPT_CACHE)
+    model = PromptCachingBedrockModel(
+        model_id=MODEL_ID, region_name=REGION, cache_config=prompt_cache
+    )
+    print(
+        f"[startup] Initialized BedrockModel {MODEL_ID} region {REGION} "
+        f"promptCache={'on' if prompt_cache else 'off'}"
+    )
 except Exception as model_err:
     print(f"[startup-error] Model init failed: {model_err}\n{traceback.format_exc()}")
     model = None
 
+startup.mark("model_init")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Warm deferred imports and the RAG index, and start the RAG refresher.
+    On shutdown, stop the background tasks and any pre-warmed voice agents.
+    """
+    warm_tasks = []
+    if VOICE_PREWARM_IMPORTS:
+        warm_tasks.append(asyncio.create_task(load_voice_stack_async()))
+    if RAG_BUCKET:
+        warm_tasks.append(asyncio.create_task(warm_rag_index()))
+        if RAG_REFRESH_SECONDS > 0:
+            warm_tasks.append(asyncio.create_task(refresh_rag_index_periodically()))
+    yield
+    for warm_task in warm_tasks:
+        warm_task.cancel()
+    await voice_pool.stop()
+
+
 # Initialize the AgentCore Runtime App
-app = BedrockAgentCoreApp()
+app = BedrockAgentCoreApp(lifespan=lifespan)
 print("[startup] App initialized")
+print(f"[startup] Socket JSON encoder: {'orjson' if ORJSON_AVAILABLE else 'json'}")
+startup.mark("app_init")
 print(f"[startup] ✓ Runtime ready - Model: {MODEL_ID}, Region: {REGION}")
+startup.emit()
 
 
 # ============================================================================
@@ -178,7 +345,12 @@ print(f"[startup] ✓ Runtime ready - Model: {MODEL_ID}, Region: {REGION}")
 # ============================================================================
 
 
+# Project and expertise responses are rendered once, when the catalog loads
+knowledge_catalog = KnowledgeCatalog.from_file(KNOWLEDGE_CATALOG_PATH)
+
+
 @tool
+@timed_tool
 def get_project_details(project_name: str) -> str:
     """
     Get detailed information about one of Charles's projects including architecture,
@@ -190,302 +362,546 @@ def get_project_details(project_name: str) -> str:
     Returns:
         Detailed project information including tech stack and architecture
     """
-    projects = {
-        "charlava": {
-            "description": "Full-stack AWS serverless platform for content delivery and user management",
-            "architecture": "Serverless microservices on AWS",
-            "tech_stack": [
-                "AWS Lambda (Node.js/TypeScript)",
-                "API Gateway with custom domain",
-                "DynamoDB for data persistence",
-                "Cognito for authentication",
-                "CloudFront CDN",
-                "S3 for static hosting",
-                "Terraform for IaC",
-            ],
-            "features": [
-                "Custom Cognito UI with branded login",
-                "RESTful API services",
-                "JWT-based authorization",
-                "Python training pipelines for ML",
-                "Nx monorepo structure",
-            ],
-            "highlights": "Demonstrates full AWS stack proficiency with infrastructure as code, serverless patterns, and production-ready security.",
-        },
-        "cb-common": {
-            "description": "Enterprise-grade monorepo platform with shared libraries and applications",
-            "architecture": "Nx monorepo with modular libraries and apps",
-            "tech_stack": [
-                "TypeScript/JavaScript",
-                "React with Material-UI",
-                "Express.js APIs",
-                "Jest for testing",
-                "AWS Lambda deployment",
-                "Nx build system",
-            ],
-            "features": [
-                "Shared UI components (@cb-common/ui-react-auth)",
-                "API services with middleware",
-                "AgentCore integration",
-                "AI Chat interface",
-                "Reusable Lambda utilities",
-            ],
-            "highlights": "Shows architectural skills in creating scalable, maintainable codebases with code reuse and separation of concerns.",
-        },
-        "jamcam": {
-            "description": "Real-time 3D motion tracking and pose estimation application",
-            "architecture": "Computer vision pipeline with 3D rendering",
-            "tech_stack": [
-                "Python computer vision",
-                "Real-time pose estimation",
-                "3D graphics rendering",
-                "Model training pipelines",
-            ],
-            "features": [
-                "Real-time motion capture",
-                "3D skeleton tracking",
-                "Custom ML model training",
-                "Performance-optimized rendering",
-            ],
-            "highlights": "Demonstrates computer vision expertise and real-time processing capabilities.",
-        },
-        "guitar-normal-guy": {
-            "description": "AI-powered image processing service for composite image generation",
-            "architecture": "Node.js backend with YOLO integration",
-            "tech_stack": [
-                "Node.js/Express",
-                "YOLO object detection",
-                "Python ML models",
-                "Image processing pipelines",
-            ],
-            "features": [
-                "Object detection and segmentation",
-                "Automated composite generation",
-                "REST API for image processing",
-                "ML model integration",
-            ],
-            "highlights": "Combines traditional backend development with modern AI/ML capabilities.",
-        },
-        "agentcore": {
-            "description": "AWS Bedrock AgentCore runtime with conversational AI and memory",
-            "architecture": "Container-based agent runtime on AWS Bedrock",
-            "tech_stack": [
-                "AWS Bedrock AgentCore",
-                "Python with strands framework",
-                "Docker containers (ARM64)",
-                "CodeBuild for CI/CD",
-                "Memory API for conversation persistence",
-            ],
-            "features": [
-                "Conversational AI with memory",
-                "Custom tool development",
-                "Session management",
-                "Cognito-protected Lambda integration",
-                "Memory hooks for context retention",
-            ],
-            "highlights": "Cutting-edge AI agent implementation showcasing AWS Bedrock expertise and conversational AI development.",
-        },
-    }
+    project_key, match = knowledge_catalog.projects.lookup(project_name)
+    if project_key is None:
+        print(f"[catalog] No project matches {project_name!r}")
+        available = knowledge_catalog.projects.available
+        return f"I don't have detailed information about '{project_name}'. Available projects: {available}. Would you like to know about any of these?"
+    response = knowledge_catalog.projects.responses[project_key]
+    if match != "exact":
+        print(f"[catalog] Project {project_name!r} -> {project_key} ({match})")
+    if match == "fuzzy":
+        return f"No project is named '{project_name}'; closest match:\n\n{response}"
+    return response
 
-    project_key = project_name.lower().replace("-", "").replace("_", "")
-    project = projects.get(project_key)
 
-    if not project:
-        available = ", ".join(projects.keys())
-        return f"I don't have detailed information about '{project_name}'. Available projects: {available}. Would you like to know about any of these?"
+@tool
+@timed_tool
+def get_technical_expertise(area: str) -> str:
+    """
+    Get information about Charles's expertise in a specific technical area.
 
-    tech_list = "\n  - ".join(project["tech_stack"])
-    features_list = "\n  - ".join(project["features"])
+    Args:
+        area: Technical domain (e.g., 'aws', 'terraform', 'typescript', 'python', 'ai', 'frontend', 'backend')
 
-    return f"""**{project_name.upper()} Project**
+    Returns:
+        Details about experience and capabilities in that area
+    """
+    area_key, match = knowledge_catalog.expertise.lookup(area)
+    if area_key is None:
+        print(f"[catalog] No expertise area matches {area!r}")
+        available = knowledge_catalog.expertise.available
+        return f"I can discuss expertise in: {available}. Which area interests you?"
+    response = knowledge_catalog.expertise.responses[area_key]
+    if match != "exact":
+        print(f"[catalog] Expertise {area!r} -> {area_key} ({match})")
+    if match == "fuzzy":
+        return f"No expertise area is named '{area}'; closest match:\n\n{response}"
+    return response
+
+
+# Loaded on first use (or in the background at startup) and replaced by the
+# refresher when the bucket's index changes; numpy is only imported when RAG
+# is enabled. Searches take a local reference, so a swap never disturbs one
+# that is already running.
+_rag_index = None
+_rag_lock = threading.Lock()
+_bedrock_runtime = None
+
+# Repeated questions reuse their embedding instead of another Bedrock call
+query_embedding_cache = QueryEmbeddingCache(
+    ttl_seconds=RAG_QUERY_CACHE_TTL_SECONDS,
+    max_entries=RAG_QUERY_CACHE_MAX_ENTRIES,
+    path=RAG_QUERY_CACHE_PATH if RAG_BUCKET else "",
+)
+atexit.register(query_embedding_cache.save)
 
-{project['description']}
 
-**Architecture:** {project['architecture']}
+def load_rag_index(if_none_match=None):
+    """
+    Load (and optionally quantize) the index from RAG_BUCKET.
 
-**Technology Stack:**
-  - {tech_list}
+    Returns:
+        The new index, or None when its ETag still equals `if_none_match`
+    """
+    from rag_retrieval import load_index_from_s3
+
+    started_at = time.perf_counter()
+    index = load_index_from_s3(
+        boto3.client("s3", region_name=REGION),
+        RAG_BUCKET,
+        index_prefix=RAG_INDEX_PREFIX,
+        json_key=RAG_EMBEDDINGS_KEY,
+        cache_dir=RAG_CACHE_DIR,
+        if_none_match=if_none_match,
+        nprobe=RAG_IVF_NPROBE,
+        rerank_factor=RAG_RERANK_FACTOR,
+    )
+    if index is None:
+        return None
+    if RAG_QUANTIZATION:
+        options = {}
+        if RAG_QUANTIZATION == "pq":
+            options["subspaces"] = RAG_PQ_SUBSPACES
+        try:
+            code_bytes = index.quantize(RAG_QUANTIZATION, **options)
+            # The float matrix stays memory-mapped for re-ranking; only the
+            # codes and the re-ranked rows are resident
+            print(
+                f"[rag] Quantized index ({RAG_QUANTIZATION}): "
+                f"{code_bytes / 1048576:.1f} MB resident codes, "
+                f"{index.matrix.nbytes / code_bytes:.1f}x smaller than the "
+                f"{index.matrix.nbytes / 1048576:.1f} MB memory-mapped float matrix"
+            )
+        except ValueError as quantize_error:
+            # Keep serving float search rather than failing retrieval
+            print(f"[rag] Quantization skipped: {quantize_error}")
+    if RAG_HYBRID:
+        lexical_started_at = time.perf_counter()
+        terms = index.build_lexical_index()
+        print(
+            f"[rag] Built BM25 index: {terms} terms, "
+            f"{index.lexical.nbytes / 1048576:.1f} MB in "
+            f"{(time.perf_counter() - lexical_started_at) * 1000:.0f}ms"
+        )
+    print(
+        f"[rag] Loaded {len(index)} chunks "
+        f"(dim={index.dimension}, dtype={index.matrix.dtype}, "
+        f"format={index.format}, model={index.model}, "
+        f"ivf_lists={index.ivf.n_lists if index.ivf else 0}, etag={index.etag}) in "
+        f"{(time.perf_counter() - started_at) * 1000:.0f}ms"
+    )
+    return index
 
-**Key Features:**
-  - {features_list}
 
-**Highlights:** {project['highlights']}
-"""
+def get_rag_index():
+    """Return the shared embedding index, loading it from RAG_BUCKET on first use."""
+    global _rag_index
+    if _rag_index is None and RAG_BUCKET:
+        with _rag_lock:
+            if _rag_index is None:
+                _rag_index = load_rag_index()
+    return _rag_index
+
+
+def refresh_rag_index():
+    """
+    Reload the index if its S3 object changed (conditional GET on the ETag).
+    The replacement is fully built before the reference is swapped.
+
+    Returns:
+        True when a new index was swapped in
+    """
+    global _rag_index
+    with _rag_lock:
+        current = _rag_index
+        replacement = load_rag_index(if_none_match=current.etag if current else None)
+        if replacement is None:
+            return False
+        _rag_index = replacement
+    return True
+
+
+async def warm_rag_index():
+    try:
+        await asyncio.to_thread(get_rag_index)
+    except Exception as load_error:
+        print(f"[rag] Index preload failed: {load_error}")
+
+
+async def refresh_rag_index_periodically():
+    """Poll the bucket every RAG_REFRESH_SECONDS; builds run on a worker thread."""
+    while True:
+        # Jitter spreads polls from containers that started together
+        await asyncio.sleep(RAG_REFRESH_SECONDS * random.uniform(0.9, 1.1))
+        try:
+            if await asyncio.to_thread(refresh_rag_index):
+                print("[rag] Swapped in refreshed index")
+        except Exception as refresh_error:
+            print(f"[rag] Index refresh failed, keeping current index: {refresh_error}")
+
+
+def get_bedrock_runtime():
+    """Return the shared bedrock-runtime client, creating it on first use."""
+    global _bedrock_runtime
+    if _bedrock_runtime is None:
+        _bedrock_runtime = boto3.client("bedrock-runtime", region_name=REGION)
+    return _bedrock_runtime
+
+
+def embed_query(text, model_id):
+    """
+    Embed a search query with the same Bedrock model used at ingestion.
+
+    Returns:
+        Tuple of (embedding, cached)
+    """
+    embedding = query_embedding_cache.get(model_id, text)
+    if embedding is not None:
+        return embedding, True
+
+    response = get_bedrock_runtime().invoke_model(
+        modelId=model_id,
+        contentType="application/json",
+        accept="application/json",
+        body=json.dumps({"inputText": text}),
+    )
+    embedding = json.loads(response["body"].read())["embedding"]
+    query_embedding_cache.put(model_id, text, embedding)
+    return embedding, False
 
 
 @tool
-def get_technical_expertise(area: str) -> str:
+@timed_tool
+def search_knowledge_base(query: str, top_k: int = RAG_TOP_K) -> str:
     """
-    Get information about Charles's expertise in a specific technical area.
+    Search Charles's documents (project write-ups, notes, and articles) for
+    passages relevant to a question. Use this for details not covered by the
+    other tools.
 
     Args:
-        area: Technical domain (e.g., 'aws', 'terraform', 'typescript', 'python', 'ai', 'frontend', 'backend')
+        query: Natural-language question or keywords to search for
+        top_k: Number of passages to return (1-10)
 
     Returns:
-        Details about experience and capabilities in that area
+        The most relevant passages with their source files
     """
-    expertise = {
-        "aws": {
-            "level": "Advanced",
-            "services": [
-                "Lambda (serverless functions)",
-                "API Gateway (REST APIs)",
-                "DynamoDB (NoSQL database)",
-                "S3 (object storage)",
-                "Cognito (authentication/authorization)",
-                "CloudFront (CDN)",
-                "Bedrock (AI/ML)",
-                "CodeBuild (CI/CD)",
-                "ECR (container registry)",
-                "IAM (security/permissions)",
-            ],
-            "experience": "Production deployments with infrastructure as code (Terraform), serverless architectures, security best practices, and cost optimization.",
-        },
-        "terraform": {
-            "level": "Advanced",
-            "capabilities": [
-                "Multi-environment deployments",
-                "Custom module development",
-                "State management",
-                "Complex dependency orchestration",
-                "AWS provider expertise",
-                "Security and compliance patterns",
-            ],
-            "experience": "Extensive Terraform modules for AWS infrastructure including networking, compute, serverless, AI services, and complete application stacks.",
-        },
-        "typescript": {
-            "level": "Advanced",
-            "areas": [
-                "React applications",
-                "Node.js backend services",
-                "Express.js APIs",
-                "Type-safe architectures",
-                "Nx monorepo tooling",
-                "Jest testing",
-            ],
-            "experience": "Full-stack TypeScript development with emphasis on type safety, maintainability, and modern development practices.",
-        },
-        "python": {
-            "level": "Advanced",
-            "areas": [
-                "AI/ML pipelines",
-                "Computer vision (OpenCV, YOLO)",
-                "Backend services",
-                "AWS Lambda functions",
-                "Data processing",
-                "Agent development (strands, bedrock-agentcore)",
-            ],
-            "experience": "Production Python for AI/ML workflows, serverless functions, and computer vision applications.",
-        },
-        "ai": {
-            "level": "Intermediate to Advanced",
-            "capabilities": [
-                "AWS Bedrock integration",
-                "Conversational AI agents",
-                "Computer vision (pose estimation, object detection)",
-                "ML model training and deployment",
-                "Agent memory and tool development",
-                "Prompt engineering",
-            ],
-            "experience": "Building production AI systems with AWS Bedrock, custom agent development, and computer vision applications.",
-        },
-        "frontend": {
-            "level": "Advanced",
-            "technologies": [
-                "React with hooks",
-                "Material-UI component library",
-                "TypeScript",
-                "Responsive design",
-                "State management",
-                "API integration",
-            ],
-            "experience": "Modern React applications with focus on user experience, accessibility, and maintainable component architectures.",
-        },
-        "backend": {
-            "level": "Advanced",
-            "technologies": [
-                "Node.js/Express",
-                "AWS Lambda",
-                "RESTful API design",
-                "Authentication/Authorization",
-                "Database design (DynamoDB, SQL)",
-                "Microservices architecture",
-            ],
-            "experience": "Production backend services with serverless and traditional architectures, emphasizing scalability and security.",
-        },
-    }
+    try:
+        index = get_rag_index()
+    except Exception as load_error:
+        print(f"[rag] Index load failed: {load_error}")
+        return "The knowledge base is unavailable right now."
+    if index is None:
+        return "The knowledge base is not configured."
+
+    top_k = max(1, min(top_k, MAX_RAG_TOP_K))
+    try:
+        started_at = time.perf_counter()
+        keyword_hits, confident = [], False
+        if index.lexical is not None:
+            keyword_hits, confident = index.keyword_search(
+                query, top_k=max(top_k, RAG_HYBRID_CANDIDATES)
+            )
+        if confident and RAG_KEYWORD_FAST_PATH:
+            hits = keyword_hits[:top_k]
+            print(
+                f"[rag] Search mode=keyword "
+                f"{(time.perf_counter() - started_at) * 1000:.2f}ms"
+            )
+        else:
+            query_vector, cached = embed_query(query, index.model or RAG_EMBED_MODEL)
+            embedded_at = time.perf_counter()
+            if keyword_hits:
+                from rag_lexical import reciprocal_rank_fusion
+
+                vector_hits = index.search(
+                    query_vector, top_k=max(top_k, RAG_HYBRID_CANDIDATES)
+                )[0]
+                hits = reciprocal_rank_fusion(
+                    {"vector": vector_hits, "bm25": keyword_hits}, top_k
+                )
+            else:
+                hits = index.search(query_vector, top_k=top_k)[0]
+            print(
+                f"[rag] Search mode={'hybrid' if keyword_hits else 'vector'} "
+                f"embed={'cached' if cached else 'bedrock'} "
+                f"{(embedded_at - started_at) * 1000:.0f}ms, "
+                f"search {(time.perf_counter() - embedded_at) * 1000:.1f}ms, "
+                f"query cache {query_embedding_cache.stats()}"
+            )
+    except Exception as search_error:
+        print(f"[rag] Search failed: {search_error}")
+        return "The knowledge base search failed."
+
+    if not hits:
+        return "No relevant passages found."
+    return "\n\n".join(
+        f"**{hit.get('file', hit.get('id'))}** ({rag_hit_scores(rank, hit)})\n{hit['text']}"
+        for rank, hit in enumerate(hits, start=1)
+    )
 
-    area_key = area.lower().replace(" ", "").replace("-", "")
-    info = expertise.get(area_key)
 
-    if not info:
-        available = ", ".join(expertise.keys())
-        return f"I can discuss expertise in: {available}. Which area interests you?"
-
-    details_key = (
-        "services"
-        if "services" in info
-        else (
-            "capabilities"
-            if "capabilities" in info
-            else "areas" if "areas" in info else "technologies"
-        )
+def rag_hit_scores(rank, hit):
+    """
+    Score label for a rendered passage. Fused hybrid hits show their rank and
+    the original vector/BM25 scores; the reciprocal-rank value means nothing
+    to the model.
+    """
+    if "source_scores" not in hit:
+        return f"score {hit['score']:.2f}"
+    scores = ", ".join(
+        f"{source} {score:.2f}" for source, score in hit["source_scores"].items()
     )
-    details_list = "\n  - ".join(info.get(details_key, []))
+    return f"rank {rank}; {scores}"
 
-    return f"""**{area.upper()} Expertise**
 
-**Level:** {info['level']}
+AGENT_TOOLS = [get_project_details, get_technical_expertise]
+if RAG_BUCKET:
+    AGENT_TOOLS.append(search_knowledge_base)
 
-**{details_key.title()}:**
-  - {details_list}
 
-**Experience:** {info['experience']}
-"""
+# Complete answers to first-turn prompts, shared by invoke and the websocket
+response_cache = ResponseCache(
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS, max_entries=RESPONSE_CACHE_MAX_ENTRIES
+)
+_response_fingerprint = response_fingerprint(
+    SYSTEM_PROMPT,
+    MODEL_ID,
+    [
+        getattr(agent_tool, "tool_spec", getattr(agent_tool, "__name__", ""))
+        for agent_tool in AGENT_TOOLS
+    ],
+    dict(knowledge_catalog.projects.responses),
+    dict(knowledge_catalog.expertise.responses),
+)
+
+
+def current_response_fingerprint():
+    """Fingerprint of the static answer inputs plus the loaded RAG index version."""
+    rag_index = _rag_index
+    return f"{_response_fingerprint}:{rag_index.etag if rag_index is not None else ''}"
+
+
+def record_cached_turn(agent, prompt, answer):
+    """
+    Add a replayed turn to the agent's conversation as if it had been
+    generated, so follow-ups have context and memory hooks persist it.
+    """
+    for message in (
+        {"role": "user", "content": [{"text": prompt}]},
+        {"role": "assistant", "content": [{"text": answer}]},
+    ):
+        agent.messages.append(message)
+        agent.hooks.invoke_callbacks(MessageAddedEvent(agent=agent, message=message))
 
 
 # ============================================================================
 # WEBSOCKET - AgentCore Runtime streaming handler
 # ============================================================================
 
+# One MemoryClient for the life of the process: boto3 clients are thread-safe,
+# so every request shares its credentials and keep-alive connection pool
+_memory_client = None
+_memory_client_lock = threading.Lock()
+
+
+def get_memory_client():
+    """Return the shared MemoryClient, creating it on first use."""
+    global _memory_client
+    if _memory_client is None:
+        with _memory_client_lock:
+            if _memory_client is None:
+                from bedrock_agentcore.memory import MemoryClient
+
+                botocore_session = botocore.session.get_session()
+                botocore_session.set_default_client_config(
+                    Config(
+                        max_pool_connections=MEMORY_MAX_POOL_CONNECTIONS,
+                        tcp_keepalive=True,
+                    )
+                )
+                _memory_client = MemoryClient(
+                    region_name=REGION,
+                    boto3_session=boto3.Session(botocore_session=botocore_session),
+                )
+                print(
+                    f"[startup] MemoryClient ready - pool={MEMORY_MAX_POOL_CONNECTIONS}, "
+                    f"region={REGION}"
+                )
+    return _memory_client
+
+
+# Live agents for repeated HTTP invocations of the same session
+agent_cache = WarmAgentCache(
+    ttl_seconds=AGENT_CACHE_TTL_SECONDS, max_entries=AGENT_CACHE_MAX_ENTRIES
+)
+
 
-def create_agent(session_id, actor_id):
-    """Create a session-scoped agent and optional memory hook."""
+def create_agent(session_id, actor_id, memory=True):
+    """
+    Create a session-scoped agent and optional memory hook.
+
+    Agent construction fires the memory hook's history load, which is a
+    blocking Memory API call. Coroutines should use `create_agent_async`.
+    With `memory=False` the agent neither loads nor saves memory.
+
+    Returns:
+        Tuple of (agent, memory_hook); memory_hook is None when disabled
+    """
     if model is None:
         raise RuntimeError("Agent model not initialized")
 
     memory_hook = None
-    if MEMORY_ID:
+    if MEMORY_ID and memory:
         try:
-            memory_client = MemoryClient()
             memory_hook = MemoryHook(
-                memory_client=memory_client,
+                memory_client=get_memory_client(),
                 memory_id=MEMORY_ID,
                 actor_id=actor_id,
                 session_id=session_id,
             )
         except Exception as memory_error:
-            print(f"[websocket] Memory initialization failed: {memory_error}")
+            print(f"[agent] Memory initialization failed: {memory_error}")
 
     agent_kwargs = {
         "model": model,
-        "tools": [get_project_details, get_technical_expertise],
+        "tools": AGENT_TOOLS,
         "system_prompt": SYSTEM_PROMPT,
     }
+    if CONVERSATION_TOKEN_BUDGET > 0:
+        agent_kwargs["conversation_manager"] = TokenBudgetConversationManager(
+            summarize=summarize_conversation,
+            persist=memory_hook.save_summary if memory_hook else None,
+            token_budget=CONVERSATION_TOKEN_BUDGET,
+            recent_turns=CONVERSATION_RECENT_TURNS,
+        )
     if memory_hook:
         agent_kwargs["hooks"] = [memory_hook]
 
-    return Agent(**agent_kwargs)
+    with span("agent.create", session_id=session_id, model=MODEL_ID, memory=bool(memory_hook)):
+        return Agent(**agent_kwargs), memory_hook
 
 
-async def send_socket_event(websocket, event_type, **payload):
-    await websocket.send_json(
-        {
-            "version": SOCKET_PROTOCOL_VERSION,
-            "type": event_type,
-            **payload,
-        }
+SUMMARY_INSTRUCTION = """You maintain a running summary of a conversation between a visitor and Charles Brady's portfolio assistant.
+Merge the new transcript into the existing summary. Keep names, projects, technologies, questions asked and facts or preferences the visitor shared; drop pleasantries and anything the assistant can look up again with its tools.
+Reply with the updated summary only, in at most 200 words."""
+
+
+def summarize_conversation(summary, transcript):
+    """Fold a transcript of older turns into the running summary (worker thread)."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = get_bedrock_runtime().converse(
+            modelId=CONVERSATION_SUMMARY_MODEL,
+            system=[{"text": SUMMARY_INSTRUCTION}],
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "text": f"Existing summary:\n{summary or '(none)'}\n\n"
+                            f"New transcript:\n{transcript}"
+                        }
+                    ],
+                }
+            ],
+            inferenceConfig={"maxTokens": CONVERSATION_SUMMARY_MAX_TOKENS, "temperature": 0},
+        )
+        outcome = "ok"
+    finally:
+        record(
+            "agentcore.context.summary.duration",
+            elapsed_ms(started),
+            model=CONVERSATION_SUMMARY_MODEL,
+            outcome=outcome,
+        )
+    print(
+        f"[context] Summary updated in {elapsed_ms(started):.0f}ms "
+        f"usage={response.get('usage')}"
     )
+    return "".join(
+        block.get("text", "") for block in response["output"]["message"]["content"]
+    )
+
+
+def context_stats(agent):
+    """Conversation window stats for log lines; None without a token budget."""
+    stats = getattr(getattr(agent, "conversation_manager", None), "stats", None)
+    return stats() if stats is not None else None
+
+
+async def create_agent_async(session_id, actor_id, memory=True):
+    """Build the agent on a worker thread so history loads never block the event loop."""
+    return await asyncio.to_thread(create_agent, session_id, actor_id, memory)
+
+
+# Pre-encoded envelopes; frames are identical to websocket.send_json output
+socket_encoder = EnvelopeEncoder(SOCKET_PROTOCOL_VERSION)
+
+
+async def send_socket_event(websocket, event_type, **payload):
+    """Send one protocol event as a JSON text frame and return its size in bytes."""
+    frame = socket_encoder.encode(event_type, payload)
+    await websocket.send_text(frame.decode("utf-8"))
+    return len(frame)
+
+
+class DeltaCoalescer:
+    """
+    Batches streamed text into fewer chat.delta frames.
+    The first delta of a response is sent immediately so time to first token
+    is unchanged; later deltas are held until the window elapses or the
+    buffer reaches `max_bytes`, whichever comes first.
+    """
+
+    def __init__(self, websocket, request_id, window_ms, max_bytes):
+        self.websocket = websocket
+        self.request_id = request_id
+        self.window_seconds = window_ms / 1000
+        self.max_bytes = max_bytes
+        self.deltas = 0
+        self.frames = 0
+        self.bytes_sent = 0
+        self.unbatched_bytes = 0
+        self._parts = []
+        self._buffered_bytes = 0
+        self._timer = None
+        self._send_lock = asyncio.Lock()
+        # Envelope size of an empty delta frame, for the unbatched estimate
+        self._frame_overhead = len(
+            socket_encoder.encode("chat.delta", {"requestId": request_id, "delta": ""})
+        )
+
+    async def add(self, text):
+        size = len(text.encode("utf-8"))
+        self.deltas += 1
+        self.unbatched_bytes += self._frame_overhead + size
+        self._parts.append(text)
+        self._buffered_bytes += size
+
+        if (
+            self.frames == 0
+            or self.window_seconds <= 0
+            or self._buffered_bytes >= self.max_bytes
+        ):
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+    async def flush(self):
+        self.cancel()
+        await self._send_buffer()
+
+    def cancel(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window_seconds)
+        # Detach before sending so flush() never cancels a send in progress
+        self._timer = None
+        try:
+            await self._send_buffer()
+        except Exception as send_error:
+            # A dead socket surfaces again on the stream's next send
+            print(f"[websocket] Delayed delta flush failed: {send_error}")
+
+    async def _send_buffer(self):
+        async with self._send_lock:
+            if not self._parts:
+                return
+            delta = "".join(self._parts)
+            self._parts = []
+            self._buffered_bytes = 0
+            self.bytes_sent += await send_socket_event(
+                self.websocket,
+                "chat.delta",
+                requestId=self.request_id,
+                delta=delta,
+            )
+            self.frames += 1
 
 
 class VoiceSessionStopped(Exception):
@@ -508,12 +924,24 @@ class VoiceSocketInput:
                 raise VoiceSessionLimitReached()
 
             try:
-                message = await asyncio.wait_for(
-                    self.websocket.receive_json(), timeout=remaining
+                frame = await asyncio.wait_for(
+                    self.websocket.receive(), timeout=remaining
                 )
             except asyncio.TimeoutError as error:
                 raise VoiceSessionLimitReached() from error
 
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            # Binary frames carry raw PCM behind a small header
+            if frame.get("bytes") is not None:
+                audio_event = await self.read_binary_audio(frame["bytes"])
+                if audio_event:
+                    return audio_event
+                continue
+
+            message = json.loads(frame.get("text") or "")
+
             if not isinstance(message, dict):
                 await send_socket_event(
                     self.websocket,
@@ -575,15 +1003,75 @@ class VoiceSocketInput:
                 "channels": 1,
             }
 
+    async def read_binary_audio(self, data):
+        """Validate a binary audio frame; returns the model input event or None."""
+        try:
+            sample_rate, channels, pcm = unpack_audio_frame(data)
+        except ValueError:
+            pcm = None
+
+        if not pcm or len(pcm) > MAX_VOICE_AUDIO_BYTES:
+            await send_socket_event(
+                self.websocket,
+                "voice.error",
+                message="Voice audio chunk is invalid.",
+            )
+            return None
 
-async def send_voice_output(websocket, event):
+        if sample_rate != 16000 or channels != 1:
+            await send_socket_event(
+                self.websocket,
+                "voice.error",
+                message="Voice audio must be 16 kHz mono PCM.",
+            )
+            return None
+
+        # The model input event takes base64; encode straight from the frame view
+        return {
+            "type": "bidi_audio_input",
+            "audio": base64.b64encode(pcm).decode("ascii"),
+            "format": "pcm",
+            "sample_rate": 16000,
+            "channels": 1,
+        }
+
+
+async def send_voice_output(websocket, event, audio_transport="json"):
     event_type = event.get("type") if isinstance(event, dict) else None
 
-    if event_type == "bidi_audio_stream":
+    # Audio arrives base64-encoded from the model, or as raw bytes once the
+    # output buffer has merged several chunks
+    audio = event.get("audio") if event_type == "bidi_audio_stream" else None
+
+    if (
+        event_type == "bidi_audio_stream"
+        and audio_transport == "binary"
+        and event.get("format") == "pcm"
+    ):
+        if event.get("audio_offset") == VOICE_FRAME_HEADER.size:
+            # Merged audio was collected behind reserved header bytes; stamp
+            # the header in place and send the buffer as-is
+            frame = write_audio_header(
+                audio, event.get("sample_rate"), event.get("channels")
+            )
+        else:
+            # The stdlib cannot base64-decode into an existing buffer, so a
+            # single model chunk is decoded and then copied once into the frame
+            frame = pack_audio_frame(
+                base64.b64decode(audio) if isinstance(audio, str) else audio,
+                event.get("sample_rate"),
+                event.get("channels"),
+            )
+        await websocket.send_bytes(frame)
+    elif event_type == "bidi_audio_stream":
+        if isinstance(audio, bytearray):
+            audio = base64.b64encode(
+                memoryview(audio)[event.get("audio_offset", 0) :]
+            ).decode("ascii")
         await send_socket_event(
             websocket,
             "voice.audio",
-            audio=event.get("audio"),
+            audio=audio,
             format=event.get("format"),
             sampleRate=event.get("sample_rate"),
             channels=event.get("channels"),
@@ -618,15 +1106,12 @@ async def send_voice_output(websocket, event):
         )
 
 
-async def run_voice_session(websocket, session_id):
-    if not BIDI_AVAILABLE:
-        await send_socket_event(
-            websocket,
-            "voice.error",
-            message="Voice mode is temporarily unavailable.",
-        )
-        return
-
+async def start_voice_agent(invocation_state):
+    """
+    Build a voice agent and open its model stream. The agent keeps
+    `invocation_state` by reference, so pooled agents get their session
+    context added when a session acquires them.
+    """
     model = BidiNovaSonicModel(
         model_id=VOICE_MODEL_ID,
         provider_config={
@@ -637,21 +1122,105 @@ async def run_voice_session(websocket, session_id):
     )
     agent = BidiAgent(
         model=model,
-        tools=[get_project_details, get_technical_expertise],
+        tools=AGENT_TOOLS,
         system_prompt=(
             f"{SYSTEM_PROMPT}\n\n"
             "You are speaking aloud. Keep answers concise and conversational."
         ),
     )
+    invocation_state["mode"] = "voice"
+    try:
+        await agent.start(invocation_state=invocation_state)
+    except Exception:
+        await agent.stop()
+        raise
+    return agent
+
+
+async def stop_voice_agent(agent):
+    await agent.stop()
+
+
+# Pre-started voice agents; none idles longer than a full voice session
+voice_pool = VoiceAgentPool(
+    factory=start_voice_agent,
+    close=stop_voice_agent,
+    size=VOICE_POOL_SIZE,
+    max_idle_seconds=MAX_VOICE_SESSION_SECONDS,
+    idle_shutdown_seconds=VOICE_POOL_IDLE_SECONDS,
+)
+
+
+async def run_voice_session(websocket, session_id, audio_transport="json"):
+    started_at = time.monotonic()
+    if not await load_voice_stack_async():
+        await send_socket_event(
+            websocket,
+            "voice.error",
+            message="Voice mode is temporarily unavailable.",
+        )
+        return
+
+    agent = None
+    output_buffer = VoiceOutputBuffer(
+        max_audio_bytes=VOICE_OUTPUT_MAX_BUFFER_BYTES,
+        coalesce_max_bytes=VOICE_OUTPUT_COALESCE_BYTES,
+        overflow_policy=VOICE_OUTPUT_OVERFLOW_POLICY,
+        # Binary clients get merged audio with room for the frame header
+        audio_headroom=VOICE_FRAME_HEADER.size if audio_transport == "binary" else 0,
+    )
     output_task = None
     input_task = None
+    # When the model finalized the user's last utterance; cleared by the
+    # first reply audio sent after it (the audio round trip)
+    heard_at = None
+    voice_attributes = {"mode": "voice", "model": VOICE_MODEL_ID}
 
     try:
-        await agent.start(invocation_state={"session_id": session_id, "mode": "voice"})
+        with span("voice.setup", session_id=session_id, **voice_attributes) as setup_span:
+            agent, warm = await voice_pool.acquire(session_id=session_id)
+            set_attributes(setup_span, warm=warm, audio_transport=audio_transport)
+
+        async def send_outputs():
+            nonlocal heard_at
+            try:
+                while True:
+                    event = await output_buffer.get()
+                    if event is None:
+                        return
+                    await send_voice_output(websocket, event, audio_transport)
+                    if heard_at is not None and event.get("type") == "bidi_audio_stream":
+                        record(
+                            "agentcore.voice.round_trip",
+                            elapsed_ms(heard_at),
+                            audio_transport=audio_transport,
+                            **voice_attributes,
+                        )
+                        heard_at = None
+            finally:
+                # Unblock the model reader if the socket went away
+                output_buffer.close()
 
         async def forward_outputs():
-            async for event in agent.receive():
-                await send_voice_output(websocket, event)
+            nonlocal heard_at
+            # The model stream only waits on the buffer, never on the socket
+            sender = asyncio.create_task(send_outputs())
+            try:
+                async for event in agent.receive():
+                    if sender.done():
+                        break
+                    if (
+                        event.get("type") == "bidi_transcript_stream"
+                        and event.get("role") == "user"
+                        and event.get("is_final")
+                    ):
+                        heard_at = time.perf_counter()
+                    await output_buffer.put(event)
+                output_buffer.close()
+                await sender
+            finally:
+                sender.cancel()
+                await asyncio.gather(sender, return_exceptions=True)
 
         output_task = asyncio.create_task(forward_outputs())
         await send_socket_event(
@@ -660,6 +1229,14 @@ async def run_voice_session(websocket, session_id):
             sampleRate=16000,
             channels=1,
             maxDurationSeconds=MAX_VOICE_SESSION_SECONDS,
+            audioTransport=audio_transport,
+            audioFrameHeaderBytes=VOICE_FRAME_HEADER.size,
+        )
+        setup_ms = (time.monotonic() - started_at) * 1000
+        record("agentcore.voice.setup.duration", setup_ms, warm=warm, **voice_attributes)
+        print(
+            f"[voice] voice.start->voice.ready {session_id}: "
+            f"{setup_ms:.0f}ms warm={warm} {voice_pool.stats()}"
         )
 
         voice_input = VoiceSocketInput(websocket)
@@ -692,7 +1269,9 @@ async def run_voice_session(websocket, session_id):
         if output_task:
             output_task.cancel()
             await asyncio.gather(output_task, return_exceptions=True)
-        await agent.stop()
+        if agent:
+            await agent.stop()
+        print(f"[voice] Output stats {session_id}: {output_buffer.stats()}")
 
 
 @app.websocket
@@ -703,7 +1282,7 @@ async def websocket_handler(websocket, context):
     actor_id = f"public-{session_id}"
 
     try:
-        agent = create_agent(session_id, actor_id)
+        agent, memory_hook = await create_agent_async(session_id, actor_id)
     except Exception as agent_error:
         print(f"[websocket] Agent initialization failed: {agent_error}")
         await send_socket_event(
@@ -722,17 +1301,27 @@ async def websocket_handler(websocket, context):
             "maxPromptLength": MAX_SOCKET_PROMPT_LENGTH,
             "maxTurns": MAX_SOCKET_TURNS,
         },
+        streaming={
+            "deltaWindowMs": SOCKET_DELTA_WINDOW_MS,
+            "maxDeltaWindowMs": MAX_SOCKET_DELTA_WINDOW_MS,
+            "deltaMaxBytes": SOCKET_DELTA_MAX_BYTES,
+        },
     )
 
     turn_count = 0
+    delta_window_ms = SOCKET_DELTA_WINDOW_MS
 
     try:
         while True:
             message = await websocket.receive_json()
 
             if isinstance(message, dict) and message.get("type") == "voice.start":
+                # Clients opt into raw PCM binary frames; JSON/base64 stays the default
+                audio_transport = message.get("audioTransport")
+                if audio_transport not in VOICE_AUDIO_TRANSPORTS:
+                    audio_transport = "json"
                 try:
-                    await run_voice_session(websocket, session_id)
+                    await run_voice_session(websocket, session_id, audio_transport)
                 except WebSocketDisconnect:
                     raise
                 except Exception as voice_error:
@@ -747,6 +1336,27 @@ async def websocket_handler(websocket, context):
                     )
                 continue
 
+            if isinstance(message, dict) and message.get("type") == "session.configure":
+                # Clients may tune delta coalescing after session.ready
+                window = message.get("deltaWindowMs")
+                if not isinstance(window, int) or isinstance(window, bool):
+                    await send_socket_event(
+                        websocket,
+                        "chat.error",
+                        message="deltaWindowMs must be an integer.",
+                    )
+                    continue
+                delta_window_ms = max(0, min(window, MAX_SOCKET_DELTA_WINDOW_MS))
+                await send_socket_event(
+                    websocket,
+                    "session.configured",
+                    streaming={
+                        "deltaWindowMs": delta_window_ms,
+                        "deltaMaxBytes": SOCKET_DELTA_MAX_BYTES,
+                    },
+                )
+                continue
+
             if not isinstance(message, dict) or message.get("type") != "chat.send":
                 await send_socket_event(
                     websocket,
@@ -799,33 +1409,82 @@ async def websocket_handler(websocket, context):
                 turn=turn_count,
             )
 
-            try:
-                async for event in agent.stream_async(content):
-                    text_delta = event.get("data") if isinstance(event, dict) else None
-                    if isinstance(text_delta, str) and text_delta:
-                        await send_socket_event(
-                            websocket,
-                            "chat.delta",
-                            requestId=request_id,
-                            delta=text_delta,
-                        )
-
-                await send_socket_event(
-                    websocket,
-                    "chat.complete",
-                    requestId=request_id,
-                )
-            except Exception as generation_error:
-                print(
-                    f"[websocket] Generation failed for {request_id}: "
-                    f"{generation_error}\n{traceback.format_exc()}"
-                )
-                await send_socket_event(
-                    websocket,
-                    "chat.error",
-                    requestId=request_id,
-                    message="The assistant could not complete that response.",
-                )
+            coalescer = DeltaCoalescer(
+                websocket, request_id, delta_window_ms, SOCKET_DELTA_MAX_BYTES
+            )
+            # Only a turn with no prior conversation has a shareable answer
+            cacheable = not agent.messages
+            fingerprint = current_response_fingerprint() if cacheable else None
+            cached_answer = response_cache.get(fingerprint, content) if cacheable else None
+            cache_outcome = "skip" if not cacheable else "miss" if cached_answer is None else "hit"
+            turn_attributes = {"mode": "chat", "model": MODEL_ID, "response_cache": cache_outcome}
+            timer = TurnTimer(**turn_attributes)
+            with span(
+                "chat.turn",
+                session_id=session_id,
+                request_id=request_id,
+                turn=turn_count,
+                **turn_attributes,
+            ) as turn_span:
+                try:
+                    if cached_answer is not None:
+                        for text_delta in replay_deltas(cached_answer):
+                            timer.first_token()
+                            await coalescer.add(text_delta)
+                        record_cached_turn(agent, content, cached_answer)
+                    else:
+                        result = None
+                        usage_before = usage_snapshot(agent)
+                        async for event in agent.stream_async(content):
+                            if not isinstance(event, dict):
+                                continue
+                            result = event.get("result", result)
+                            text_delta = event.get("data")
+                            if isinstance(text_delta, str) and text_delta:
+                                timer.first_token()
+                                await coalescer.add(text_delta)
+                        # Cache the final assistant message, as invoke does,
+                        # not every streamed delta (which includes text sent
+                        # before tool calls)
+                        if cacheable and result is not None:
+                            response_cache.put(fingerprint, content, answer_text(result.message))
+
+                    await coalescer.flush()
+                    if cache_outcome == "hit":
+                        complete = {"cached": True}
+                    else:
+                        complete = {"usage": turn_usage(usage_before, usage_snapshot(agent))}
+                        set_attributes(turn_span, **complete["usage"])
+                    await send_socket_event(
+                        websocket,
+                        "chat.complete",
+                        requestId=request_id,
+                        **complete,
+                    )
+                    timer.finish(
+                        output_tokens=complete.get("usage", {}).get("outputTokens"), outcome="ok"
+                    )
+                    print(
+                        f"[websocket] Stream stats {request_id}: deltas={coalescer.deltas} "
+                        f"frames={coalescer.frames} bytes={coalescer.bytes_sent} "
+                        f"unbatchedBytes={coalescer.unbatched_bytes} "
+                        f"windowMs={delta_window_ms} responseCache={cache_outcome} "
+                        f"usage={complete.get('usage')} context={context_stats(agent)}"
+                    )
+                except Exception as generation_error:
+                    coalescer.cancel()
+                    timer.finish(outcome="error")
+                    mark_error(turn_span, generation_error)
+                    print(
+                        f"[websocket] Generation failed for {request_id}: "
+                        f"{generation_error}\n{traceback.format_exc()}"
+                    )
+                    await send_socket_event(
+                        websocket,
+                        "chat.error",
+                        requestId=request_id,
+                        message="The assistant could not complete that response.",
+                    )
     except WebSocketDisconnect:
         print(f"[websocket] Session disconnected: {session_id}")
     except json.JSONDecodeError:
@@ -835,6 +1494,10 @@ async def websocket_handler(websocket, context):
             message="Messages must use JSON.",
         )
         await websocket.close(code=1008)
+    finally:
+        # Session over: persist anything still buffered without holding the loop
+        if memory_hook:
+            await asyncio.to_thread(memory_hook.flush)
 
 
 # ============================================================================
@@ -862,7 +1525,7 @@ async def invoke(payload, context=None):
 
     # Handle different payload formats (AWS Console vs Lambda invocation)
     user_input = ""
-    session_id = "default-session"
+    session_id = DEFAULT_SESSION_ID
     actor_id = "anonymous"
 
     # If payload is a string, use it directly as input
@@ -880,7 +1543,7 @@ async def invoke(payload, context=None):
             or ""
         )
         session_id = (
-            payload.get("sessionId") or payload.get("session_id") or "default-session"
+            payload.get("sessionId") or payload.get("session_id") or DEFAULT_SESSION_ID
         )
         actor_id = (
             payload.get("actorId")
@@ -905,12 +1568,6 @@ async def invoke(payload, context=None):
     print(f"[DEBUG] Full payload: {payload}")
 
     try:
-        # Define available tools
-        tools = [
-            get_project_details,
-            get_technical_expertise,
-        ]
-
         if model is None:
             print("[invoke] Model unavailable; using fallback")
             return {
@@ -920,43 +1577,62 @@ async def invoke(payload, context=None):
                 "actorId": actor_id,
             }
 
-        # Initialize memory hook if memory is configured
-        memory_hook = None
-        if MEMORY_ID:
-            try:
-                print(f"[invoke] Initializing MemoryClient with memory_id={MEMORY_ID}")
-                memory_client = MemoryClient()
-                memory_hook = MemoryHook(
-                    memory_client=memory_client,
-                    memory_id=MEMORY_ID,
-                    actor_id=actor_id,
-                    session_id=session_id,
+        timer = TurnTimer(mode="invoke", model=MODEL_ID)
+        # Reuse the session's warm agent when one exists; otherwise build it
+        # (and load memory history) off the event loop so concurrent websocket
+        # streams keep flowing while this request starts. Requests without a
+        # session id are unrelated callers: each gets its own agent, without
+        # memory, rather than one shared conversation and memory record
+        anonymous = session_id == DEFAULT_SESSION_ID
+        cache_key = None if anonymous else (actor_id, session_id)
+        with span("invoke", session_id=session_id, mode="invoke", model=MODEL_ID) as invoke_span:
+            async with agent_cache.session(
+                cache_key,
+                lambda: create_agent_async(session_id, actor_id, memory=not anonymous),
+            ) as (agent, memory_hook, warm):
+                print(
+                    f"[invoke] Agent cache {'hit' if warm else 'miss'} {agent_cache.stats()}"
                 )
-                print("[invoke] Memory hook initialized successfully")
-            except Exception as mem_err:
-                print(f"[invoke] Memory initialization failed: {mem_err}")
-                # Continue without memory rather than failing
-                memory_hook = None
-
-        # Create the agent with tools and optional memory
-        agent_kwargs = {
-            "model": model,
-            "tools": tools,
-            "system_prompt": SYSTEM_PROMPT,
-        }
-
-        if memory_hook:
-            agent_kwargs["hooks"] = [memory_hook]
-            print("[invoke] Agent created with memory hooks")
-        else:
-            print("[invoke] Agent created without memory (disabled or unavailable)")
+                if warm:
+                    print("[invoke] Reusing warm agent for session")
+                elif memory_hook:
+                    print("[invoke] Agent created with memory hooks")
+                else:
+                    print(
+                        "[invoke] Agent created without memory "
+                        "(no sessionId, disabled or unavailable)"
+                    )
 
-        agent = Agent(**agent_kwargs)
+                # A session's first turn (no history) can reuse a shared answer
+                cacheable = not agent.messages
+                fingerprint = current_response_fingerprint() if cacheable else None
+                response_text = response_cache.get(fingerprint, user_input) if cacheable else None
+                cached = response_text is not None
+                usage = None
+                if cached:
+                    print(f"[invoke] Response cache hit {response_cache.stats()}")
+                    record_cached_turn(agent, user_input, response_text)
+                else:
+                    # Invoke the agent on the async path; the sync __call__ would hold
+                    # the event loop for the whole Bedrock generation
+                    print(f"[invoke] Invoking agent...")
+                    usage_before = usage_snapshot(agent)
+                    response = await agent.invoke_async(user_input)
+                    response_text = answer_text(response.message)
+                    usage = turn_usage(usage_before, usage_snapshot(agent))
+                    print(f"[invoke] Token usage {usage} context={context_stats(agent)}")
+                    set_attributes(invoke_span, **usage)
+                    if cacheable:
+                        response_cache.put(fingerprint, user_input, response_text)
+                response_cache_outcome = "skip" if not cacheable else "hit" if cached else "miss"
+                set_attributes(invoke_span, warm=warm, response_cache=response_cache_outcome)
+                timer.finish(
+                    output_tokens=usage["outputTokens"] if usage else None,
+                    response_cache=response_cache_outcome,
+                    warm=warm,
+                    outcome="ok",
+                )
 
-        # Invoke the agent
-        print(f"[invoke] Invoking agent...")
-        response = agent(user_input)
-        response_text = response.message["content"][0]["text"]
         print(f"[invoke] Response generated: {response_text[:100]}...")
 
         return {
@@ -965,9 +1641,12 @@ async def invoke(payload, context=None):
             "sessionId": session_id,
             "actorId": actor_id,
             "memoryEnabled": bool(memory_hook),
+            "cached": cached,
+            "usage": usage,
         }
 
     except Exception as e:
+        timer.finish(outcome="error")
         err_txt = str(e)
         print(f"[invoke] ERROR: {err_txt}")
         print(f"[invoke] Traceback:\n{traceback.format_exc()}")
@@ -3,30 +3,301 @@ Memory Hook Provider for AgentCore Runtime
 Handles conversation history storage and retrieval using AWS Bedrock AgentCore Memory API
 """
 
-from bedrock_agentcore.memory import MemoryClient
 from strands.hooks.events import AgentInitializedEvent, MessageAddedEvent
 from strands.hooks.registry import HookProvider, HookRegistry
-import copy
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+import atexit
+import json
+import queue
+import threading
+import time
+
+from conversation_window import drop_folded
+from telemetry import current_context, elapsed_ms, record, set_attributes, span
+
+if TYPE_CHECKING:
+    # Annotation only; the runtime imports the client lazily
+    from bedrock_agentcore.memory import MemoryClient
+
+# Write-behind tuning for Memory API saves
+MEMORY_SAVE_MAX_RETRIES = 3
+MEMORY_SAVE_RETRY_BASE_SECONDS = 0.5
+MEMORY_SAVE_MAX_PENDING = 1000
+MEMORY_FLUSH_TIMEOUT_SECONDS = 5.0
+
+# History loaded into each new agent, and the in-process cache in front of it.
+# This is an upper bound; the conversation window trims it to a token budget.
+MEMORY_HISTORY_TURNS = 10
+HISTORY_CACHE_TTL_SECONDS = 300
+HISTORY_CACHE_MAX_ENTRIES = 256
+
+# Rolling conversation summaries are blob events tagged with this metadata
+SUMMARY_METADATA_KEY = "kind"
+SUMMARY_METADATA_VALUE = "conversation-summary"
+MEMORY_SUMMARY_SCAN_EVENTS = 100
+
+
+class MemoryWrite:
+    """
+    One batched save_conversation call waiting in the write-behind queue,
+    or a conversation summary event when `summary` is set; `watermark`
+    identifies the last turn the summary covers.
+    """
+
+    def __init__(
+        self, memory_client, memory_id, actor_id, session_id, messages, summary=None, watermark=""
+    ):
+        self.memory_client = memory_client
+        self.memory_id = memory_id
+        self.actor_id = actor_id
+        self.session_id = session_id
+        self.messages = messages
+        self.summary = summary
+        self.watermark = watermark
+        self.submitted_at = time.perf_counter()
+        # The save span belongs to the turn that produced it, not the worker
+        self.trace_context = current_context()
+        self.done = threading.Event()
+
+
+class MemoryWriteQueue:
+    """
+    Write-behind queue for conversation saves.
+    A single daemon worker drains writes in FIFO order, so messages for a session
+    are persisted in the order they were produced. Failed saves are retried with
+    exponential backoff, then dropped with a log line.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = MEMORY_SAVE_MAX_RETRIES,
+        retry_base_seconds: float = MEMORY_SAVE_RETRY_BASE_SECONDS,
+        max_pending: int = MEMORY_SAVE_MAX_PENDING,
+    ):
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, write: MemoryWrite) -> bool:
+        """Enqueue a write without blocking; returns False if the queue is full."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(write)
+            return True
+        except queue.Full:
+            print(
+                f"[MemoryHook] Write queue full; dropping {len(write.messages)} "
+                f"message(s) for session {write.session_id}"
+            )
+            write.done.set()
+            return False
+
+    def drain(self, timeout: float = MEMORY_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait for every queued write to finish; returns False on timeout."""
+        marker = MemoryWrite(None, None, None, None, [])
+        if not self.submit(marker):
+            return False
+        return marker.done.wait(timeout)
+
+    def _ensure_worker(self):
+        if self._worker and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="memory-write-behind", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            write = self._queue.get()
+            try:
+                if write.messages or write.summary is not None:
+                    record(
+                        "agentcore.queue.wait",
+                        elapsed_ms(write.submitted_at),
+                        queue="memory_write",
+                    )
+                    self._save_with_retries(write)
+            finally:
+                write.done.set()
+                self._queue.task_done()
+
+    def _save_with_retries(self, write: MemoryWrite):
+        kind = "summary" if write.summary is not None else "conversation"
+        started = time.perf_counter()
+        with span(
+            "memory.save", parent=write.trace_context, session_id=write.session_id, kind=kind
+        ) as save_span:
+            attempts, saved = self._save(write)
+            set_attributes(save_span, attempts=attempts, saved=saved)
+        record(
+            "agentcore.memory.save.duration",
+            elapsed_ms(started),
+            kind=kind,
+            outcome="ok" if saved else "error",
+        )
+
+    def _save(self, write: MemoryWrite):
+        """Returns (attempts, saved)."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                if write.summary is not None:
+                    write.memory_client.create_blob_event(
+                        memory_id=write.memory_id,
+                        actor_id=write.actor_id,
+                        session_id=write.session_id,
+                        blob_data={"summary": write.summary, "folded_through": write.watermark},
+                        metadata={SUMMARY_METADATA_KEY: {"stringValue": SUMMARY_METADATA_VALUE}},
+                    )
+                    print(f"[MemoryHook] Saved conversation summary for session {write.session_id}")
+                    return attempt + 1, True
+                write.memory_client.save_conversation(
+                    memory_id=write.memory_id,
+                    actor_id=write.actor_id,
+                    session_id=write.session_id,
+                    messages=write.messages,
+                )
+                print(
+                    f"[MemoryHook] Saved {len(write.messages)} message(s) "
+                    f"for session {write.session_id}"
+                )
+                return attempt + 1, True
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    # Log but don't fail - memory save is not critical
+                    print(
+                        f"[MemoryHook] Memory save error after {attempt + 1} attempt(s): {e}"
+                    )
+                    return attempt + 1, False
+                time.sleep(self.retry_base_seconds * (2**attempt))
+
+
+class ConversationHistoryCache:
+    """
+    Bounded TTL/LRU cache of agent-format history, plus the rolling summary
+    and its watermark, per (memory_id, actor_id, session_id). Hooks write new messages and
+    summaries through to cached entries, so a returning session sees its own
+    latest turns without another Memory API call. Entries expire after the
+    TTL so writes from other containers are picked up.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = HISTORY_CACHE_TTL_SECONDS,
+        max_entries: int = HISTORY_CACHE_MAX_ENTRIES,
+        max_turns: int = MEMORY_HISTORY_TURNS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_turns = max_turns
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return (copy of the cached messages, (summary, watermark)), or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1]), entry[2]
+
+    def put(self, key, messages, summary=("", "")):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), self._trim(list(messages)), summary)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def append(self, key, message):
+        """Write a new message through to a cached entry; no-op when not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            messages = entry[1]
+            messages.append(message)
+            self._entries[key] = (entry[0], self._trim(messages), entry[2])
+
+    def set_summary(self, key, summary):
+        """Write a new (summary, watermark) through to a cached entry; no-op when not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], summary)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _trim(self, messages):
+        # Keep only the last max_turns turns; a turn starts at a user message
+        user_indexes = [i for i, m in enumerate(messages) if m["role"] == "user"]
+        if len(user_indexes) > self.max_turns:
+            return messages[user_indexes[-self.max_turns] :]
+        return messages
+
+
+# Process-wide queue shared by every hook; drained on interpreter shutdown
+_write_queue = MemoryWriteQueue()
+atexit.register(_write_queue.drain)
+
+# Process-wide history cache shared by every hook
+_history_cache = ConversationHistoryCache()
 
 
 class MemoryHook(HookProvider):
     """
     Manages conversation memory for the agent.
-    Loads recent conversation history when agent initializes.
-    Stores new messages to memory after each turn.
+    Loads recent conversation history (and its rolling summary) when agent initializes.
+    Stores new messages to memory after each turn through the write-behind
+    queue, coalescing a user/assistant pair into a single save.
     """
 
     def __init__(
         self,
-        memory_client: MemoryClient,
+        memory_client: "MemoryClient",
         memory_id: str,
         actor_id: str,
         session_id: str,
+        write_queue: MemoryWriteQueue = None,
+        history_cache: ConversationHistoryCache = None,
     ):
         self.memory_client = memory_client
         self.memory_id = memory_id
         self.actor_id = actor_id
         self.session_id = session_id
+        self.write_queue = write_queue or _write_queue
+        self.history_cache = history_cache or _history_cache
+        self.cache_key = (memory_id, actor_id, session_id)
+        self._pending_messages = []
+        self._last_write = None
+        self._pending_lock = threading.Lock()
         print(
             f"[MemoryHook] Initialized - memory_id={memory_id}, actor={actor_id}, session={session_id}"
         )
@@ -34,64 +305,46 @@ class MemoryHook(HookProvider):
     def on_agent_initialized(self, event: AgentInitializedEvent):
         """Load recent conversation history when agent starts"""
         try:
-            print(
-                f"[MemoryHook] Loading conversation history for session {self.session_id}"
-            )
-
-            # Load the last 5 conversation turns from memory
-            recent_turns = self.memory_client.get_last_k_turns(
-                memory_id=self.memory_id,
-                actor_id=self.actor_id,
-                session_id=self.session_id,
-                k=5,  # Get last 5 conversation turns
-            )
+            cached = self.history_cache.get(self.cache_key)
+            if cached is None:
+                started = time.perf_counter()
+                with span("memory.load", session_id=self.session_id) as load_span:
+                    context_messages = self._load_history()
+                    # Only sessions with history can have folded turns
+                    summary = self._load_summary() if context_messages else ("", "")
+                    set_attributes(
+                        load_span, messages=len(context_messages or ()), summary=bool(summary[0])
+                    )
+                record(
+                    "agentcore.memory.load.duration",
+                    elapsed_ms(started),
+                    outcome="error" if context_messages is None else "ok",
+                )
+                if context_messages is None:
+                    return
+                self.history_cache.put(self.cache_key, context_messages, summary)
+            else:
+                context_messages, summary = cached
+                print(
+                    f"[MemoryHook] History cache hit for session {self.session_id} "
+                    f"{self.history_cache.stats()}"
+                )
 
-            if not recent_turns:
+            if not context_messages:
                 print("[MemoryHook] No previous conversation history found")
                 return
 
-            # Convert memory format to agent message format
-            context_messages = []
-            for turn in recent_turns:
-                # Support different payload shapes from Memory API
-                # Case A: turn is a dict with key "messages" (list of dicts)
-                if (
-                    isinstance(turn, dict)
-                    and "messages" in turn
-                    and isinstance(turn["messages"], list)
-                ):
-                    messages_list = turn["messages"]
-                # Case B: turn itself is a list of message dicts
-                elif isinstance(turn, list):
-                    messages_list = turn
-                else:
-                    print(f"[MemoryHook] Unexpected turn shape: {type(turn)} - {turn}")
-                    continue
-
-                for message in messages_list:
-                    if not isinstance(message, dict):
-                        continue
-                    msg_role = message.get("role") or message.get("type") or "user"
-                    # Content may be nested { content: { text: ... } } or { content: [ { text: ... } ] }
-                    content_text = None
-                    if isinstance(message.get("content"), dict):
-                        content_text = message["content"].get("text")
-                    elif (
-                        isinstance(message.get("content"), list) and message["content"]
-                    ):
-                        first = message["content"][0]
-                        if isinstance(first, dict):
-                            content_text = first.get("text")
-                    elif isinstance(message.get("text"), str):
-                        content_text = message.get("text")
-
-                    if not content_text:
-                        continue
-
-                    role = "assistant" if msg_role == "assistant" else "user"
-                    context_messages.append(
-                        {"role": role, "content": [{"text": content_text}]}
-                    )
+            summary, watermark = summary
+            restore_summary = getattr(event.agent.conversation_manager, "restore_summary", None)
+            if summary and restore_summary is not None:
+                # Turns the summary already covers would be sent (and folded) twice
+                loaded = len(context_messages)
+                context_messages = drop_folded(context_messages, watermark)
+                print(
+                    f"[MemoryHook] Restored summary; dropped {loaded - len(context_messages)} "
+                    f"already summarized message(s)"
+                )
+                restore_summary(summary)
 
             # Add context to agent's message history
             print(f"[MemoryHook] Loaded {len(context_messages)} previous messages")
@@ -111,45 +364,189 @@ You have access to our conversation history. Use this context to:
             print(f"[MemoryHook] Memory load error: {e}")
             # Don't fail the agent if memory load fails - just continue without history
 
-    def on_message_added(self, event: MessageAddedEvent):
-        """Store messages in memory after each turn"""
-        messages = copy.deepcopy(event.agent.messages)
+    def _load_history(self):
+        """
+        Fetch recent turns from the Memory API in agent message format.
+        Returns None if the load failed, so the failure is not cached.
+        """
+        print(f"[MemoryHook] Loading conversation history for session {self.session_id}")
 
         try:
-            # Only save user and assistant messages (not system/tool)
-            if messages[-1]["role"] not in ["user", "assistant"]:
-                return
+            # Load the last few conversation turns from memory
+            recent_turns = self.memory_client.get_last_k_turns(
+                memory_id=self.memory_id,
+                actor_id=self.actor_id,
+                session_id=self.session_id,
+                k=MEMORY_HISTORY_TURNS,
+            )
+        except Exception as e:
+            print(f"[MemoryHook] Memory load error: {e}")
+            return None
 
-            # Ensure message has text content
+        # Convert memory format to agent message format
+        context_messages = []
+        for turn in recent_turns:
+            # Support different payload shapes from Memory API
+            # Case A: turn is a dict with key "messages" (list of dicts)
             if (
-                not messages[-1].get("content")
-                or not isinstance(messages[-1]["content"], list)
-                or not messages[-1]["content"]
+                isinstance(turn, dict)
+                and "messages" in turn
+                and isinstance(turn["messages"], list)
             ):
-                return
-            if "text" not in messages[-1]["content"][0]:
-                return
+                messages_list = turn["messages"]
+            # Case B: turn itself is a list of message dicts
+            elif isinstance(turn, list):
+                messages_list = turn
+            else:
+                print(f"[MemoryHook] Unexpected turn shape: {type(turn)} - {turn}")
+                continue
+
+            for message in messages_list:
+                if not isinstance(message, dict):
+                    continue
+                msg_role = message.get("role") or message.get("type") or "user"
+                # Content may be nested { content: { text: ... } } or { content: [ { text: ... } ] }
+                content_text = None
+                if isinstance(message.get("content"), dict):
+                    content_text = message["content"].get("text")
+                elif (
+                    isinstance(message.get("content"), list) and message["content"]
+                ):
+                    first = message["content"][0]
+                    if isinstance(first, dict):
+                        content_text = first.get("text")
+                elif isinstance(message.get("text"), str):
+                    content_text = message.get("text")
 
-            message_text = messages[-1]["content"][0]["text"]
-            message_role = messages[-1]["role"]
+                if not content_text:
+                    continue
 
-            print(
-                f"[MemoryHook] Saving {message_role} message to memory: {message_text[:50]}..."
+                # Memory API reports roles upper-case (USER / ASSISTANT)
+                role = "assistant" if str(msg_role).lower() == "assistant" else "user"
+                context_messages.append(
+                    {"role": role, "content": [{"text": content_text}]}
+                )
+
+        return context_messages
+
+    def _load_summary(self):
+        """
+        Latest rolling summary saved for this session and its watermark;
+        ("", "") if none.
+        """
+        try:
+            events = self.memory_client.list_events(
+                memory_id=self.memory_id,
+                actor_id=self.actor_id,
+                session_id=self.session_id,
+                event_metadata=[
+                    {
+                        "left": {"metadataKey": SUMMARY_METADATA_KEY},
+                        "operator": "EQUALS_TO",
+                        "right": {"metadataValue": {"stringValue": SUMMARY_METADATA_VALUE}},
+                    }
+                ],
+                max_results=MEMORY_SUMMARY_SCAN_EVENTS,
             )
+        except Exception as e:
+            print(f"[MemoryHook] Summary load error: {e}")
+            return "", ""
 
-            # Save the conversation turn to memory
-            self.memory_client.save_conversation(
+        latest = max(events, key=lambda event: str(event.get("eventTimestamp", "")), default=None)
+        if latest is None:
+            return "", ""
+        for payload_item in latest.get("payload", []):
+            blob = payload_item.get("blob")
+            if isinstance(blob, str):
+                try:
+                    blob = json.loads(blob)
+                except ValueError:
+                    continue
+            if isinstance(blob, dict) and isinstance(blob.get("summary"), str):
+                # Summaries saved before watermarks existed have none
+                return blob["summary"], str(blob.get("folded_through") or "")
+        return "", ""
+
+    def save_summary(self, summary: str, watermark: str = ""):
+        """Persist a new rolling summary behind any queued conversation saves."""
+        self.history_cache.set_summary(self.cache_key, (summary, watermark))
+        self.write_queue.submit(
+            MemoryWrite(
+                memory_client=self.memory_client,
                 memory_id=self.memory_id,
                 actor_id=self.actor_id,
                 session_id=self.session_id,
-                messages=[(message_text, message_role)],
+                messages=[],
+                summary=summary,
+                watermark=watermark,
             )
+        )
 
-            print("[MemoryHook] Message saved successfully")
+    def on_message_added(self, event: MessageAddedEvent):
+        """Buffer the new message and hand completed turns to the write-behind queue"""
+        message = event.message
 
-        except Exception as e:
-            # Log but don't fail - memory save is not critical
-            print(f"[MemoryHook] Memory save error: {e}")
+        # Only save user and assistant messages (not system/tool)
+        if not isinstance(message, dict) or message.get("role") not in [
+            "user",
+            "assistant",
+        ]:
+            return
+
+        # Ensure message has text content
+        content = message.get("content")
+        if not content or not isinstance(content, list):
+            return
+        if not isinstance(content[0], dict) or "text" not in content[0]:
+            return
+
+        message_text = content[0]["text"]
+        message_role = message["role"]
+
+        with self._pending_lock:
+            self._pending_messages.append((message_text, message_role))
+
+        self.history_cache.append(
+            self.cache_key,
+            {"role": message_role, "content": [{"text": message_text}]},
+        )
+
+        # An assistant reply closes the turn; save it with its prompt in one call
+        if message_role == "assistant":
+            self._submit_pending()
+
+    def flush(self, wait: bool = True, timeout: float = MEMORY_FLUSH_TIMEOUT_SECONDS):
+        """
+        Submit any buffered messages, e.g. a prompt whose reply never arrived.
+        With wait=True, block until this session's writes have been persisted;
+        call it off the event loop.
+        """
+        self._submit_pending()
+        last_write = self._last_write
+        if wait and last_write:
+            started = time.perf_counter()
+            if not last_write.done.wait(timeout):
+                print(
+                    f"[MemoryHook] Flush timed out for session {self.session_id}"
+                )
+            record("agentcore.queue.wait", elapsed_ms(started), queue="memory_flush")
+
+    def _submit_pending(self):
+        with self._pending_lock:
+            if not self._pending_messages:
+                return
+            messages = self._pending_messages
+            self._pending_messages = []
+
+        write = MemoryWrite(
+            memory_client=self.memory_client,
+            memory_id=self.memory_id,
+            actor_id=self.actor_id,
+            session_id=self.session_id,
+            messages=messages,
+        )
+        if self.write_queue.submit(write):
+            self._last_write = write
 
     def register_hooks(self, registry: HookRegistry):
         """Register hook callbacks with the agent"""
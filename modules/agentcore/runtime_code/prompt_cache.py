@@ -0,0 +1,85 @@
+"""
+Prompt Caching for AgentCore Runtime
+Bedrock prompt-cache checkpoints after the static system prompt and tool
+specs (and at the end of the conversation) for models that support them,
+plus per-turn accounting of cache read/write tokens.
+"""
+
+from strands.models import BedrockModel, CacheConfig
+
+# Model id fragments with Converse prompt caching; Nova caches the system
+# prompt and messages but not tool definitions
+PROMPT_CACHE_TOOL_MODELS = ("anthropic", "claude")
+PROMPT_CACHE_MODELS = PROMPT_CACHE_TOOL_MODELS + (
+    "nova-micro",
+    "nova-lite",
+    "nova-pro",
+    "nova-premier",
+)
+
+USAGE_KEYS = ("inputTokens", "outputTokens", "cacheReadInputTokens", "cacheWriteInputTokens")
+
+
+def prompt_cache_config(model_id: str, mode: str = "auto"):
+    """
+    CacheConfig for `model_id`, or None when caching is off.
+
+    Args:
+        mode: "auto" enables caching for known caching models, "on" forces
+            it (tool checkpoints only for Claude), "off" disables it
+    """
+    model_id = model_id.lower()
+    if mode == "off":
+        return None
+    if mode == "auto" and not any(name in model_id for name in PROMPT_CACHE_MODELS):
+        return None
+    # The "anthropic" strategy emits plain Converse cachePoint blocks
+    return CacheConfig(
+        strategy="anthropic",
+        tools_ttl=any(name in model_id for name in PROMPT_CACHE_TOOL_MODELS),
+    )
+
+
+def is_prompt_cache_rejection(error) -> bool:
+    """True for a Bedrock validation error about cache points."""
+    message = str(error).lower()
+    return "cach" in message and ("validation" in message or "not support" in message)
+
+
+class PromptCachingBedrockModel(BedrockModel):
+    """
+    BedrockModel that drops its cache checkpoints for good if Bedrock rejects
+    them, retrying the rejected request without them. Rejections arrive
+    before any streamed output, so the retry is invisible to the caller.
+    """
+
+    async def stream(self, *args, **kwargs):
+        if self.config.get("cache_config") is None:
+            async for event in super().stream(*args, **kwargs):
+                yield event
+            return
+
+        streamed = False
+        try:
+            async for event in super().stream(*args, **kwargs):
+                streamed = True
+                yield event
+        except Exception as stream_error:
+            if streamed or not is_prompt_cache_rejection(stream_error):
+                raise
+            print(f"[prompt-cache] Disabled after Bedrock rejected cache points: {stream_error}")
+            self.update_config(cache_config=None)
+            async for event in super().stream(*args, **kwargs):
+                yield event
+
+
+def usage_snapshot(agent):
+    """Token counters accumulated by `agent` so far."""
+    metrics = getattr(agent, "event_loop_metrics", None)
+    usage = getattr(metrics, "accumulated_usage", None) or {}
+    return {key: usage.get(key, 0) for key in USAGE_KEYS}
+
+
+def turn_usage(before, after):
+    """Token counts of one turn, from snapshots taken around it."""
+    return {key: after[key] - before[key] for key in USAGE_KEYS}
@@ -0,0 +1,179 @@
+"""
+Query Embedding Cache for AgentCore Runtime RAG
+Bounded TTL/LRU cache of query embeddings, so repeated questions skip the
+Bedrock embedding call. Optionally persisted to a local .npz file by a
+background thread, never on the request path.
+"""
+
+from collections import OrderedDict
+import json
+import os
+import threading
+import time
+
+QUERY_CACHE_TTL_SECONDS = 24 * 3600
+QUERY_CACHE_MAX_ENTRIES = 512
+# Persist after this many new embeddings (and at exit)
+QUERY_CACHE_SAVE_EVERY = 16
+# File: an .npz archive holding "index", a JSON list of
+# [model_id, query, saved_at, dimension] oldest first, and "vectors", the
+# embeddings concatenated as one float32 array
+QUERY_CACHE_FILE_VERSION = 2
+
+
+def normalize_query(text: str) -> str:
+    """Case-fold, collapse whitespace and drop surrounding punctuation."""
+    return " ".join(text.lower().split()).strip(" ?!.,;:")
+
+
+class QueryEmbeddingCache:
+    """
+    Embeddings keyed by (embedding model id, normalized query text).
+    Timestamps are wall-clock so a persisted file keeps its TTLs across
+    restarts.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = QUERY_CACHE_TTL_SECONDS,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        path: str = "",
+        save_every: int = QUERY_CACHE_SAVE_EVERY,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path = path
+        self.save_every = save_every
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_requested = threading.Event()
+        self._saver = None
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if path:
+            self.load()
+
+    def get(self, model_id: str, query: str):
+        """Return the cached embedding, or None on a miss."""
+        key = (model_id, normalize_query(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, model_id: str, query: str, embedding):
+        with self._lock:
+            key = (model_id, normalize_query(query))
+            self._entries[key] = (time.time(), list(embedding))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._unsaved += 1
+            should_save = self.path and self._unsaved >= self.save_every
+        if should_save:
+            self._request_save()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def load(self):
+        """Merge unexpired entries from `path`; a missing or corrupt file is ignored."""
+        import numpy as np
+
+        try:
+            with np.load(self.path, allow_pickle=False) as archive:
+                if int(archive["version"]) != QUERY_CACHE_FILE_VERSION:
+                    return
+                index = json.loads(str(archive["index"]))
+                vectors = archive["vectors"]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError) as load_error:
+            print(f"[rag] Ignoring query embedding cache file {self.path}: {load_error}")
+            return
+
+        now = time.time()
+        offset = 0
+        with self._lock:
+            # Oldest first, so LRU order survives the round trip
+            for model_id, query, saved_at, dimension in index:
+                embedding = vectors[offset : offset + dimension]
+                offset += dimension
+                if now - saved_at <= self.ttl_seconds and len(embedding) == dimension:
+                    self._entries[(model_id, query)] = (saved_at, embedding)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        print(f"[rag] Loaded {len(self._entries)} cached query embeddings from {self.path}")
+
+    def save(self):
+        """Write the cache to `path` atomically; failures are logged, not raised."""
+        if not self.path:
+            return
+        import numpy as np
+
+        with self._save_lock:
+            with self._lock:
+                if not self._unsaved:
+                    return
+                entries = list(self._entries.items())
+                self._unsaved = 0
+            index = [
+                [model_id, query, saved_at, len(embedding)]
+                for (model_id, query), (saved_at, embedding) in entries
+            ]
+            vectors = np.concatenate(
+                [np.asarray(embedding, dtype=np.float32) for _, (_, embedding) in entries]
+                or [np.empty(0, dtype=np.float32)]
+            )
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as cache_file:
+                    np.savez(
+                        cache_file,
+                        version=np.array(QUERY_CACHE_FILE_VERSION),
+                        index=np.array(json.dumps(index)),
+                        vectors=vectors,
+                    )
+                os.replace(temp_path, self.path)
+            except OSError as save_error:
+                print(f"[rag] Failed to save query embedding cache: {save_error}")
+
+    def _request_save(self):
+        # The saver thread serializes and writes, so searches never wait on it
+        self._save_requested.set()
+        if self._saver is None:
+            with self._lock:
+                if self._saver is None:
+                    self._saver = threading.Thread(
+                        target=self._save_loop, name="query-cache-saver", daemon=True
+                    )
+                    self._saver.start()
+
+    def _save_loop(self):
+        while True:
+            self._save_requested.wait()
+            self._save_requested.clear()
+            self.save()
@@ -0,0 +1,125 @@
+"""
+IVF Index for AgentCore Runtime RAG
+Inverted-file approximate nearest-neighbour search: chunks are clustered
+around k-means centroids at ingestion, and a query only scores the chunks
+in its `nprobe` nearest clusters
+"""
+
+import struct
+
+import numpy as np
+
+# IVF file: header, n_lists x dimension float32 centroids, then (n_lists + 1)
+# uint32 row offsets. Matrix rows are stored grouped by list, so list i is
+# the contiguous row range offsets[i]:offsets[i + 1]. From version 2 the
+# header is followed by the 16-byte build id of the ingestion run, which must
+# match the one in the matrix file.
+IVF_MAGIC = b"RAGIVF\x00\x00"
+IVF_VERSION = 2
+IVF_HEADER = struct.Struct("<8sHxxII")
+IVF_BUILD_ID_SIZE = 16
+
+
+def train_ivf(matrix, n_lists: int, iterations: int = 10, sample_size: int = 0, seed: int = 0):
+    """
+    Spherical k-means over L2-normalized rows.
+
+    Centroids are trained on a random sample (`sample_size`, default 64 rows
+    per list), then every row is assigned to its nearest centroid.
+
+    Returns:
+        Tuple of (centroids, assignments)
+    """
+    rng = np.random.default_rng(seed)
+    n_lists = max(1, min(n_lists, len(matrix)))
+    sample_size = min(len(matrix), sample_size or 64 * n_lists)
+    sample = np.asarray(matrix[np.sort(rng.choice(len(matrix), sample_size, replace=False))])
+    sample = sample.astype(np.float32)
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Reseed empty lists from random sample rows
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = sums / norms
+
+    return centroids, assign_lists(matrix, centroids)
+
+
+def assign_lists(matrix, centroids, block_rows: int = 16384):
+    assignments = np.empty(len(matrix), dtype=np.int64)
+    for start in range(0, len(matrix), block_rows):
+        block = np.asarray(matrix[start : start + block_rows], dtype=np.float32)
+        assignments[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+class IVFIndex:
+    """Centroids plus the row range each inverted list occupies in the matrix."""
+
+    def __init__(self, centroids, offsets, build_id: str = None):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        # Hex build id of the ingestion run; None for version 1 files
+        self.build_id = build_id
+        if len(self.offsets) != len(self.centroids) + 1:
+            raise ValueError("IVF offsets must have one entry per list plus one")
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def from_assignments(cls, centroids, assignments, build_id: str = None):
+        counts = np.bincount(assignments, minlength=len(centroids))
+        return cls(centroids, np.concatenate(([0], np.cumsum(counts))), build_id)
+
+    @classmethod
+    def from_file(cls, path: str):
+        with open(path, "rb") as ivf_file:
+            data = ivf_file.read()
+        magic, version, n_lists, dimension = IVF_HEADER.unpack_from(data)
+        if magic != IVF_MAGIC or version not in (1, IVF_VERSION):
+            raise ValueError(f"Unsupported RAG IVF file: {path}")
+        data_offset = IVF_HEADER.size
+        build_id = None
+        if version >= 2:
+            raw_build_id = data[data_offset : data_offset + IVF_BUILD_ID_SIZE]
+            build_id = raw_build_id.hex() if any(raw_build_id) else None
+            data_offset += IVF_BUILD_ID_SIZE
+        centroids = np.frombuffer(
+            data, dtype="<f4", count=n_lists * dimension, offset=data_offset
+        ).reshape(n_lists, dimension)
+        offsets = np.frombuffer(
+            data, dtype="<u4", count=n_lists + 1, offset=data_offset + centroids.nbytes
+        )
+        return cls(centroids, offsets, build_id)
+
+    def write(self, path: str):
+        with open(path, "wb") as ivf_file:
+            ivf_file.write(
+                IVF_HEADER.pack(IVF_MAGIC, IVF_VERSION, self.n_lists, self.centroids.shape[1])
+            )
+            build_id = bytes.fromhex(self.build_id) if self.build_id else b""
+            ivf_file.write(build_id.ljust(IVF_BUILD_ID_SIZE, b"\0"))
+            ivf_file.write(self.centroids.astype("<f4").tobytes())
+            ivf_file.write(self.offsets.astype("<u4").tobytes())
+
+    def probe(self, queries, nprobe: int):
+        """Return the ids of the `nprobe` nearest lists for each query, shape (batch, nprobe)."""
+        nprobe = max(1, min(nprobe, self.n_lists))
+        scores = queries @ self.centroids.T
+        if nprobe == self.n_lists:
+            return np.broadcast_to(np.arange(self.n_lists), scores.shape)
+        return np.argpartition(scores, -nprobe, axis=1)[:, -nprobe:]
+
+    def row_ranges(self, lists):
+        """Non-empty (start, end) matrix row ranges for the given list ids."""
+        starts = self.offsets[lists]
+        ends = self.offsets[np.asarray(lists) + 1]
+        return [(int(start), int(end)) for start, end in zip(starts, ends) if end > start]
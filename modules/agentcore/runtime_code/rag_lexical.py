@@ -0,0 +1,178 @@
+"""
+Lexical Retrieval for AgentCore Runtime RAG
+BM25 over an inverted index of the chunk text, plus reciprocal-rank fusion
+of keyword and vector rankings. Exact names ("JamCam", "cb-common") match
+even when the embedding ranks them poorly, and confident keyword lookups
+can skip the query embedding entirely.
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+
+# Words joined by "-", "_" or "." are indexed whole and as their parts, so
+# "cb-common" matches both the name and "common"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+TOKEN_SPLIT_PATTERN = re.compile(r"[-_.]")
+STOPWORDS = frozenset(
+    """
+    a about an and any are as at be been but by can could did do does for from had
+    has have he her his how i if in into is it its me my no not of on or our she
+    so than that the their them then there these they this to us was we were what
+    when where which who why will with would you your
+    """.split()
+)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Reciprocal-rank fusion constant from Cormack et al.; damps the top ranks
+RRF_K = 60
+# A keyword query is trusted on its own when it has at most this many
+# content terms, the best chunk contains all of them, and no term occurs in
+# more than this fraction of chunks
+CONFIDENT_MAX_TERMS = 4
+CONFIDENT_MAX_DF_FRACTION = 0.1
+
+
+def tokenize(text: str, parts: bool = True):
+    """Lower-cased content terms of `text`; with `parts`, compounds are followed by their parts."""
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token not in STOPWORDS:
+            terms.append(token)
+        if parts and not token.isalnum():
+            terms.extend(part for part in TOKEN_SPLIT_PATTERN.split(token) if part not in STOPWORDS)
+    return terms
+
+
+class BM25Index:
+    """
+    Inverted index in CSR form: the postings of term `t` are
+    rows[offsets[t]:offsets[t + 1]], each with a precomputed BM25 term
+    weight, so scoring a query is one scatter-add per query term.
+    """
+
+    def __init__(self, vocabulary, offsets, rows, weights, document_frequency, n_rows):
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.rows = rows
+        self.weights = weights
+        self.n_rows = n_rows
+        self.idf = np.log1p(
+            (n_rows - document_frequency + 0.5) / (document_frequency + 0.5)
+        ).astype(np.float32)
+        self.document_frequency = document_frequency
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.rows.nbytes + self.weights.nbytes + self.idf.nbytes
+
+    @classmethod
+    def build(cls, texts, k1: float = BM25_K1, b: float = BM25_B):
+        """Index an iterable of chunk texts; row i is the i-th text."""
+        vocabulary = {}
+        term_blocks, row_blocks, count_blocks, lengths = [], [], [], []
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text or ""))
+            lengths.append(sum(counts.values()))
+            term_blocks.append(
+                np.fromiter(
+                    (vocabulary.setdefault(term, len(vocabulary)) for term in counts),
+                    dtype=np.int32,
+                    count=len(counts),
+                )
+            )
+            row_blocks.append(np.full(len(counts), row, dtype=np.int32))
+            count_blocks.append(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+
+        n_rows = len(lengths)
+        if not vocabulary:
+            empty = np.zeros(0, dtype=np.int32)
+            offsets = np.zeros(1, dtype=np.int64)
+            return cls({}, offsets, empty, empty.astype(np.float32), empty, n_rows)
+        terms = np.concatenate(term_blocks)
+        rows = np.concatenate(row_blocks)
+        counts = np.concatenate(count_blocks)
+        lengths = np.asarray(lengths, dtype=np.float32)
+
+        # Group postings by term; rows stay ascending within each term
+        order = np.argsort(terms, kind="stable")
+        terms, rows, counts = terms[order], rows[order], counts[order]
+        document_frequency = np.bincount(terms, minlength=len(vocabulary))
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(document_frequency, out=offsets[1:])
+
+        length_norm = k1 * (1 - b + b * lengths[rows] / max(lengths.mean(), 1.0))
+        weights = (counts * (k1 + 1) / (counts + length_norm)).astype(np.float32)
+        return cls(vocabulary, offsets, rows, weights, document_frequency, n_rows)
+
+    def search(self, query: str, top_k: int = 4):
+        """
+        BM25 top-k for a text query.
+
+        Returns:
+            Tuple of (rows, scores, confident), best first. `confident` means
+            the result looks like an exact keyword lookup that does not need
+            vector search (see CONFIDENT_MAX_TERMS).
+        """
+        terms = dict.fromkeys(tokenize(query))
+        term_ids = [self.vocabulary[term] for term in terms if term in self.vocabulary]
+        empty = np.zeros(0, dtype=np.int32)
+        if not term_ids or top_k <= 0:
+            return empty, empty.astype(np.float32), False
+
+        scores = np.zeros(self.n_rows, dtype=np.float32)
+        for term_id in term_ids:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            scores[self.rows[start:end]] += self.idf[term_id] * self.weights[start:end]
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > top_k:
+            matched = matched[np.argpartition(scores[matched], -top_k)[-top_k:]]
+        top_rows = matched[np.argsort(-scores[matched], kind="stable")]
+        return top_rows, scores[top_rows], self._confident(query, top_rows[0])
+
+    def _confident(self, query, best_row):
+        # Judged on whole tokens: "cb-common" is specific even if "common" is not
+        terms = set(tokenize(query, parts=False))
+        if not terms or len(terms) > CONFIDENT_MAX_TERMS:
+            return False
+        term_ids = [self.vocabulary.get(term) for term in terms]
+        if None in term_ids:
+            return False
+        max_df = max(1, CONFIDENT_MAX_DF_FRACTION * self.n_rows)
+        if self.document_frequency[term_ids].max() > max_df:
+            return False
+        return all(self._contains(term_id, best_row) for term_id in term_ids)
+
+    def _contains(self, term_id, row):
+        postings = self.rows[self.offsets[term_id] : self.offsets[term_id + 1]]
+        position = np.searchsorted(postings, row)
+        return position < len(postings) and postings[position] == row
+
+
+def reciprocal_rank_fusion(rankings, top_k: int, k: int = RRF_K):
+    """
+    Fuse best-first hit lists (dicts with an "id" and a "score"), given as a
+    {source name: hits} mapping, by summing 1 / (k + rank).
+
+    Each fused hit keeps its fields, minus "score": the fused value is in
+    "fused_score" and is only useful for ordering, while "source_scores" maps
+    each source that found the hit to its original score there.
+    """
+    fused = {}
+    for source, ranking in rankings.items():
+        for rank, hit in enumerate(ranking, start=1):
+            entry = fused.setdefault(hit["id"], [0.0, hit, {}])
+            entry[0] += 1.0 / (k + rank)
+            entry[2][source] = hit["score"]
+    best = sorted(fused.values(), key=lambda entry: -entry[0])[:top_k]
+    return [
+        {
+            **{field: value for field, value in hit.items() if field != "score"},
+            "fused_score": fused_score,
+            "source_scores": source_scores,
+        }
+        for fused_score, hit, source_scores in best
+    ]
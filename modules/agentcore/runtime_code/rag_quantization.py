@@ -0,0 +1,165 @@
+"""
+Embedding Quantization for AgentCore Runtime RAG
+Compressed stand-ins for the float embedding matrix, scored with asymmetric
+distance computation (float query against compressed rows):
+
+- Int8Quantizer: per-dimension scalar int8 codes, 4x smaller than float32
+- ProductQuantizer: 256-centroid codebooks per subspace, one byte per
+  subspace; 16x smaller than float32 with 4-dimensional subspaces
+"""
+
+import numpy as np
+
+QUANTIZATION_KINDS = ("int8", "pq")
+
+# Rows encoded per block, bounding temporary float32 copies
+QUANTIZE_BLOCK_ROWS = 16384
+# Rows scored per block; small enough that the upcast block stays in cache
+SCORE_BLOCK_ROWS = 1024
+
+
+class Int8Quantizer:
+    """Symmetric per-dimension int8 codes: row ~= codes * scale."""
+
+    kind = "int8"
+
+    def __init__(self, scale, codes):
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.codes = codes
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.scale.nbytes
+
+    @classmethod
+    def build(cls, matrix):
+        scale = np.zeros(matrix.shape[1], dtype=np.float32)
+        for start in range(0, len(matrix), QUANTIZE_BLOCK_ROWS):
+            block = np.abs(np.asarray(matrix[start : start + QUANTIZE_BLOCK_ROWS], np.float32))
+            np.maximum(scale, block.max(axis=0), out=scale)
+        scale = np.where(scale > 0, scale / 127, 1.0).astype(np.float32)
+
+        codes = np.empty(matrix.shape, dtype=np.int8)
+        for start in range(0, len(matrix), QUANTIZE_BLOCK_ROWS):
+            block = np.asarray(matrix[start : start + QUANTIZE_BLOCK_ROWS], np.float32)
+            codes[start : start + len(block)] = np.clip(np.rint(block / scale), -127, 127)
+        return cls(scale, codes)
+
+    def score(self, queries, start, end):
+        # Fold the scale into the query once instead of dequantizing every row
+        scaled = queries * self.scale
+        scores = np.empty((len(queries), end - start), dtype=np.float32)
+        for block_start in range(start, end, SCORE_BLOCK_ROWS):
+            block_end = min(block_start + SCORE_BLOCK_ROWS, end)
+            block = self.codes[block_start:block_end].astype(np.float32)
+            scores[:, block_start - start : block_end - start] = scaled @ block.T
+        return scores
+
+
+class ProductQuantizer:
+    """
+    Product quantization: each row is split into `subspaces` equal slices,
+    and each slice is replaced by the id of its nearest codebook centroid.
+    A query's inner product with a row is the sum of per-subspace lookups
+    in a (subspaces x 256) table computed once per query.
+    """
+
+    kind = "pq"
+    n_centroids = 256
+
+    def __init__(self, codebooks, codes):
+        # codebooks: (subspaces, 256, subspace_dimension); codes: (rows, subspaces) uint8
+        self.codebooks = np.asarray(codebooks, dtype=np.float32)
+        self.codes = codes
+        # Flat lookup-table offset of each subspace's 256 entries
+        self._table_offsets = np.arange(self.subspaces, dtype=np.intp) * self.n_centroids
+
+    @property
+    def subspaces(self):
+        return self.codebooks.shape[0]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.codebooks.nbytes
+
+    @classmethod
+    def build(
+        cls,
+        matrix,
+        subspaces: int = 0,
+        iterations: int = 10,
+        sample_size: int = 8192,
+        seed: int = 0,
+    ):
+        """
+        Train codebooks with k-means on a row sample and encode every row.
+        `subspaces` defaults to dimension / 4 and must divide the dimension.
+        """
+        rows, dimension = matrix.shape
+        subspaces = subspaces or max(1, dimension // 4)
+        if dimension % subspaces:
+            raise ValueError(f"{subspaces} subspaces do not divide dimension {dimension}")
+        if rows < cls.n_centroids:
+            raise ValueError(f"Product quantization needs at least {cls.n_centroids} rows")
+        width = dimension // subspaces
+
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(rows, min(rows, sample_size), replace=False))
+        sample = np.asarray(matrix[sample_rows], np.float32)
+        seeds = rng.choice(len(sample), cls.n_centroids, replace=False)
+        codebooks = np.empty((subspaces, cls.n_centroids, width), dtype=np.float32)
+        for subspace in range(subspaces):
+            vectors = sample[:, subspace * width : (subspace + 1) * width]
+            codebook = vectors[seeds].copy()
+            for _ in range(iterations):
+                codebook = _centroid_means(vectors, _nearest_centroids(vectors, codebook), codebook)
+            codebooks[subspace] = codebook
+
+        codes = np.empty((rows, subspaces), dtype=np.uint8)
+        for start in range(0, rows, QUANTIZE_BLOCK_ROWS):
+            block = np.asarray(matrix[start : start + QUANTIZE_BLOCK_ROWS], np.float32)
+            for subspace in range(subspaces):
+                codes[start : start + len(block), subspace] = _nearest_centroids(
+                    block[:, subspace * width : (subspace + 1) * width], codebooks[subspace]
+                )
+        return cls(codebooks, codes)
+
+    def score(self, queries, start, end):
+        # Per-query lookup tables: (batch, subspaces * 256) inner products
+        slices = queries.reshape(len(queries), self.subspaces, -1)
+        tables = np.einsum("bsw,skw->bsk", slices, self.codebooks).reshape(len(queries), -1)
+
+        scores = np.empty((len(queries), end - start), dtype=np.float32)
+        for block_start in range(start, end, SCORE_BLOCK_ROWS):
+            block_end = min(block_start + SCORE_BLOCK_ROWS, end)
+            lookups = self.codes[block_start:block_end] + self._table_offsets
+            for query, table in enumerate(tables):
+                scores[query, block_start - start : block_end - start] = table[lookups].sum(axis=1)
+        return scores
+
+
+def _nearest_centroids(vectors, codebook):
+    """Id of the nearest codebook row for each vector (vectors (n, w), codebook (256, w))."""
+    # ||x - c||^2 ranks like ||c||^2 - 2 x.c, since ||x|| is fixed per vector
+    distances = vectors @ (-2 * codebook.T)
+    distances += np.square(codebook).sum(axis=1)
+    return np.argmin(distances, axis=1).astype(np.uint8)
+
+
+def _centroid_means(vectors, labels, codebook):
+    counts = np.bincount(labels, minlength=len(codebook))
+    means = np.empty_like(codebook)
+    for column in range(codebook.shape[1]):
+        sums = np.bincount(labels, weights=vectors[:, column], minlength=len(codebook))
+        means[:, column] = sums / np.maximum(counts, 1)
+    # Empty centroids keep their previous position
+    means[counts == 0] = codebook[counts == 0]
+    return means
+
+
+def build_quantizer(kind: str, matrix, **options):
+    if kind == "int8":
+        return Int8Quantizer.build(matrix)
+    if kind == "pq":
+        return ProductQuantizer.build(matrix, **options)
+    raise ValueError(f"Unknown RAG quantization: {kind}")
@@ -0,0 +1,502 @@
+"""
+RAG Retrieval for AgentCore Runtime
+Loads the chunk embeddings written by scripts/rag_ingest.js into one
+contiguous matrix and answers top-k cosine similarity queries.
+
+Two on-disk formats are supported:
+- Binary index (preferred): a raw float32/float16 matrix file plus a
+  metadata table, both memory-mapped so load time and RSS stay flat as the
+  corpus grows
+- embeddings.json (fallback): parsed and copied into a float32 matrix
+
+A binary index may carry an IVF file (see rag_ivf.py) for approximate search,
+and any index can be quantized in memory (see rag_quantization.py).
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+from rag_ivf import IVFIndex, train_ivf
+from rag_lexical import BM25Index
+from rag_quantization import build_quantizer
+
+# Matrix file: 64-byte header, then rows x dimension little-endian floats.
+# Header: magic, format version, dtype code, flags, rows, dimension; bytes
+# 24-40 hold the ingestion build id that ties the file to its manifest,
+# metadata and IVF files
+INDEX_MAGIC = b"RAGINDEX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<8sHBBII")
+INDEX_BUILD_ID_OFFSET = 24
+INDEX_BUILD_ID_SIZE = 16
+INDEX_DATA_OFFSET = 64
+INDEX_FLAG_NORMALIZED = 1
+INDEX_DTYPES = {1: np.dtype("<f4"), 2: np.dtype("<f2")}
+
+# Metadata file: header, index-level JSON info, (rows + 1) uint64 record
+# offsets starting on an 8-byte boundary, then one compact UTF-8 JSON record
+# per row ({id, file, chunk_index, text, metadata}). The info's "build_id"
+# must match the matrix file's.
+META_MAGIC = b"RAGMETA\x00"
+META_HEADER = struct.Struct("<8sHxxII")
+
+# Rows scored per block when the matrix is not float32, so float16 indexes
+# never upcast the whole matrix at once and the upcast block stays in cache
+SCORE_BLOCK_ROWS = 1024
+
+
+def normalize_rows(matrix):
+    """L2-normalize each row in place; all-zero rows are left as zeros."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+class MetadataTable:
+    """
+    Read-only, memory-mapped view of the metadata file.
+    Records are decoded only when a search returns their row.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as meta_file:
+            self._map = mmap.mmap(meta_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rows, info_length = META_HEADER.unpack_from(self._map)
+        if magic != META_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"Unsupported RAG metadata file: {path}")
+        info_end = META_HEADER.size + info_length
+        self.info = json.loads(self._map[META_HEADER.size : info_end])
+        offsets_start = (info_end + 7) // 8 * 8
+        self._offsets = np.frombuffer(
+            self._map, dtype="<u8", count=rows + 1, offset=offsets_start
+        )
+        self._records_start = offsets_start + self._offsets.nbytes
+        if self._records_start + int(self._offsets[-1]) > len(self._map):
+            raise ValueError(f"Truncated RAG metadata file: {path}")
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row):
+        start = self._records_start + int(self._offsets[row])
+        end = self._records_start + int(self._offsets[row + 1])
+        return json.loads(self._map[start:end])
+
+
+def open_matrix(path: str):
+    """
+    Memory-map the matrix file. Returns (matrix, normalized, build_id), where
+    build_id is the hex ingestion build id, or None if the file has none.
+    """
+    with open(path, "rb") as matrix_file:
+        header = matrix_file.read(INDEX_DATA_OFFSET)
+    if len(header) < INDEX_DATA_OFFSET:
+        raise ValueError(f"Truncated RAG index file: {path}")
+    magic, version, dtype_code, flags, rows, dimension = INDEX_HEADER.unpack_from(header)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION or dtype_code not in INDEX_DTYPES:
+        raise ValueError(f"Unsupported RAG index file: {path}")
+    dtype = INDEX_DTYPES[dtype_code]
+    expected_size = INDEX_DATA_OFFSET + rows * dimension * dtype.itemsize
+    if os.path.getsize(path) < expected_size:
+        raise ValueError(f"Truncated RAG index file: {path}")
+    matrix = np.memmap(
+        path, dtype=dtype, mode="r", offset=INDEX_DATA_OFFSET, shape=(rows, dimension)
+    )
+    raw_build_id = header[INDEX_BUILD_ID_OFFSET : INDEX_BUILD_ID_OFFSET + INDEX_BUILD_ID_SIZE]
+    build_id = raw_build_id.hex() if any(raw_build_id) else None
+    return matrix, bool(flags & INDEX_FLAG_NORMALIZED), build_id
+
+
+def write_index(
+    matrix_path: str,
+    meta_path: str,
+    matrix,
+    items,
+    info=None,
+    dtype="float32",
+    ivf_path: str = None,
+    n_lists: int = 0,
+    build_id: str = None,
+):
+    """
+    Write the binary index format (the Python twin of scripts/rag_ingest.js).
+    Rows are L2-normalized before they are stored. With `ivf_path` and
+    `n_lists`, rows and items are regrouped by IVF list and the IVF file is
+    written too. Every file carries `build_id` (hex; random by default).
+    """
+    build_id = build_id or os.urandom(INDEX_BUILD_ID_SIZE).hex()
+    dtype = np.dtype(dtype).newbyteorder("<")
+    dtype_code = next(code for code, known in INDEX_DTYPES.items() if known == dtype)
+    matrix = normalize_rows(np.array(matrix, dtype=np.float32))
+    rows, dimension = matrix.shape
+
+    if ivf_path and n_lists:
+        centroids, assignments = train_ivf(matrix, n_lists)
+        order = np.argsort(assignments, kind="stable")
+        matrix = matrix[order]
+        items = [items[row] for row in order]
+        IVFIndex.from_assignments(centroids, assignments, build_id).write(ivf_path)
+
+    with open(matrix_path, "wb") as matrix_file:
+        header = INDEX_HEADER.pack(
+            INDEX_MAGIC, INDEX_VERSION, dtype_code, INDEX_FLAG_NORMALIZED, rows, dimension
+        )
+        header = header.ljust(INDEX_BUILD_ID_OFFSET, b"\0") + bytes.fromhex(build_id)
+        matrix_file.write(header.ljust(INDEX_DATA_OFFSET, b"\0"))
+        matrix_file.write(matrix.astype(dtype).tobytes())
+
+    info = {**(info or {}), "build_id": build_id}
+    info_bytes = json.dumps(info, separators=(",", ":")).encode("utf-8")
+    records = [
+        json.dumps(item, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        for item in items
+    ]
+    offsets = np.zeros(len(records) + 1, dtype="<u8")
+    offsets[1:] = np.cumsum([len(record) for record in records])
+    with open(meta_path, "wb") as meta_file:
+        meta_file.write(META_HEADER.pack(META_MAGIC, INDEX_VERSION, len(records), len(info_bytes)))
+        meta_file.write(info_bytes)
+        meta_file.write(b"\0" * (-(META_HEADER.size + len(info_bytes)) % 8))
+        meta_file.write(offsets.tobytes())
+        for record in records:
+            meta_file.write(record)
+
+
+class EmbeddingIndex:
+    """
+    Cosine-similarity index over chunk embeddings.
+
+    Rows of `matrix` are L2-normalized (at ingestion for the binary format,
+    at load time otherwise), so a query's cosine similarity against every
+    chunk is a single matrix product. `items` holds each chunk's id, file,
+    text and metadata, aligned with the matrix rows; it may be a list or a
+    MetadataTable.
+
+    Search is exact unless an `ivf` index is attached, in which case each
+    query only scores the rows of its `nprobe` nearest lists. After
+    `quantize()`, rows are scored from compressed codes instead, and the
+    best `top_k * rerank_factor` candidates are re-scored against the float
+    matrix (only those rows are read, so a memory-mapped matrix stays
+    mostly out of RSS).
+
+    After `build_lexical_index()`, `keyword_search()` ranks chunks by BM25
+    over their text, without a query embedding.
+    """
+
+    def __init__(
+        self,
+        matrix,
+        items,
+        model=None,
+        normalized=False,
+        query_batch_size: int = 64,
+        ivf=None,
+        nprobe: int = 8,
+        rerank_factor: int = 4,
+    ):
+        if matrix.ndim != 2 or len(matrix) != len(items):
+            raise ValueError("Embedding matrix must have one row per item")
+        if not normalized:
+            matrix = normalize_rows(np.ascontiguousarray(matrix, dtype=np.float32))
+        if ivf is not None and ivf.offsets[-1] != len(matrix):
+            raise ValueError("IVF lists do not cover the embedding matrix")
+        self.matrix = matrix
+        self.items = items
+        self.model = model
+        self.query_batch_size = query_batch_size
+        self.ivf = ivf
+        self.nprobe = nprobe
+        self.rerank_factor = rerank_factor
+        self.quantizer = None
+        self.lexical = None
+        # S3 ETag of the object this index was loaded from, for conditional reloads
+        self.etag = None
+
+    @property
+    def dimension(self):
+        return self.matrix.shape[1]
+
+    @property
+    def format(self):
+        return "mmap" if isinstance(self.matrix, np.memmap) else "json"
+
+    def __len__(self):
+        return len(self.items)
+
+    def quantize(self, kind: str, **options):
+        """
+        Score from `kind` ("int8" or "pq") codes from now on; returns the code
+        size in bytes. An in-memory float matrix (embeddings.json) is moved to
+        a memory-mapped temporary file, so only re-ranked rows stay resident.
+        """
+        self.quantizer = build_quantizer(kind, self.matrix, **options)
+        if not isinstance(self.matrix, np.memmap):
+            self.matrix = _spill_matrix(self.matrix)
+        return self.quantizer.nbytes
+
+    def build_lexical_index(self):
+        """Build the BM25 inverted index over the chunk text; returns the vocabulary size."""
+        self.lexical = BM25Index.build(self.items[row].get("text", "") for row in range(len(self)))
+        return len(self.lexical.vocabulary)
+
+    def keyword_search(self, query: str, top_k: int = 4):
+        """
+        BM25 search for a text query (requires `build_lexical_index()`).
+
+        Returns:
+            Tuple of (hits, confident): item dicts with a "score" key, best
+            first, and whether the keyword match alone is trustworthy
+        """
+        rows, scores, confident = self.lexical.search(query, top_k)
+        hits = [{**self.items[row], "score": float(score)} for row, score in zip(rows, scores)]
+        return hits, confident
+
+    @classmethod
+    def from_document(cls, document, **kwargs):
+        """Build from the ingestion JSON: {model, items: [{..., embedding}]}."""
+        items = []
+        vectors = []
+        for item in document.get("items", []):
+            vectors.append(item["embedding"])
+            items.append({key: value for key, value in item.items() if key != "embedding"})
+        if not vectors:
+            raise ValueError("Embeddings document has no items")
+        try:
+            matrix = np.array(vectors, dtype=np.float32)
+        except ValueError as shape_error:
+            raise ValueError("Embeddings have inconsistent dimensions") from shape_error
+        return cls(matrix, items, model=document.get("model"), **kwargs)
+
+    @classmethod
+    def from_files(cls, matrix_path: str, meta_path: str, ivf_path: str = None, **kwargs):
+        """
+        Memory-map a binary index written by rag_ingest.js or write_index.
+        Raises ValueError unless all files come from the same ingestion run.
+        """
+        matrix, normalized, build_id = open_matrix(matrix_path)
+        items = MetadataTable(meta_path)
+        ivf = IVFIndex.from_file(ivf_path) if ivf_path else None
+        # A set read while an upload was in progress can mix runs; even with
+        # equal row counts its texts, vectors and IVF lists would not line up
+        build_ids = {build_id, items.info.get("build_id")}
+        if ivf is not None:
+            build_ids.add(ivf.build_id)
+        if len(build_ids) > 1:
+            raise ValueError(f"RAG index files are from different ingestion runs: {matrix_path}")
+        return cls(
+            matrix,
+            items,
+            model=items.info.get("model"),
+            normalized=normalized,
+            ivf=ivf,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_s3(cls, s3_client, bucket: str, key: str, if_none_match: str = None, **kwargs):
+        """Load embeddings.json; returns None if its ETag still equals `if_none_match`."""
+        response = _get_object(s3_client, bucket, key, if_none_match)
+        if response is None:
+            return None
+        document = json.loads(response["Body"].read())
+        index = cls.from_document(document, **kwargs)
+        index.etag = response.get("ETag")
+        return index
+
+    @classmethod
+    def from_s3_files(
+        cls,
+        s3_client,
+        bucket: str,
+        index_prefix: str,
+        cache_dir: str,
+        if_none_match: str = None,
+        **kwargs,
+    ):
+        """
+        Download `<prefix>.bin`, `<prefix>.meta` and, if present, `<prefix>.ivf`
+        to `cache_dir` and map them. The matrix object is uploaded last, so its
+        ETag versions the set; returns None if it still equals `if_none_match`.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        base_path = os.path.join(cache_dir, os.path.basename(index_prefix))
+        response = _get_object(s3_client, bucket, index_prefix + ".bin", if_none_match)
+        if response is None:
+            return None
+        # Download beside the targets and rename only once the set is mapped
+        # and its build ids agree, so a reader never maps a partial or
+        # mismatched set. Indexes still mapping the replaced files keep
+        # reading the old inodes.
+        with open(base_path + ".bin.part", "wb") as matrix_file:
+            shutil.copyfileobj(response["Body"], matrix_file, 1 << 20)
+        paths = [base_path + ".bin", base_path + ".meta", base_path + ".ivf"]
+        s3_client.download_file(bucket, index_prefix + ".meta", base_path + ".meta.part")
+        try:
+            s3_client.download_file(bucket, index_prefix + ".ivf", base_path + ".ivf.part")
+        except ClientError as s3_error:
+            if not _is_missing(s3_error):
+                raise
+            paths[2] = None
+
+        part_paths = [path + ".part" if path else None for path in paths]
+        try:
+            index = cls.from_files(*part_paths, **kwargs)
+        except ValueError:
+            # Mid-upload; the next poll retries, the current index stays
+            for part_path in part_paths:
+                if part_path and os.path.exists(part_path):
+                    os.remove(part_path)
+            raise
+        for path, part_path in zip(paths, part_paths):
+            if path:
+                os.replace(part_path, path)
+        index.etag = response.get("ETag")
+        return index
+
+    def search(self, queries, top_k: int = 4, nprobe: int = None):
+        """
+        Top-k cosine search for a batch of query embeddings.
+
+        Args:
+            queries: One embedding or a (batch, dimension) array of embeddings
+            top_k: Number of chunks to return per query
+            nprobe: IVF lists to scan per query (defaults to `self.nprobe`);
+                ignored without an IVF index
+
+        Returns:
+            One list per query of item dicts with a "score" key, best first
+        """
+        queries = np.array(queries, dtype=np.float32, ndmin=2)
+        if queries.shape[1] != self.dimension:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match index "
+                f"dimension {self.dimension}"
+            )
+        normalize_rows(queries)
+        k = min(top_k, len(self))
+        if k <= 0:
+            return [[] for _ in queries]
+
+        candidates = k
+        if self.quantizer is not None and self.rerank_factor > 1:
+            candidates = min(k * self.rerank_factor, len(self))
+        if self.ivf is None:
+            matches = self._search_exact(queries, candidates)
+        else:
+            matches = self._search_ivf(queries, candidates, nprobe or self.nprobe)
+        if candidates > k:
+            matches = [
+                self._rerank(query, rows, k) for query, (rows, _) in zip(queries, matches)
+            ]
+        return [
+            [{**self.items[row], "score": float(score)} for row, score in zip(rows, scores)]
+            for rows, scores in matches
+        ]
+
+    def _search_exact(self, queries, k):
+        matches = []
+        for start in range(0, len(queries), self.query_batch_size):
+            scores = self._score_rows(
+                queries[start : start + self.query_batch_size], 0, len(self.matrix)
+            )
+            matches.extend(zip(*_top_k(scores, k)))
+        return matches
+
+    def _search_ivf(self, queries, k, nprobe):
+        matches = []
+        for query, lists in zip(queries, self.ivf.probe(queries, nprobe)):
+            ranges = self.ivf.row_ranges(lists)
+            rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+            scores = np.concatenate(
+                [self._score_rows(query[None], start, end)[0] for start, end in ranges]
+            )
+            top, top_scores = _top_k(scores[None], min(k, len(rows)))
+            matches.append((rows[top[0]], top_scores[0]))
+        return matches
+
+    def _rerank(self, query, rows, k):
+        """Exact float scores for the candidate rows; returns the best k."""
+        rows = np.sort(rows)  # ascending reads from a memory-mapped matrix
+        scores = np.asarray(self.matrix[rows], dtype=np.float32) @ query
+        top, top_scores = _top_k(scores[None], min(k, len(rows)))
+        return rows[top[0]], top_scores[0]
+
+    def _score_rows(self, queries, start, end):
+        """Cosine scores of `queries` against matrix rows start:end, shape (batch, rows)."""
+        if self.quantizer is not None:
+            return self.quantizer.score(queries, start, end)
+        if self.matrix.dtype == np.float32:
+            return queries @ self.matrix[start:end].T
+        scores = np.empty((len(queries), end - start), dtype=np.float32)
+        for block_start in range(start, end, SCORE_BLOCK_ROWS):
+            block_end = min(block_start + SCORE_BLOCK_ROWS, end)
+            block = self.matrix[block_start:block_end].astype(np.float32)
+            scores[:, block_start - start : block_end - start] = queries @ block.T
+        return scores
+
+
+def _spill_matrix(matrix):
+    """Copy a matrix to an unlinked temporary file and memory-map it."""
+    with tempfile.TemporaryFile() as spill_file:
+        # Written through the file rather than the mapping, so no page of it
+        # starts out resident in this process
+        np.ascontiguousarray(matrix).tofile(spill_file)
+        spill_file.flush()
+        # The mapping keeps the file alive after it is closed
+        return np.memmap(spill_file, dtype=matrix.dtype, mode="r", shape=matrix.shape)
+
+
+def _top_k(scores, k):
+    """Best-first (positions, scores) of the k highest scores in each row."""
+    # Partial selection of the k best per row, then sort only those k
+    top = np.argpartition(scores, -k, axis=1)[:, -k:]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def _is_missing(s3_error):
+    return s3_error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey")
+
+
+def _get_object(s3_client, bucket, key, if_none_match=None):
+    """GetObject, conditional on the ETag when given; None means not modified."""
+    request = {"Bucket": bucket, "Key": key}
+    if if_none_match:
+        request["IfNoneMatch"] = if_none_match
+    try:
+        return s3_client.get_object(**request)
+    except ClientError as s3_error:
+        if s3_error.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+            return None
+        raise
+
+
+def load_index_from_s3(
+    s3_client, bucket, index_prefix, json_key, cache_dir, if_none_match=None, **kwargs
+):
+    """
+    Load the binary index, falling back to embeddings.json when the bucket
+    has no binary index yet (ingested before the format existed).
+
+    Returns None when `if_none_match` is the ETag of the current object,
+    i.e. the index has not changed since it was last loaded.
+    """
+    try:
+        return EmbeddingIndex.from_s3_files(
+            s3_client, bucket, index_prefix, cache_dir, if_none_match, **kwargs
+        )
+    except ClientError as s3_error:
+        if not _is_missing(s3_error):
+            raise
+        if not if_none_match:
+            print(f"[rag] No binary index at {index_prefix}.bin, loading {json_key}")
+    return EmbeddingIndex.from_s3(s3_client, bucket, json_key, if_none_match, **kwargs)
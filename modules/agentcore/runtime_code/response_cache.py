@@ -0,0 +1,138 @@
+"""
+Response Cache for AgentCore Runtime
+Bounded TTL/LRU cache of complete answers to first-turn prompts, so frequent
+questions ("Hello! What can you help me with?") skip Bedrock generation.
+Entries are keyed by a fingerprint of everything that shapes an answer.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import re
+import threading
+import time
+
+RESPONSE_CACHE_TTL_SECONDS = 3600
+RESPONSE_CACHE_MAX_ENTRIES = 256
+# Longer prompts are rarely repeated verbatim; don't let them churn the cache
+RESPONSE_CACHE_MAX_PROMPT_CHARS = 300
+# Approximate size of each replayed delta, split on whitespace
+REPLAY_DELTA_CHARS = 48
+PROMPT_WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize_prompt(text: str) -> str:
+    """Case-folded words only, so punctuation and spacing never split a key."""
+    return " ".join(PROMPT_WORD_PATTERN.findall(text.lower()))
+
+
+def answer_text(message) -> str:
+    """
+    Text of a final assistant message; what both the websocket and invoke
+    paths cache, so either can serve the other's answers.
+    """
+    return "".join(block.get("text", "") for block in message.get("content", ()))
+
+
+def response_fingerprint(*parts) -> str:
+    """
+    Stable digest of the inputs that shape an answer (system prompt, model id,
+    tool specs, ...). Any change yields new keys, so stale answers are never
+    served and simply age out.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, default=str)
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def replay_deltas(text: str, size: int = REPLAY_DELTA_CHARS):
+    """Split a cached answer into stream-sized deltas that concatenate back to `text`."""
+    start = 0
+    while start < len(text):
+        end = text.find(" ", start + size)
+        end = len(text) if end < 0 else end + 1
+        yield text[start:end]
+        start = end
+
+
+class ResponseCache:
+    """
+    Answers keyed by (fingerprint, normalized prompt). Callers decide which
+    turns are cacheable; only a turn with no prior conversation gives an
+    answer that any other first turn can reuse.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_prompt_chars: int = RESPONSE_CACHE_MAX_PROMPT_CHARS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_prompt_chars = max_prompt_chars
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def cacheable(self, prompt: str) -> bool:
+        return self._key(None, prompt) is not None
+
+    def _key(self, fingerprint, prompt):
+        if not self.enabled or not 0 < len(prompt) <= self.max_prompt_chars:
+            return None
+        # Prompts of only punctuation or emoji have no words; never share them
+        normalized = normalize_prompt(prompt)
+        return (fingerprint, normalized) if normalized else None
+
+    def get(self, fingerprint: str, prompt: str):
+        """Return the cached answer text, or None on a miss."""
+        key = self._key(fingerprint, prompt)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, fingerprint: str, prompt: str, response: str):
+        key = self._key(fingerprint, prompt)
+        if key is None or not response:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
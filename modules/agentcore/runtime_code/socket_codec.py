@@ -0,0 +1,103 @@
+"""
+Socket Event Codec for AgentCore Runtime
+Serializes websocket protocol events with a pre-encoded envelope per event type,
+using orjson when it is installed and the stdlib json module otherwise.
+Also packs and unpacks the binary voice audio frames.
+"""
+
+import json
+import struct
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON, byte-for-byte the same as websocket.send_json output."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects values the stdlib encodes (integers beyond 64
+            # bits, non-str keys), e.g. a client-chosen id echoed back
+            pass
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class EnvelopeEncoder:
+    """
+    Encodes {"version": ..., "type": ..., **payload} frames.
+    The constant `{"version":N,"type":"..."` prefix is encoded once per event
+    type and cached, so each frame only serializes its payload fields.
+    """
+
+    def __init__(self, version: int):
+        self.version = version
+        self._prefixes = {}
+
+    def prefix(self, event_type: str) -> bytes:
+        prefix = self._prefixes.get(event_type)
+        if prefix is None:
+            # Drop the closing brace so payload fields can be appended
+            prefix = dumps({"version": self.version, "type": event_type})[:-1]
+            self._prefixes[event_type] = prefix
+        return prefix
+
+    def encode(self, event_type: str, payload: dict) -> bytes:
+        prefix = self.prefix(event_type)
+        if not payload:
+            return prefix + b"}"
+        # Splice the payload object's fields in after the envelope fields
+        return prefix + b"," + dumps(payload)[1:]
+
+
+# Binary voice audio frame: 8-byte header followed by raw 16-bit PCM samples
+#   byte 0: frame version, byte 1: frame kind, byte 2: channels, byte 3: unused,
+#   bytes 4-7: sample rate (Hz, big-endian uint32)
+VOICE_FRAME_VERSION = 1
+VOICE_FRAME_AUDIO = 1
+VOICE_FRAME_HEADER = struct.Struct("!BBBxI")
+
+
+def pack_audio_frame(pcm, sample_rate: int, channels: int) -> bytearray:
+    """Prefix raw PCM with the binary frame header, copying the samples once."""
+    frame = bytearray(VOICE_FRAME_HEADER.size + len(pcm))
+    write_audio_header(frame, sample_rate, channels)
+    frame[VOICE_FRAME_HEADER.size :] = pcm
+    return frame
+
+
+def write_audio_header(frame: bytearray, sample_rate: int, channels: int) -> bytearray:
+    """
+    Fill in the header of a frame whose first VOICE_FRAME_HEADER.size bytes
+    were reserved for it, so audio already collected after that headroom is
+    sent without another copy.
+    """
+    VOICE_FRAME_HEADER.pack_into(
+        frame, 0, VOICE_FRAME_VERSION, VOICE_FRAME_AUDIO, channels, sample_rate
+    )
+    return frame
+
+
+def unpack_audio_frame(frame):
+    """
+    Parse a binary audio frame without copying its samples.
+
+    Returns:
+        Tuple of (sample_rate, channels, pcm memoryview)
+
+    Raises:
+        ValueError: if the header is truncated or not a version 1 audio frame
+    """
+    view = memoryview(frame)
+    if len(view) <= VOICE_FRAME_HEADER.size:
+        raise ValueError("Audio frame is too short")
+    version, kind, channels, sample_rate = VOICE_FRAME_HEADER.unpack_from(view)
+    if version != VOICE_FRAME_VERSION or kind != VOICE_FRAME_AUDIO:
+        raise ValueError("Unsupported audio frame")
+    return sample_rate, channels, view[VOICE_FRAME_HEADER.size :]
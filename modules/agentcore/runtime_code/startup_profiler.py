@@ -0,0 +1,74 @@
+"""
+Startup Profiler for AgentCore Runtime
+Records wall time and resident memory for each cold-start phase and emits
+them as one structured log record
+"""
+
+import json
+import os
+import resource
+import time
+
+
+def current_rss_mb():
+    """Resident set size of this process in MiB (peak RSS where /proc is absent)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / 1048576, 1)
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is KiB on Linux
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def process_age_ms():
+    """Milliseconds since the kernel started this process, or None if unknown."""
+    try:
+        with open("/proc/self/stat") as stat:
+            # Field 22 (starttime) follows the parenthesised command name
+            start_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as uptime:
+            uptime_seconds = float(uptime.read().split()[0])
+        ticks_per_second = os.sysconf("SC_CLK_TCK")
+        return round((uptime_seconds - start_ticks / ticks_per_second) * 1000)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfiler:
+    """
+    Phase timer for module import and app construction.
+    Call `mark(name)` at the end of each phase; its duration is measured
+    from the previous mark (or from profiler creation).
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.interpreter_ms = process_age_ms()
+        self.phases = []
+        self._last = self.started
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append(
+            {
+                "phase": phase,
+                "ms": round((now - self._last) * 1000, 1),
+                "rssMb": current_rss_mb(),
+            }
+        )
+        self._last = now
+
+    def record(self):
+        total_ms = round((self._last - self.started) * 1000, 1)
+        return {
+            "event": "startup_profile",
+            # Interpreter boot and stdlib imports before the profiler existed
+            "interpreterMs": self.interpreter_ms,
+            "phases": self.phases,
+            "totalMs": total_ms,
+            "rssMb": current_rss_mb(),
+        }
+
+    def emit(self):
+        print(f"[startup] profile {json.dumps(self.record())}")
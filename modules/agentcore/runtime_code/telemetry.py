@@ -0,0 +1,172 @@
+"""
+Telemetry for AgentCore Runtime
+OpenTelemetry spans and latency histograms for the chat, memory and voice hot
+paths. opentelemetry-instrument installs the exporters; without the
+OpenTelemetry API every helper here is a no-op.
+"""
+
+from contextlib import contextmanager
+import functools
+import time
+
+try:
+    from opentelemetry import context, metrics, trace
+
+    OTEL_AVAILABLE = True
+except ImportError:
+    context = metrics = trace = None
+    OTEL_AVAILABLE = False
+
+INSTRUMENTATION_SCOPE = "agentcore.runtime"
+
+# Keyword attributes map to these keys, and to "agentcore.<name>" otherwise.
+# session_id goes on spans only: as a metric attribute it would create a
+# time series per session.
+ATTRIBUTE_KEYS = {
+    "session_id": "session.id",
+    "model": "gen_ai.request.model",
+    "inputTokens": "gen_ai.usage.input_tokens",
+    "outputTokens": "gen_ai.usage.output_tokens",
+    "cacheReadInputTokens": "gen_ai.usage.cache_read_input_tokens",
+    "cacheWriteInputTokens": "gen_ai.usage.cache_write_input_tokens",
+}
+SPAN_ONLY_ATTRIBUTES = ("session_id",)
+
+# name -> (unit, description)
+HISTOGRAMS = {
+    "agentcore.chat.time_to_first_token": ("ms", "Prompt received to first streamed text"),
+    "agentcore.chat.turn.duration": ("ms", "Prompt received to complete response"),
+    "agentcore.chat.output_rate": ("{token}/s", "Output tokens per second of generation"),
+    "agentcore.tool.duration": ("ms", "Agent tool execution time"),
+    "agentcore.memory.load.duration": ("ms", "Conversation history and summary load"),
+    "agentcore.memory.save.duration": ("ms", "Memory API save, including retries"),
+    "agentcore.queue.wait": ("ms", "Time spent waiting in a queue or on a lock"),
+    "agentcore.context.summary.duration": ("ms", "Rolling conversation summary update"),
+    "agentcore.voice.setup.duration": ("ms", "voice.start to voice.ready"),
+    "agentcore.voice.round_trip": ("ms", "Final user transcript to first reply audio sent"),
+}
+
+
+class _NoSpan:
+    """Stand-in span when OpenTelemetry is not installed."""
+
+    def set_attributes(self, attributes):
+        pass
+
+
+if OTEL_AVAILABLE:
+    # Both are proxies until opentelemetry-instrument sets the real providers
+    _tracer = trace.get_tracer(INSTRUMENTATION_SCOPE)
+    _meter = metrics.get_meter(INSTRUMENTATION_SCOPE)
+    _histograms = {
+        name: _meter.create_histogram(name, unit=unit, description=description)
+        for name, (unit, description) in HISTOGRAMS.items()
+    }
+else:
+    _tracer = None
+    _histograms = {}
+
+
+def _attributes(attributes, metric=False):
+    # OpenTelemetry rejects None attribute values
+    return {
+        ATTRIBUTE_KEYS.get(name, f"agentcore.{name}"): value
+        for name, value in attributes.items()
+        if value is not None and not (metric and name in SPAN_ONLY_ATTRIBUTES)
+    }
+
+
+def current_context():
+    """Trace context to parent spans started later on another thread."""
+    return context.get_current() if context is not None else None
+
+
+@contextmanager
+def span(name: str, parent=None, **attributes):
+    """
+    Current span for a block; exceptions are recorded and mark it as an error.
+    `parent` is a `current_context()` captured elsewhere; by default the span
+    is a child of the current one.
+    """
+    if _tracer is None:
+        yield _NoSpan()
+        return
+    with _tracer.start_as_current_span(
+        name, context=parent, attributes=_attributes(attributes)
+    ) as current:
+        yield current
+
+
+def set_attributes(current, **attributes):
+    """Add keyword attributes to a span from `span()`."""
+    current.set_attributes(_attributes(attributes))
+
+
+def mark_error(current, error):
+    """Record an exception the caller handled on a span from `span()`."""
+    if _tracer is not None:
+        current.record_exception(error)
+        current.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+
+
+def record(name: str, value: float, **attributes):
+    """Add one measurement to the named histogram."""
+    histogram = _histograms.get(name)
+    if histogram is not None:
+        histogram.record(value, attributes=_attributes(attributes, metric=True))
+
+
+def elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def timed_tool(fn):
+    """Record each call of an agent tool in agentcore.tool.duration."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = fn(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            record(
+                "agentcore.tool.duration", elapsed_ms(started), tool=fn.__name__, outcome=outcome
+            )
+
+    return wrapper
+
+
+class TurnTimer:
+    """
+    Latency of one chat turn. `first_token()` marks time to first token
+    (once); `finish()` records the turn duration and, given the output token
+    count, the generation rate from the first token on.
+    """
+
+    def __init__(self, **attributes):
+        self.attributes = attributes
+        self.started = time.perf_counter()
+        self.first_token_at = None
+
+    def first_token(self):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            record(
+                "agentcore.chat.time_to_first_token",
+                (self.first_token_at - self.started) * 1000,
+                **self.attributes,
+            )
+
+    def finish(self, output_tokens=None, **attributes):
+        """Record the turn; returns its duration in milliseconds."""
+        finished = time.perf_counter()
+        attributes = {**self.attributes, **attributes}
+        duration_ms = (finished - self.started) * 1000
+        record("agentcore.chat.turn.duration", duration_ms, **attributes)
+        generation_seconds = finished - (self.first_token_at or self.started)
+        if output_tokens and generation_seconds > 0:
+            record("agentcore.chat.output_rate", output_tokens / generation_seconds, **attributes)
+        return duration_ms
@@ -0,0 +1,187 @@
+"""
+Voice Output Buffer for AgentCore Runtime
+Decouples the voice model's output stream from the client websocket so a
+slow client no longer throttles the model, and stale audio can be dropped
+"""
+
+from collections import deque
+import asyncio
+import base64
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+
+def _audio_size(audio):
+    if isinstance(audio, str):
+        # Decoded size of a base64 string, without decoding it
+        return len(audio) * 3 // 4 - audio.count("=", -2)
+    return len(audio or b"")
+
+
+def _audio_bytes(audio):
+    if isinstance(audio, str):
+        return base64.b64decode(audio)
+    return audio
+
+
+class VoiceOutputBuffer:
+    """
+    Bounded queue between `agent.receive()` and the websocket sender.
+
+    - Consecutive `bidi_audio_stream` chunks still waiting to be sent are
+      merged into one chunk up to `coalesce_max_bytes`, so a client that
+      falls behind catches up with fewer, larger frames.
+    - A `bidi_interruption` drops all queued audio, so the client stops
+      hearing the reply the user just talked over.
+    - When queued audio would exceed `max_audio_bytes`, `overflow_policy`
+      decides: "drop_oldest" discards the oldest queued audio, "drop_newest"
+      discards the incoming chunk, and "block" waits for the sender.
+
+    Non-audio events (transcripts, response markers, errors) are never dropped.
+    Audio in merged events is a raw bytearray rather than base64, starting
+    with `audio_headroom` reserved bytes (recorded as the event's
+    "audio_offset") so the sender can write a frame header in place.
+    """
+
+    def __init__(
+        self,
+        max_audio_bytes: int = 192 * 1024,
+        coalesce_max_bytes: int = 8 * 1024,
+        overflow_policy: str = "drop_oldest",
+        audio_headroom: int = 0,
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown voice output overflow policy: {overflow_policy}")
+        self.max_audio_bytes = max_audio_bytes
+        self.coalesce_max_bytes = coalesce_max_bytes
+        self.overflow_policy = overflow_policy
+        self.audio_headroom = audio_headroom
+        # Each entry is [event, audio_size]; audio_size is 0 for non-audio events
+        self._entries = deque()
+        self._audio_bytes = 0
+        self._closed = False
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self.max_depth = 0
+        self.max_buffered_bytes = 0
+        self.coalesced_chunks = 0
+        self.dropped_overflow_bytes = 0
+        self.dropped_interrupt_bytes = 0
+        self.sent_events = 0
+
+    async def put(self, event):
+        if self._closed:
+            return
+
+        event_type = event.get("type") if isinstance(event, dict) else None
+        if event_type == "bidi_audio_stream":
+            await self._put_audio(event)
+        else:
+            if event_type == "bidi_interruption":
+                self.dropped_interrupt_bytes += self._drop_audio()
+            self._entries.append([event, 0])
+
+        self.max_depth = max(self.max_depth, len(self._entries))
+        self.max_buffered_bytes = max(self.max_buffered_bytes, self._audio_bytes)
+        self._readable.set()
+
+    async def get(self):
+        """Return the next event to send, or None once closed and empty."""
+        while not self._entries:
+            if self._closed:
+                return None
+            self._readable.clear()
+            await self._readable.wait()
+
+        event, size = self._entries.popleft()
+        if size:
+            self._audio_bytes -= size
+            self._writable.set()
+        self.sent_events += 1
+        return event
+
+    def close(self):
+        """Stop accepting events; get() drains what is queued, then returns None."""
+        self._closed = True
+        self._readable.set()
+        self._writable.set()
+
+    def stats(self):
+        return {
+            "depth": len(self._entries),
+            "maxDepth": self.max_depth,
+            "maxBufferedBytes": self.max_buffered_bytes,
+            "coalescedChunks": self.coalesced_chunks,
+            "droppedOverflowBytes": self.dropped_overflow_bytes,
+            "droppedInterruptBytes": self.dropped_interrupt_bytes,
+            "sentEvents": self.sent_events,
+            "overflowPolicy": self.overflow_policy,
+        }
+
+    async def _put_audio(self, event):
+        size = _audio_size(event.get("audio"))
+
+        if self._audio_bytes + size > self.max_audio_bytes:
+            if self.overflow_policy == "drop_newest":
+                self.dropped_overflow_bytes += size
+                return
+            if self.overflow_policy == "drop_oldest":
+                self._drop_oldest_audio(self._audio_bytes + size - self.max_audio_bytes)
+            else:
+                while (
+                    self._audio_bytes
+                    and self._audio_bytes + size > self.max_audio_bytes
+                    and not self._closed
+                ):
+                    self._writable.clear()
+                    await self._writable.wait()
+                if self._closed:
+                    return
+
+        tail = self._entries[-1] if self._entries else None
+        if tail and tail[1] and self._can_merge(tail, event, size):
+            merged_audio = tail[0]["audio"]
+            if not isinstance(merged_audio, bytearray):
+                # First merge into this entry: copy the event and decode once
+                tail[0] = dict(tail[0])
+                first_audio = _audio_bytes(merged_audio)
+                merged_audio = bytearray(self.audio_headroom)
+                merged_audio += first_audio
+                tail[0]["audio"] = merged_audio
+                tail[0]["audio_offset"] = self.audio_headroom
+            merged_audio += _audio_bytes(event.get("audio"))
+            tail[1] += size
+            self.coalesced_chunks += 1
+        else:
+            self._entries.append([event, size])
+        self._audio_bytes += size
+
+    def _can_merge(self, tail, event, size):
+        queued = tail[0]
+        return (
+            tail[1] + size <= self.coalesce_max_bytes
+            and queued.get("format") == "pcm"
+            and event.get("format") == "pcm"
+            and queued.get("sample_rate") == event.get("sample_rate")
+            and queued.get("channels") == event.get("channels")
+        )
+
+    def _drop_oldest_audio(self, needed):
+        dropped = 0
+        kept = deque()
+        for entry in self._entries:
+            if entry[1] and dropped < needed:
+                dropped += entry[1]
+            else:
+                kept.append(entry)
+        self._entries = kept
+        self._audio_bytes -= dropped
+        self.dropped_overflow_bytes += dropped
+
+    def _drop_audio(self):
+        dropped = self._audio_bytes
+        self._entries = deque(entry for entry in self._entries if not entry[1])
+        self._audio_bytes = 0
+        self._writable.set()
+        return dropped
@@ -0,0 +1,154 @@
+"""
+Voice Agent Pool for AgentCore Runtime
+Keeps a few voice agents with their model stream already started, so
+`voice.start` can skip the model handshake
+"""
+
+from collections import deque
+import asyncio
+import time
+
+
+class VoiceAgentPool:
+    """
+    Pool of pre-started voice agents, replenished by a background task.
+
+    `factory` is a coroutine function that starts an agent with the given
+    invocation_state dict; `close` is a coroutine function that stops one.
+    The agent shares that dict by reference with its tools, so `acquire()`
+    adds the session context to a pooled agent's state when handing it out.
+
+    Warming is on demand: the first `acquire()` starts the replenisher, and it
+    stops (closing the pooled agents) after `idle_shutdown_seconds` without
+    an acquire. Pooled agents older than `max_idle_seconds` are closed and
+    replaced, so a session never inherits a model stream that is close to its
+    service-side lifetime limit.
+    """
+
+    def __init__(
+        self,
+        factory,
+        close,
+        size: int = 1,
+        max_idle_seconds: float = 120,
+        idle_shutdown_seconds: float = 600,
+    ):
+        self.factory = factory
+        self.close = close
+        self.size = size
+        self.max_idle_seconds = max_idle_seconds
+        self.idle_shutdown_seconds = idle_shutdown_seconds
+        self._ready = deque()
+        self._wake = asyncio.Event()
+        self._task = None
+        self._consecutive_failures = 0
+        self._last_acquired = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.warm_failures = 0
+
+    def ensure_started(self):
+        """Start the background replenisher on the running loop (idempotent)."""
+        if self.size <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._maintain())
+
+    async def acquire(self, **context):
+        """
+        Return (agent, warm) with `context` (e.g. session_id) in the agent's
+        invocation_state. Falls back to starting an agent inline when the
+        pool is empty.
+        """
+        self._last_acquired = time.monotonic()
+        self._discard_stale()
+        self.ensure_started()
+        if self._ready:
+            _, agent, invocation_state = self._ready.popleft()
+            invocation_state.update(context)
+            self.hits += 1
+            self._wake.set()
+            return agent, True
+
+        self.misses += 1
+        self._wake.set()
+        return await self.factory(dict(context)), False
+
+    async def stop(self):
+        """Stop the replenisher and close every pooled agent."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._close_ready()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "ready": len(self._ready),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "warmFailures": self.warm_failures,
+        }
+
+    async def _maintain(self):
+        while True:
+            # Clear before refilling so an acquire() during the refill re-wakes us
+            self._wake.clear()
+            idle = time.monotonic() - self._last_acquired
+            if idle >= self.idle_shutdown_seconds:
+                # Nobody is using voice; don't hold model streams open for nothing
+                await self._close_ready()
+                print(f"[voice] Pool idle for {idle:.0f}s; stopped pre-warming")
+                return
+
+            self._discard_stale()
+            while len(self._ready) < self.size:
+                invocation_state = {}
+                try:
+                    agent = await self.factory(invocation_state)
+                except Exception as warm_error:
+                    self.warm_failures += 1
+                    self._consecutive_failures += 1
+                    print(f"[voice] Pre-warm failed: {warm_error}")
+                    break
+                self._consecutive_failures = 0
+                self._ready.append((time.monotonic(), agent, invocation_state))
+                print(f"[voice] Pre-warmed voice agent {self.stats()}")
+
+            # Sleep until the oldest pooled agent expires, a slot frees up or
+            # the pool goes idle
+            timeout = self.max_idle_seconds
+            if self._ready:
+                age = time.monotonic() - self._ready[0][0]
+                timeout = max(self.max_idle_seconds - age, 0)
+            elif self._consecutive_failures:
+                # Back off between failed pre-warm attempts
+                timeout = min(timeout, 5 * self._consecutive_failures)
+            idle = time.monotonic() - self._last_acquired
+            timeout = min(timeout, max(self.idle_shutdown_seconds - idle, 0))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _discard_stale(self):
+        now = time.monotonic()
+        while self._ready and now - self._ready[0][0] >= self.max_idle_seconds:
+            _, agent, _ = self._ready.popleft()
+            self.expired += 1
+            asyncio.create_task(self._close_quietly(agent))
+
+    async def _close_ready(self):
+        agents = [agent for _, agent, _ in self._ready]
+        self._ready.clear()
+        await asyncio.gather(*(self._close_quietly(agent) for agent in agents))
+
+    async def _close_quietly(self, agent):
+        try:
+            await self.close(agent)
+        except Exception as close_error:
+            print(f"[voice] Failed to stop pooled voice agent: {close_error}")
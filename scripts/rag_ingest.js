@@ -3,12 +3,33 @@
  * DIY RAG Ingestion Script
  * ---------------------------------
  * Reads markdown files from a source directory, chunks them, generates embeddings
- * using Amazon Bedrock Titan Embed Text V2, and uploads a single consolidated
- * embeddings JSON file to the configured S3 bucket.
+ * using Amazon Bedrock Titan Embed Text V2, and uploads them to the configured
+ * S3 bucket as a binary index (memory-mapped by the runtime) plus the legacy
+ * consolidated embeddings JSON file.
+ *
+ * Binary index (see runtime_code/rag_retrieval.py for the reader):
+ *   <prefix>.bin   64-byte header + rows x dim little-endian float32/float16,
+ *                  rows L2-normalized
+ *   <prefix>.meta  header + index info JSON + uint64 record offsets + one
+ *                  compact JSON record per chunk (id, file, chunk_index, text, metadata)
+ *   <prefix>.ivf   optional IVF (k-means) index for approximate search: header +
+ *                  build id + float32 centroids + uint32 row offsets per list;
+ *                  rows in .bin/.meta are grouped by list when it is present
+ *   <prefix>.manifest.json
+ *                  content hash of every .bin row, so the next run re-embeds
+ *                  only new or changed chunks
+ *
+ * Every file carries the random build id of its ingestion run (.bin header,
+ * .meta info, .ivf header, manifest); the runtime rejects a mixed set read
+ * while an upload is in progress.
+ *
+ * Embedding calls run with bounded concurrency (RAG_EMBED_CONCURRENCY) that
+ * halves on throttling and recovers gradually. Outputs are streamed to S3
+ * with multipart uploads.
  *
  * Requirements:
- *   npm install @aws-sdk/client-bedrock-runtime @aws-sdk/client-s3 @aws-sdk/client-ssm gray-matter glob
- *   AWS credentials with bedrock:InvokeModel, s3:PutObject, ssm:GetParameter
+ *   npm install @aws-sdk/client-bedrock-runtime @aws-sdk/client-s3 @aws-sdk/lib-storage @aws-sdk/client-ssm gray-matter glob
+ *   AWS credentials with bedrock:InvokeModel, s3:GetObject, s3:PutObject, s3:DeleteObject, ssm:GetParameter
  *
  * Usage:
  *   node rag_ingest.js --source ./docs --bucket my-rag-bucket
@@ -19,10 +40,17 @@ import {
   BedrockRuntimeClient,
   InvokeModelCommand,
 } from "@aws-sdk/client-bedrock-runtime";
-import { S3Client, PutObjectCommand } from "@aws-sdk/client-s3";
+import {
+  S3Client,
+  GetObjectCommand,
+  DeleteObjectCommand,
+} from "@aws-sdk/client-s3";
+import { Upload } from "@aws-sdk/lib-storage";
 import { SSMClient, GetParameterCommand } from "@aws-sdk/client-ssm";
+import crypto from "crypto";
 import fs from "fs";
 import path from "path";
+import { Readable } from "stream";
 import matter from "gray-matter";
 import glob from "glob";
 
@@ -38,6 +66,23 @@ const CHUNK_OVERLAP_TOKENS = parseInt(
   10
 );
 const OUTPUT_KEY = process.env.RAG_OUTPUT_KEY || "embeddings/embeddings.json";
+const INDEX_PREFIX = process.env.RAG_INDEX_PREFIX || "embeddings/index";
+// float16 halves the index size; similarity scores change by ~1e-3
+const INDEX_DTYPE = process.env.RAG_INDEX_DTYPE || "float32";
+const WRITE_JSON = (process.env.RAG_WRITE_JSON || "true").toLowerCase() === "true";
+// IVF lists: "auto" builds sqrt(rows) lists once the corpus reaches
+// RAG_IVF_MIN_ROWS chunks, "0" disables, any other number is used as-is
+const IVF_LISTS = process.env.RAG_IVF_LISTS || "auto";
+const IVF_MIN_ROWS = parseInt(process.env.RAG_IVF_MIN_ROWS || "20000", 10);
+const IVF_ITERATIONS = 10;
+const EMBED_CONCURRENCY = parseInt(process.env.RAG_EMBED_CONCURRENCY || "8", 10);
+const EMBED_MAX_RETRIES = 6;
+const EMBED_BACKOFF_BASE_MS = 500;
+const EMBED_BACKOFF_MAX_MS = 20000;
+const UPLOAD_PART_BYTES = 8 * 1024 * 1024;
+// Set RAG_FULL_REINDEX=true to ignore the manifest and re-embed everything
+const FULL_REINDEX =
+  (process.env.RAG_FULL_REINDEX || "false").toLowerCase() === "true";
 const SSM_BUCKET_PARAM =
   process.env.RAG_SSM_PARAM || "/charlesmbrady/Test/agentcore/rag/bucket-name";
 
@@ -64,6 +109,7 @@ function chunkText(text) {
     const end = Math.min(start + MAX_CHUNK_TOKENS, tokens.length);
     const chunkTokens = tokens.slice(start, end);
     chunks.push(chunkTokens.join(" "));
+    if (end === tokens.length) break;
     start = end - CHUNK_OVERLAP_TOKENS; // overlap
     if (start < 0) start = 0;
     if (start >= tokens.length) break;
@@ -80,6 +126,90 @@ async function getBucketNameIfMissing(providedBucket) {
   return param.Parameter.Value;
 }
 
+function isThrottle(err) {
+  const status = err?.$metadata?.httpStatusCode;
+  return (
+    status === 429 ||
+    status === 503 ||
+    [
+      "ThrottlingException",
+      "TooManyRequestsException",
+      "ServiceUnavailableException",
+      "ModelNotReadyException",
+    ].includes(err?.name)
+  );
+}
+
+/**
+ * Concurrency limit that halves on throttling and grows back by one after
+ * `limit` consecutive successes (AIMD), between 1 and `max`.
+ */
+class AdaptiveLimiter {
+  constructor(max) {
+    this.max = Math.max(1, max);
+    this.limit = this.max;
+    this.active = 0;
+    this.successes = 0;
+    this.throttles = 0;
+    this.waiters = [];
+  }
+
+  async acquire() {
+    while (this.active >= this.limit) {
+      await new Promise((resolve) => this.waiters.push(resolve));
+    }
+    this.active++;
+  }
+
+  release() {
+    this.active--;
+    this.wake();
+  }
+
+  onSuccess() {
+    if (++this.successes >= this.limit && this.limit < this.max) {
+      this.limit++;
+      this.successes = 0;
+      this.wake();
+    }
+  }
+
+  onThrottle() {
+    this.throttles++;
+    this.successes = 0;
+    this.limit = Math.max(1, Math.floor(this.limit / 2));
+  }
+
+  wake() {
+    // Waiters re-check the limit, so waking all of them is safe
+    const waiters = this.waiters;
+    this.waiters = [];
+    for (const resolve of waiters) resolve();
+  }
+}
+
+async function embedWithBackoff(client, limiter, text) {
+  for (let attempt = 0; ; attempt++) {
+    await limiter.acquire();
+    try {
+      const embedding = await embedChunk(client, text);
+      limiter.onSuccess();
+      return embedding;
+    } catch (err) {
+      if (!isThrottle(err) || attempt >= EMBED_MAX_RETRIES) throw err;
+      limiter.onThrottle();
+    } finally {
+      limiter.release();
+    }
+    // Full jitter: sleep a random fraction of the exponential ceiling
+    const ceiling = Math.min(
+      EMBED_BACKOFF_MAX_MS,
+      EMBED_BACKOFF_BASE_MS * 2 ** attempt
+    );
+    await new Promise((resolve) => setTimeout(resolve, Math.random() * ceiling));
+  }
+}
+
 async function embedChunk(client, text) {
   const payload = {
     inputText: text,
@@ -97,6 +227,387 @@ async function embedChunk(client, text) {
   return parsed.embedding;
 }
 
+const INDEX_MAGIC = "RAGINDEX";
+const META_MAGIC = "RAGMETA\0";
+const INDEX_VERSION = 1;
+const INDEX_DATA_OFFSET = 64;
+const INDEX_FLAG_NORMALIZED = 1;
+const INDEX_DTYPE_CODES = { float32: 1, float16: 2 };
+const IVF_MAGIC = "RAGIVF\0\0";
+// Version 2 adds the build id after the 20-byte version 1 header
+const IVF_VERSION = 2;
+const IVF_HEADER_SIZE = 36;
+// Reserved .bin header bytes 24-40 hold the random id of the ingestion run
+const INDEX_BUILD_ID_OFFSET = 24;
+const MANIFEST_VERSION = 1;
+// Rows per streamed upload chunk
+const ROWS_PER_CHUNK = 1024;
+
+function toFloat16Bits(value) {
+  // Round-to-nearest float32 -> IEEE 754 half precision
+  const f32 = new Float32Array([value]);
+  const bits = new Uint32Array(f32.buffer)[0];
+  const sign = (bits >>> 16) & 0x8000;
+  const exponent = ((bits >>> 23) & 0xff) - 127 + 15;
+  const mantissa = bits & 0x7fffff;
+  if (exponent >= 31) return sign | 0x7c00;
+  if (exponent <= 0) {
+    if (exponent < -10) return sign;
+    const subnormal = (mantissa | 0x800000) >>> (1 - exponent);
+    return sign | ((subnormal + 0x1000) >>> 13);
+  }
+  // Addition lets a rounding carry spill into the exponent
+  return sign | ((exponent << 10) + ((mantissa + 0x1000) >>> 13));
+}
+
+function fromFloat16Bits(bits) {
+  const sign = bits & 0x8000 ? -1 : 1;
+  const exponent = (bits >>> 10) & 0x1f;
+  const mantissa = bits & 0x3ff;
+  if (exponent === 0) return sign * mantissa * 2 ** -24;
+  if (exponent === 31) return mantissa ? NaN : sign * Infinity;
+  return sign * (1 + mantissa / 1024) * 2 ** (exponent - 15);
+}
+
+function chunkHash(model, text) {
+  // The model is part of the hash: switching models invalidates every vector
+  return crypto.createHash("sha256").update(`${model}\0${text}`).digest("hex");
+}
+
+function normalizeVector(embedding) {
+  const vector = Float32Array.from(embedding);
+  let sum = 0;
+  for (const value of vector) sum += value * value;
+  const norm = Math.sqrt(sum) || 1;
+  for (let d = 0; d < vector.length; d++) vector[d] /= norm;
+  return vector;
+}
+
+function ivfListCount(rows) {
+  if (IVF_LISTS === "auto") {
+    return rows >= IVF_MIN_ROWS ? Math.round(Math.sqrt(rows)) : 0;
+  }
+  return Math.min(parseInt(IVF_LISTS, 10) || 0, rows);
+}
+
+function seededRandom(seed) {
+  // mulberry32: deterministic, so re-ingesting the same corpus gives the same lists
+  return () => {
+    seed = (seed + 0x6d2b79f5) | 0;
+    let t = Math.imul(seed ^ (seed >>> 15), 1 | seed);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function nearestList(vectors, row, centroids, nLists, dim) {
+  let best = 0;
+  let bestScore = -Infinity;
+  const base = row * dim;
+  for (let list = 0; list < nLists; list++) {
+    const centroidBase = list * dim;
+    let score = 0;
+    for (let d = 0; d < dim; d++) {
+      score += vectors[base + d] * centroids[centroidBase + d];
+    }
+    if (score > bestScore) {
+      bestScore = score;
+      best = list;
+    }
+  }
+  return best;
+}
+
+function trainIvf(vectors, rows, dim, nLists, initialCentroids = null) {
+  if (initialCentroids) {
+    // Incremental run: keep the previous lists and only assign rows
+    const assignments = new Uint32Array(rows);
+    for (let row = 0; row < rows; row++) {
+      assignments[row] = nearestList(vectors, row, initialCentroids, nLists, dim);
+    }
+    return { centroids: initialCentroids, assignments };
+  }
+
+  // Spherical k-means on a sample of 64 rows per list (mirrors rag_ivf.train_ivf)
+  const random = seededRandom(0);
+  const sample = Array.from({ length: rows }, (_, row) => row);
+  const sampleSize = Math.min(rows, 64 * nLists);
+  for (let i = 0; i < sampleSize; i++) {
+    const j = i + Math.floor(random() * (rows - i));
+    [sample[i], sample[j]] = [sample[j], sample[i]];
+  }
+  sample.length = sampleSize;
+
+  const centroids = new Float32Array(nLists * dim);
+  for (let list = 0; list < nLists; list++) {
+    centroids.set(vectors.subarray(sample[list] * dim, (sample[list] + 1) * dim), list * dim);
+  }
+
+  for (let iteration = 0; iteration < IVF_ITERATIONS; iteration++) {
+    const sums = new Float32Array(nLists * dim);
+    for (const row of sample) {
+      const list = nearestList(vectors, row, centroids, nLists, dim);
+      for (let d = 0; d < dim; d++) sums[list * dim + d] += vectors[row * dim + d];
+    }
+    for (let list = 0; list < nLists; list++) {
+      let centroid = sums.subarray(list * dim, (list + 1) * dim);
+      let norm = Math.hypot(...centroid);
+      if (norm === 0) {
+        // Reseed an empty list from a random sample row
+        const row = sample[Math.floor(random() * sampleSize)];
+        centroid = vectors.subarray(row * dim, (row + 1) * dim);
+        norm = 1;
+      }
+      for (let d = 0; d < dim; d++) centroids[list * dim + d] = centroid[d] / norm;
+    }
+  }
+
+  const assignments = new Uint32Array(rows);
+  for (let row = 0; row < rows; row++) {
+    assignments[row] = nearestList(vectors, row, centroids, nLists, dim);
+  }
+  return { centroids, assignments };
+}
+
+function buildIvfFile(centroids, assignments, nLists, dim, buildId) {
+  const header = Buffer.alloc(IVF_HEADER_SIZE);
+  header.write(IVF_MAGIC, 0, "latin1");
+  header.writeUInt16LE(IVF_VERSION, 8);
+  header.writeUInt32LE(nLists, 12);
+  header.writeUInt32LE(dim, 16);
+  buildId.copy(header, 20);
+  const offsets = new Uint32Array(nLists + 1);
+  for (const list of assignments) offsets[list + 1]++;
+  for (let list = 0; list < nLists; list++) offsets[list + 1] += offsets[list];
+  return Buffer.concat([
+    header,
+    Buffer.from(centroids.buffer, centroids.byteOffset, centroids.byteLength),
+    Buffer.from(offsets.buffer),
+  ]);
+}
+
+function prepareIndex(items, previous, buildId) {
+  const rows = items.length;
+  const dim = rows ? items[0].vector.length : 0;
+
+  // L2-normalized rows, shared by IVF training and the matrix file
+  const vectors = new Float32Array(rows * dim);
+  items.forEach((item, row) => {
+    if (item.vector.length !== dim) {
+      throw new Error(`Embedding dimension mismatch for ${item.id}`);
+    }
+    vectors.set(item.vector, row * dim);
+  });
+
+  // With IVF, rows are grouped by list so each list is a contiguous row range
+  const order = items.map((_, row) => row);
+  let ivf = null;
+  const nLists = ivfListCount(rows);
+  if (nLists > 0) {
+    const reuseCentroids =
+      previous.centroids && previous.nLists === nLists && previous.dim === dim;
+    const { centroids, assignments } = trainIvf(
+      vectors,
+      rows,
+      dim,
+      nLists,
+      reuseCentroids ? previous.centroids : null
+    );
+    order.sort((a, b) => assignments[a] - assignments[b] || a - b);
+    ivf = buildIvfFile(centroids, assignments, nLists, dim, buildId);
+  }
+  return { vectors, order, dim, ivf };
+}
+
+function* matrixChunks(vectors, order, dim, dtype, buildId) {
+  const dtypeCode = INDEX_DTYPE_CODES[dtype];
+  const itemSize = dtype === "float16" ? 2 : 4;
+  const header = Buffer.alloc(INDEX_DATA_OFFSET);
+  header.write(INDEX_MAGIC, 0, "latin1");
+  header.writeUInt16LE(INDEX_VERSION, 8);
+  header.writeUInt8(dtypeCode, 10);
+  header.writeUInt8(INDEX_FLAG_NORMALIZED, 11);
+  header.writeUInt32LE(order.length, 12);
+  header.writeUInt32LE(dim, 16);
+  buildId.copy(header, INDEX_BUILD_ID_OFFSET);
+  yield header;
+
+  for (let start = 0; start < order.length; start += ROWS_PER_CHUNK) {
+    const rows = order.slice(start, start + ROWS_PER_CHUNK);
+    const chunk = Buffer.alloc(rows.length * dim * itemSize);
+    let offset = 0;
+    for (const row of rows) {
+      for (let d = 0; d < dim; d++) {
+        const value = vectors[row * dim + d];
+        if (itemSize === 2) chunk.writeUInt16LE(toFloat16Bits(value), offset);
+        else chunk.writeFloatLE(value, offset);
+        offset += itemSize;
+      }
+    }
+    yield chunk;
+  }
+}
+
+function* metaChunks(items, order, info) {
+  const infoBytes = Buffer.from(JSON.stringify(info));
+  const records = order.map((row) => {
+    const { vector, hash, ...record } = items[row];
+    return Buffer.from(JSON.stringify(record));
+  });
+  const header = Buffer.alloc(20);
+  header.write(META_MAGIC, 0, "latin1");
+  header.writeUInt16LE(INDEX_VERSION, 8);
+  header.writeUInt32LE(records.length, 12);
+  header.writeUInt32LE(infoBytes.length, 16);
+  yield header;
+  yield infoBytes;
+  yield Buffer.alloc((8 - ((header.length + infoBytes.length) % 8)) % 8);
+
+  const offsets = Buffer.alloc((records.length + 1) * 8);
+  let recordOffset = 0;
+  records.forEach((record, row) => {
+    offsets.writeBigUInt64LE(BigInt(recordOffset), row * 8);
+    recordOffset += record.length;
+  });
+  offsets.writeBigUInt64LE(BigInt(recordOffset), records.length * 8);
+  yield offsets;
+
+  for (let start = 0; start < records.length; start += ROWS_PER_CHUNK) {
+    yield Buffer.concat(records.slice(start, start + ROWS_PER_CHUNK));
+  }
+}
+
+function* jsonChunks(items, model) {
+  yield Buffer.from(
+    `{"model":${JSON.stringify(model)},` +
+      `"generated_at":"${new Date().toISOString()}",` +
+      `"chunk_count":${items.length},"items":[`
+  );
+  for (let row = 0; row < items.length; row++) {
+    const { vector, hash, ...record } = items[row];
+    const json = JSON.stringify({ ...record, embedding: Array.from(vector) });
+    yield Buffer.from(row ? `,${json}` : json);
+  }
+  yield Buffer.from("]}");
+}
+
+async function uploadStream(s3, bucket, key, chunks, contentType) {
+  // Multipart upload of a generator: at most queueSize parts are buffered
+  const upload = new Upload({
+    client: s3,
+    params: {
+      Bucket: bucket,
+      Key: key,
+      Body: Readable.from(chunks),
+      ContentType: contentType,
+    },
+    partSize: UPLOAD_PART_BYTES,
+    queueSize: 4,
+  });
+  await upload.done();
+}
+
+async function getObjectBytes(s3, bucket, key) {
+  try {
+    const response = await s3.send(
+      new GetObjectCommand({ Bucket: bucket, Key: key })
+    );
+    return await response.Body.transformToByteArray();
+  } catch (err) {
+    if (err.name === "NoSuchKey" || err.$metadata?.httpStatusCode === 404) {
+      return null;
+    }
+    throw err;
+  }
+}
+
+async function loadPreviousIndex(s3, bucket) {
+  // Vectors of the previous run keyed by chunk hash, plus its IVF centroids
+  const previous = { vectors: new Map(), centroids: null, nLists: 0, dim: 0 };
+  if (FULL_REINDEX) return previous;
+
+  const manifestBytes = await getObjectBytes(s3, bucket, `${INDEX_PREFIX}.manifest.json`);
+  if (!manifestBytes) return previous;
+  const manifest = JSON.parse(Buffer.from(manifestBytes).toString());
+  if (
+    manifest.version !== MANIFEST_VERSION ||
+    manifest.model !== EMBEDDING_MODEL ||
+    // Reusing float16 rows in a float32 index would keep their rounding
+    (manifest.dtype !== INDEX_DTYPE && manifest.dtype !== "float32")
+  ) {
+    console.log("Previous index is not reusable; embedding every chunk");
+    return previous;
+  }
+
+  const matrix = await getObjectBytes(s3, bucket, `${INDEX_PREFIX}.bin`);
+  if (!matrix) return previous;
+  const header = Buffer.from(matrix.buffer, matrix.byteOffset, INDEX_DATA_OFFSET);
+  const rows = header.readUInt32LE(12);
+  const dim = header.readUInt32LE(16);
+  const buildId = header
+    .subarray(INDEX_BUILD_ID_OFFSET, INDEX_BUILD_ID_OFFSET + 16)
+    .toString("hex");
+  if (buildId !== manifest.build_id || rows !== manifest.hashes.length) {
+    console.log("Manifest does not match the current index; embedding every chunk");
+    return previous;
+  }
+
+  // Copy past the header so the typed array view is aligned
+  const data = matrix.slice(INDEX_DATA_OFFSET);
+  const float16 = header.readUInt8(10) === INDEX_DTYPE_CODES.float16;
+  const values = float16 ? new Uint16Array(data.buffer) : new Float32Array(data.buffer);
+  manifest.hashes.forEach((hash, row) => {
+    if (previous.vectors.has(hash)) return;
+    const slice = values.subarray(row * dim, (row + 1) * dim);
+    previous.vectors.set(hash, float16 ? Float32Array.from(slice, fromFloat16Bits) : slice);
+  });
+  previous.dim = dim;
+
+  if (manifest.ivf_lists > 0) {
+    const ivf = await getObjectBytes(s3, bucket, `${INDEX_PREFIX}.ivf`);
+    if (ivf) {
+      const header = Buffer.from(ivf.buffer, ivf.byteOffset, IVF_HEADER_SIZE);
+      const nLists = header.readUInt32LE(12);
+      const version = header.readUInt16LE(8);
+      const headerSize = version >= 2 ? IVF_HEADER_SIZE : 20;
+      // Centroids from another run would not match the reused vectors' lists
+      if (version < 2 || header.subarray(20, 36).toString("hex") === manifest.build_id) {
+        previous.centroids = new Float32Array(
+          ivf.slice(headerSize, headerSize + nLists * dim * 4).buffer
+        );
+        previous.nLists = nLists;
+      }
+    }
+  }
+  return previous;
+}
+
+async function embedPending(pending) {
+  // maxAttempts 1: throttling is retried here, where the limiter can see it
+  const bedrock = new BedrockRuntimeClient({ region: REGION, maxAttempts: 1 });
+  const limiter = new AdaptiveLimiter(EMBED_CONCURRENCY);
+  let next = 0;
+  let done = 0;
+  const worker = async () => {
+    while (next < pending.length) {
+      const item = pending[next++];
+      try {
+        const embedding = await embedWithBackoff(bedrock, limiter, item.text);
+        item.vector = normalizeVector(embedding);
+      } catch (err) {
+        console.error("Embedding failed for chunk", item.file, item.chunk_index, err);
+      }
+      if (++done % 100 === 0 || done === pending.length) {
+        console.log(
+          `Embedded ${done}/${pending.length} chunks ` +
+            `(concurrency ${limiter.limit}, ${limiter.throttles} throttles)`
+        );
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: limiter.max }, worker));
+}
+
 async function main() {
   const { source, bucket: bucketArg } = parseArgs();
   if (!source) {
@@ -118,11 +629,9 @@ async function main() {
     process.exit(0);
   }
 
-  const bedrock = new BedrockRuntimeClient({ region: REGION });
   const s3 = new S3Client({ region: REGION });
 
-  const embeddingsDoc = [];
-
+  const items = [];
   for (const rel of files) {
     const fullPath = path.join(absSource, rel);
     const raw = fs.readFileSync(fullPath, "utf-8");
@@ -130,39 +639,100 @@ async function main() {
 
     const chunks = chunkText(content);
     console.log(`File: ${rel} => ${chunks.length} chunks`);
+    chunks.forEach((chunk, i) => {
+      items.push({
+        id: `${rel}#${i}`,
+        file: rel,
+        chunk_index: i,
+        text: chunk,
+        metadata: frontmatter || {},
+        hash: chunkHash(EMBEDDING_MODEL, chunk),
+      });
+    });
+  }
 
-    for (let i = 0; i < chunks.length; i++) {
-      const chunk = chunks[i];
-      try {
-        const embedding = await embedChunk(bedrock, chunk);
-        embeddingsDoc.push({
-          id: `${rel}#${i}`,
-          file: rel,
-          chunk_index: i,
-          text: chunk,
-          metadata: frontmatter || {},
-          embedding,
-        });
-      } catch (err) {
-        console.error("Embedding failed for chunk", rel, i, err);
-      }
-    }
+  // Unchanged chunks keep the vectors stored by the previous run
+  const previous = await loadPreviousIndex(s3, bucket);
+  const pending = [];
+  for (const item of items) {
+    const vector = previous.vectors.get(item.hash);
+    if (vector) item.vector = vector;
+    else pending.push(item);
   }
+  console.log(
+    `Chunks: ${items.length} total, ${items.length - pending.length} reused, ` +
+      `${pending.length} to embed`
+  );
+  await embedPending(pending);
+  const embedded = items.filter((item) => item.vector);
 
-  const body = JSON.stringify({
+  if (!INDEX_DTYPE_CODES[INDEX_DTYPE]) {
+    throw new Error(`Unsupported RAG_INDEX_DTYPE: ${INDEX_DTYPE}`);
+  }
+  const buildId = crypto.randomBytes(16);
+  const { vectors, order, dim, ivf } = prepareIndex(embedded, previous, buildId);
+  const generatedAt = new Date().toISOString();
+  if (!ivf) {
+    // A stale IVF file would not match the new row order
+    await s3.send(
+      new DeleteObjectCommand({ Bucket: bucket, Key: `${INDEX_PREFIX}.ivf` })
+    );
+  }
+  // Metadata and IVF first: the runtime only looks for them once the matrix
+  // exists. The manifest goes last, so it never describes a matrix that was
+  // not uploaded.
+  await uploadStream(
+    s3,
+    bucket,
+    `${INDEX_PREFIX}.meta`,
+    metaChunks(embedded, order, {
+      model: EMBEDDING_MODEL,
+      generated_at: generatedAt,
+      dtype: INDEX_DTYPE,
+      build_id: buildId.toString("hex"),
+    }),
+    "application/octet-stream"
+  );
+  if (ivf) {
+    await uploadStream(s3, bucket, `${INDEX_PREFIX}.ivf`, [ivf], "application/octet-stream");
+  }
+  await uploadStream(
+    s3,
+    bucket,
+    `${INDEX_PREFIX}.bin`,
+    matrixChunks(vectors, order, dim, INDEX_DTYPE, buildId),
+    "application/octet-stream"
+  );
+  const manifest = {
+    version: MANIFEST_VERSION,
     model: EMBEDDING_MODEL,
-    generated_at: new Date().toISOString(),
-    chunk_count: embeddingsDoc.length,
-    items: embeddingsDoc,
-  });
+    dtype: INDEX_DTYPE,
+    dim,
+    build_id: buildId.toString("hex"),
+    generated_at: generatedAt,
+    ivf_lists: ivf ? ivf.readUInt32LE(12) : 0,
+    hashes: order.map((row) => embedded[row].hash),
+  };
+  await uploadStream(
+    s3,
+    bucket,
+    `${INDEX_PREFIX}.manifest.json`,
+    [Buffer.from(JSON.stringify(manifest))],
+    "application/json"
+  );
+  console.log(
+    "Uploaded binary index:",
+    `${bucket}/${INDEX_PREFIX}.{bin,meta,manifest.json}`,
+    `(${INDEX_DTYPE}, ${embedded.length} rows, ${manifest.ivf_lists} IVF lists)`
+  );
 
-  await s3.send(
-    new PutObjectCommand({
-      Bucket: bucket,
-      Key: OUTPUT_KEY,
-      Body: body,
-      ContentType: "application/json",
-    })
+  if (!WRITE_JSON) return;
+  await uploadStream(
+    s3,
+    bucket,
+    OUTPUT_KEY,
+    jsonChunks(embedded, EMBEDDING_MODEL),
+    "application/json"
   );
 
   console.log("Uploaded embeddings file:", `${bucket}/${OUTPUT_KEY}`);